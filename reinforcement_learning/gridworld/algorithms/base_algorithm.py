@@ -1,24 +1,53 @@
 """Base algorithm interface for reinforcement learning algorithms."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, NamedTuple
 from beartype import beartype
 import numpy as np
 from environment.gridworld import GridWorld, Action, Position
+from environment.seeding import SeedLike, make_rng
+
+
+class Episode(NamedTuple):
+    """One episode as parallel lists of int state ids, int action ids and rewards."""
+    states: list[int]
+    actions: list[int]
+    rewards: list[float]
 
 
 class BaseAlgorithm(ABC):
     """Base class for all RL algorithms."""
 
-    def __init__(self, gridworld: GridWorld):
+    def __init__(self, gridworld: GridWorld, seed: SeedLike = None):
         self.gridworld = gridworld
         self.name = self.__class__.__name__
 
+        # Every source of randomness in an algorithm draws from self.rng
+        self.seed = seed
+        self.rng = make_rng(seed)
+
+        # Last episode in int ids; Positions are only built when it is read
+        self.last_episode = Episode([], [], [])
+
+    @beartype
+    def reseed(self, seed: SeedLike) -> None:
+        """Restart the algorithm's random stream from seed."""
+        self.seed = seed
+        self.rng = make_rng(seed)
+
     @abstractmethod
     def select_action(self, state: Position) -> Action:
         """Select an action given the current state."""
         pass
 
+    def select_action_and_jump(self, state: Position) -> tuple[Action, bool]:
+        """Select an action and whether to jump with it (never, unless overridden)."""
+        return self.select_action(state), False
+
+    def select_action_id(self, state: int) -> int:
+        """Select an action id for an int state id (falls back to select_action)."""
+        return int(self.select_action(self.gridworld.state_to_position(state % self.gridworld.get_state_space_size())))
+
     @abstractmethod
     def update(self, experience: dict[str, Any]) -> None:
         """Update the algorithm with new experience."""
@@ -34,6 +63,32 @@ class BaseAlgorithm(ABC):
         """Get policy for visualization."""
         pass
 
+    @property
+    def last_episode_trajectory(self) -> list[tuple[Position, Action, float]]:
+        """Last episode as (Position, Action, reward) steps, for rendering and recording."""
+        return self.decode_episode(self.last_episode)
+
+    @beartype
+    def decode_episode(self, episode: Episode) -> list[tuple[Position, Action, float]]:
+        """Convert an int-id episode to (Position, Action, reward) steps.
+
+        State ids may be augmented (has_jump layer) and action ids may
+        include use_jump; both are reduced to the cell and the move.
+        """
+        size = self.gridworld.size
+        num_cells = size * size
+        return [
+            (Position(*divmod(state % num_cells, size)), Action(action % len(Action)), reward)
+            for state, action, reward in zip(*episode)
+        ]
+
+    @beartype
+    def episode_path(self, episode: Episode) -> list[tuple[int, int]]:
+        """(row, col) of every step of an int-id episode."""
+        size = self.gridworld.size
+        num_cells = size * size
+        return [divmod(state % num_cells, size) for state in episode.states]
+
     @beartype
     def reset(self) -> None:
         """Reset algorithm state (optional override)."""
@@ -3,6 +3,7 @@
 from typing import Any
 import numpy as np
 from beartype import beartype
+from environment.typecheck import hot_path
 
 from .base_algorithm import BaseAlgorithm
 from environment.gridworld import GridWorld, Action, Position, CellType
@@ -18,36 +19,47 @@ class DynamicProgramming(BaseAlgorithm):
         gridworld: GridWorld,
         gamma: float = 0.9,
         theta: float = 0.001,
-        max_iterations: int = 100
+        max_iterations: int = 100,
+        augmented: bool = False
     ):
         super().__init__(gridworld)
         self.gamma = gamma
         self.theta = theta
         self.max_iterations = max_iterations
-        self.transition_model = TransitionModel(gridworld)
+        self.augmented = augmented
+        self.transition_model = TransitionModel(gridworld, augmented=augmented)
 
         # Initialize value function and policy
-        self.values = np.zeros(gridworld.get_state_space_size())
-        self.policy = np.zeros(gridworld.get_state_space_size(), dtype=int)
-        self.q_values = np.zeros((gridworld.get_state_space_size(), gridworld.get_action_space_size()))
+        num_states = self.transition_model.num_states
+        num_actions = self.transition_model.num_actions
+        self.values = np.zeros(num_states)
+        self.policy = np.zeros(num_states, dtype=int)
+        self.q_values = np.zeros((num_states, num_actions))
 
         # Training state
         self.iteration = 0
         self.converged = False
         self.training_complete = False
 
-    @beartype
+    @hot_path
     def select_action(self, state: Position) -> Action:
         """Select action using the learned policy."""
+        return self.select_action_and_jump(state)[0]
+
+    @hot_path
+    def select_action_and_jump(self, state: Position) -> tuple[Action, bool]:
+        """Select the learned policy's (action, use_jump) pair, for GridWorld.step."""
         if not self.training_complete:
             # If not trained yet, run value iteration
             self.solve()
 
-        state_idx = self.gridworld.position_to_state(state)
-        action_idx = self.policy[state_idx]
-        return Action(action_idx)
+        if self.augmented:
+            state_idx = self.gridworld.encode_state(state, self.gridworld.has_jump)
+        else:
+            state_idx = self.gridworld.position_to_state(state)
+        return self.gridworld.decode_action(int(self.policy[state_idx]))
 
-    @beartype
+    @hot_path
     def update(self, experience: dict[str, Any]) -> None:
         """DP doesn't learn from experience - it uses the model directly."""
         # Dynamic Programming is model-based and doesn't learn from experience
@@ -94,30 +106,17 @@ class DynamicProgramming(BaseAlgorithm):
     @beartype
     def _value_iteration_step(self) -> float:
         """Perform one step of value iteration."""
-        new_values = np.zeros_like(self.values)
-        new_policy = np.zeros_like(self.policy)
-
-        for state in range(self.gridworld.get_state_space_size()):
-            pos = self.gridworld.state_to_position(state)
-
-            # Terminal states keep value 0
-            if self.gridworld.grid[pos.row, pos.col] in [CellType.GOAL, CellType.TRAP]:
-                new_values[state] = 0.0
-                continue
-            elif self.gridworld.grid[pos.row, pos.col] == CellType.OBSTACLE:
-                new_values[state] = 0.0  # Unreachable
-                continue
-
-            # Bellman optimality equation: V*(s) = max_a Σ P(s',r|s,a)[r + γV*(s')]
-            action_values = []
-            for action in Action:
-                transition = self.transition_model.get_transition(state, action.value)
-                action_value = transition.reward + self.gamma * self.values[transition.next_state]
-                action_values.append(action_value)
-                self.q_values[state, action.value] = action_value
-
-            new_values[state] = max(action_values)
-            new_policy[state] = np.argmax(action_values)
+        tables = self.transition_model.build_sparse_tables()
+
+        # Terminal states keep value 0, obstacles are unreachable
+        active = ~(tables.terminal | tables.blocked)
+
+        # Bellman optimality equation: V*(s) = max_a Σ P(s',r|s,a)[r + γV*(s')]
+        action_values = self.transition_model.expected_action_values(self.values, self.gamma)
+        self.q_values[active] = action_values[active]
+
+        new_values = np.where(active, action_values.max(axis=1), 0.0)
+        new_policy = np.where(active, action_values.argmax(axis=1), 0)
 
         # Calculate maximum change
         delta = np.max(np.abs(new_values - self.values))
@@ -125,7 +124,7 @@ class DynamicProgramming(BaseAlgorithm):
         self.values = new_values
         self.policy = new_policy
 
-        return delta
+        return float(delta)
 
     @beartype
     def _get_solution_info(self) -> dict[str, Any]:
@@ -149,7 +148,7 @@ class DynamicProgramming(BaseAlgorithm):
     @beartype
     def get_state_calculation(self, state: int) -> dict[str, Any]:
         """Get detailed Bellman calculation for a specific state."""
-        pos = self.gridworld.state_to_position(state)
+        pos, _ = self.transition_model.decode_state(state)
 
         if self.gridworld.grid[pos.row, pos.col] in [CellType.GOAL, CellType.TRAP]:
             entry_reward = self.gridworld.get_reward(pos.row, pos.col)
@@ -163,23 +162,26 @@ class DynamicProgramming(BaseAlgorithm):
             }
 
         action_values = []
-        for action in Action:
-            transition = self.transition_model.get_transition(state, action.value)
-            action_value = transition.reward + self.gamma * self.values[transition.next_state]
-            next_pos = self.gridworld.state_to_position(transition.next_state)
-
-            # Create transitions list (for deterministic case, just one transition)
-            transitions = [{
-                "next_state": transition.next_state,
-                "next_pos": next_pos,
-                "probability": 1.0,  # Deterministic for now
-                "reward": transition.reward,
-                "next_value": self.values[transition.next_state],
-                "contribution": action_value
-            }]
+        for action_idx in range(self.transition_model.num_actions):
+            action, use_jump = self.gridworld.decode_action(action_idx)
+
+            # One entry per possible outcome (a single one without slipping)
+            transitions = []
+            for next_state, probability, reward in self.transition_model.get_outcomes(state, action_idx):
+                next_pos, _ = self.transition_model.decode_state(next_state)
+                transitions.append({
+                    "next_state": next_state,
+                    "next_pos": next_pos,
+                    "probability": probability,
+                    "reward": reward,
+                    "next_value": self.values[next_state],
+                    "contribution": probability * (reward + self.gamma * self.values[next_state])
+                })
+            action_value = sum(t["contribution"] for t in transitions)
 
             action_values.append({
                 "action": action,
+                "use_jump": use_jump,
                 "value": action_value,
                 "transitions": transitions
             })
@@ -193,7 +195,7 @@ class DynamicProgramming(BaseAlgorithm):
             "is_terminal": False,
             "current_value": self.values[state],
             "action_values": action_values,
-            "best_action": Action(best_action_idx),
+            "best_action": action_values[best_action_idx]["action"],
             "best_action_idx": best_action_idx,
             "best_value": new_value,
             "new_value": new_value
@@ -0,0 +1,66 @@
+"""Sparse eligibility trace storage shared by the λ-return learners."""
+
+from beartype import beartype
+import numpy as np
+
+
+class SparseTraces:
+    """Eligibility traces over flat table indices, storing only active entries.
+
+    Active indices and their trace values live in parallel arrays, with a
+    dict mapping index -> slot. Decay, pruning and the table update all
+    touch the active entries only, so a step costs O(active) rather than
+    O(table size).
+    """
+
+    @beartype
+    def __init__(self, threshold: float = 1e-4, replacing: bool = False, capacity: int = 256):
+        self.threshold = threshold
+        self.replacing = replacing
+        self.indices = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros(capacity)
+        self.slots: dict[int, int] = {}
+        self.size = 0
+
+    def visit(self, index: int) -> None:
+        """Bump the trace of index (accumulating, or reset to 1 when replacing)."""
+        slot = self.slots.get(index)
+        if slot is not None:
+            self.values[slot] = 1.0 if self.replacing else self.values[slot] + 1.0
+            return
+
+        if self.size == len(self.indices):
+            self.indices = np.concatenate([self.indices, np.zeros_like(self.indices)])
+            self.values = np.concatenate([self.values, np.zeros_like(self.values)])
+        self.indices[self.size] = index
+        self.values[self.size] = 1.0
+        self.slots[index] = self.size
+        self.size += 1
+
+    def apply(self, table: np.ndarray, step: float) -> None:
+        """Add step * e(i) to every active entry of the flattened table."""
+        flat = table.reshape(-1)
+        flat[self.indices[:self.size]] += step * self.values[:self.size]
+
+    def decay(self, factor: float) -> None:
+        """Scale all traces by factor and drop those below the threshold."""
+        values = self.values[:self.size]
+        values *= factor
+
+        keep = values >= self.threshold
+        if keep.all():
+            return
+
+        kept = int(keep.sum())
+        self.indices[:kept] = self.indices[:self.size][keep]
+        self.values[:kept] = values[keep]
+        self.size = kept
+        self.slots = {int(index): slot for slot, index in enumerate(self.indices[:kept].tolist())}
+
+    def clear(self) -> None:
+        """Drop all traces (end of episode, or a non-greedy action in Watkins Q(λ))."""
+        self.size = 0
+        self.slots.clear()
+
+    def __len__(self) -> int:
+        return self.size
@@ -0,0 +1,356 @@
+"""Q-Learning with a linear function approximator over tile-coded features."""
+
+from typing import Any
+
+from beartype import beartype
+from environment.typecheck import hot_path
+import numpy as np
+
+from .base_algorithm import BaseAlgorithm, Episode
+from environment.gridworld import GridWorld, Action, Position
+from environment.seeding import SeedLike
+
+# Multiplier for folding raw tile indices into a fixed-size weight table
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+class TileCoder:
+    """Sparse tile-coding features for grid cells.
+
+    num_tilings square tilings of tile_width x tile_width cells are laid over
+    the grid, each shifted by an asymmetric (1, 3) displacement, so every
+    cell activates exactly one tile per tiling. A state is represented by
+    the num_tilings active feature indices rather than a dense vector.
+    With augmented states, cells holding the jump ability use a separate
+    set of tilings. If max_features is given, raw indices are hashed into
+    that many features so memory no longer depends on the grid size.
+    """
+
+    @beartype
+    def __init__(
+        self,
+        size: int,
+        num_tilings: int = 8,
+        tile_width: int = 4,
+        augmented: bool = False,
+        max_features: int | None = None
+    ):
+        if num_tilings < 1 or tile_width < 1:
+            raise ValueError(f"num_tilings and tile_width must be positive, got {num_tilings} and {tile_width}")
+        self.size = size
+        self.num_cells = size * size
+        self.num_tilings = num_tilings
+        self.tile_width = tile_width
+        self.max_features = max_features
+
+        # Offsets of up to tile_width - 1 push the last cells into an extra tile
+        self.tiles_per_dim = (size + tile_width - 2) // tile_width + 1
+        tiles_per_tiling = self.tiles_per_dim * self.tiles_per_dim
+        self.features_per_layer = num_tilings * tiles_per_tiling
+        raw_features = self.features_per_layer * (2 if augmented else 1)
+        self.num_features = raw_features if max_features is None else min(max_features, raw_features)
+        self._hashed = self.num_features < raw_features
+
+        tilings = np.arange(num_tilings)
+        self._row_offsets = (tilings * 1 * tile_width) // num_tilings % tile_width
+        self._col_offsets = (tilings * 3 * tile_width) // num_tilings % tile_width
+        self._tiling_base = tilings * tiles_per_tiling
+
+    @hot_path
+    def features(self, states: np.ndarray) -> np.ndarray:
+        """Active feature indices for a batch of state ids, shape (len(states), num_tilings).
+
+        State ids are flat cells, offset by size * size when the cell holds
+        the jump ability (the augmented encoding of GridWorld.encode_state).
+        """
+        has_jump, cells = np.divmod(states, self.num_cells)
+        rows, cols = np.divmod(cells, self.size)
+        tile_rows = (rows[:, None] + self._row_offsets) // self.tile_width
+        tile_cols = (cols[:, None] + self._col_offsets) // self.tile_width
+        indices = self._tiling_base + tile_rows * self.tiles_per_dim + tile_cols + has_jump[:, None] * self.features_per_layer
+
+        if self._hashed:
+            # Fibonacci hashing: the high bits of the wrapped product are well mixed
+            hashed = (indices.astype(np.uint64) * _HASH_MULTIPLIER) >> np.uint64(32)
+            return (hashed % np.uint64(self.num_features)).astype(np.int64)
+        return indices
+
+
+class LinearQLearning(BaseAlgorithm):
+    """Q-Learning with linear function approximation over tile-coded features.
+
+    Q(s, a) = sum of weights[f, a] over the active features f of s, so memory
+    is num_features x num_actions instead of one row per state, and values
+    generalize between neighbouring cells that share tiles. Transitions are
+    buffered and applied as one semi-gradient update per batch of batch_size
+    steps (batch_size=1 is classic online Q-learning).
+    """
+
+    @beartype
+    def __init__(
+        self,
+        gridworld: GridWorld,
+        gamma: float = 0.9,
+        alpha: float = 0.1,
+        epsilon: float = 0.1,
+        num_tilings: int = 8,
+        tile_width: int = 4,
+        max_features: int | None = None,
+        batch_size: int = 32,
+        augmented: bool = False,
+        seed: SeedLike = None,
+    ):
+        super().__init__(gridworld, seed=seed)
+        self.gamma = gamma
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.batch_size = batch_size
+        self.augmented = augmented
+        self.num_cells = gridworld.get_state_space_size()
+        self.num_actions = gridworld.get_augmented_action_space_size() if augmented else len(Action)
+
+        self.tile_coder = TileCoder(
+            gridworld.size,
+            num_tilings=num_tilings,
+            tile_width=tile_width,
+            augmented=augmented,
+            max_features=max_features
+        )
+        self.weights = np.zeros((self.tile_coder.num_features, self.num_actions))
+
+        # Step size per active feature, so one update moves Q(s, a) by alpha * td_error
+        self._feature_alpha = alpha / num_tilings
+
+        # Transition buffer for batched updates, filled by run_episode
+        self._batch_states = np.zeros(batch_size, dtype=np.int64)
+        self._batch_actions = np.zeros(batch_size, dtype=np.int64)
+        self._batch_rewards = np.zeros(batch_size)
+        self._batch_next_states = np.zeros(batch_size, dtype=np.int64)
+        self._batch_dones = np.zeros(batch_size, dtype=bool)
+
+        # Metrics
+        self.episode_rewards = []
+        self.episode_lengths = []
+        self.training_complete = False
+        self.current_episode = 0
+        self.total_updates = 0
+
+        # For visualization
+        self.convergence_data = []
+        self.last_update_details = []
+
+    def _state_id(self, cell: int, has_jump: bool) -> int:
+        """Get the state id for a flat cell index and jump flag."""
+        return cell + self.num_cells if self.augmented and has_jump else cell
+
+    @hot_path
+    def action_values(self, states: np.ndarray) -> np.ndarray:
+        """Q-values for a batch of state ids, shape (len(states), num_actions)."""
+        return self.weights[self.tile_coder.features(states)].sum(axis=1)
+
+    @hot_path
+    def select_action(self, state: Position) -> Action:
+        """Select action using epsilon-greedy policy w.r.t. approximate Q-values."""
+        return self.select_action_and_jump(state)[0]
+
+    @hot_path
+    def select_action_and_jump(self, state: Position) -> tuple[Action, bool]:
+        """Select an epsilon-greedy (action, use_jump) pair, for GridWorld.step."""
+        state_id = self._state_id(self.gridworld.position_to_state(state), self.gridworld.has_jump)
+        return self.gridworld.decode_action(self.select_action_id(state_id))
+
+    @hot_path
+    def select_action_id(self, state: int) -> int:
+        """Select an epsilon-greedy action id, including jump moves when augmented.
+
+        Exploration is uniform over all actions: checking valid moves would
+        need the per-cell neighbor tables, which this learner avoids building.
+        """
+        if self.rng.random() < self.epsilon:
+            return int(self.rng.integers(self.num_actions))
+
+        # Greedy action: find best action(s) and break ties randomly
+        q_s = self.action_values(np.array([state]))[0]
+        best_actions = np.flatnonzero(q_s == q_s.max())
+        return int(self.rng.choice(best_actions))
+
+    @hot_path
+    def update_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray
+    ) -> np.ndarray:
+        """Apply one semi-gradient Q-learning step for a batch of transitions.
+
+        Targets are computed from the weights before the batch; the gradient
+        of Q(s, a) is 1 on each active feature of s, so every transition adds
+        alpha / num_tilings * td_error to weights[f, a] for its features f.
+        Returns the TD errors.
+        """
+        features = self.tile_coder.features(states)
+        next_max_q = self.action_values(next_states).max(axis=1)
+        targets = rewards + self.gamma * np.where(dones, 0.0, next_max_q)
+        td_errors = targets - self.weights[features, actions[:, None]].sum(axis=1)
+
+        np.add.at(self.weights, (features, actions[:, None]), self._feature_alpha * td_errors[:, None])
+        self.total_updates += len(states)
+        return td_errors
+
+    @hot_path
+    def update(self, experience: dict[str, Any]) -> dict[str, Any]:
+        """Update the weights from one transition (a batch of one).
+
+        The experience holds int ids: state ids for 'state'/'next_state'
+        and an action id for 'action'.
+        """
+        state = experience['state']
+        action = experience['action']
+        states = np.array([state])
+        old_q = self.action_values(states)[0, action]
+
+        td_error = self.update_batch(
+            states,
+            np.array([action]),
+            np.array([experience['reward']], dtype=float),
+            np.array([experience['next_state']]),
+            np.array([experience['done']])
+        )[0]
+
+        return {
+            'state': state,
+            'action': action,
+            'old_q': old_q,
+            'new_q': self.action_values(states)[0, action],
+            'target': old_q + td_error,
+            'td_error': td_error
+        }
+
+    def _flush(self, count: int) -> float:
+        """Apply the first count buffered transitions; returns the max |TD error|."""
+        if count == 0:
+            return 0.0
+        td_errors = self.update_batch(
+            self._batch_states[:count],
+            self._batch_actions[:count],
+            self._batch_rewards[:count],
+            self._batch_next_states[:count],
+            self._batch_dones[:count]
+        )
+        return float(np.max(np.abs(td_errors)))
+
+    @beartype
+    def run_episode(self, max_steps: int = 1000) -> dict[str, Any]:
+        """Run a single episode with batched updates and return metrics."""
+        episode = Episode([], [], [])
+        max_td_error = 0.0
+        num_updates = 0
+        buffered = 0
+
+        gridworld = self.gridworld
+        start = gridworld.reset()
+        state = self._state_id(gridworld.position_to_state(start), gridworld.has_jump)
+        total_reward = 0
+        steps = 0
+
+        while gridworld.status.value == 0 and steps < max_steps:  # RUNNING
+            action = self.select_action_id(state)
+            use_jump, move = divmod(action, len(Action))
+            step_result = gridworld.step_fast(move, bool(use_jump))
+            next_state = self._state_id(step_result.next_state, step_result.has_jump)
+
+            self._batch_states[buffered] = state
+            self._batch_actions[buffered] = action
+            self._batch_rewards[buffered] = step_result.reward
+            self._batch_next_states[buffered] = next_state
+            self._batch_dones[buffered] = step_result.done
+            buffered += 1
+            if buffered == self.batch_size:
+                max_td_error = max(max_td_error, self._flush(buffered))
+                num_updates += buffered
+                buffered = 0
+
+            # Track episode
+            episode.states.append(state)
+            episode.actions.append(action)
+            episode.rewards.append(step_result.reward)
+            total_reward += step_result.reward
+            state = next_state
+            steps += 1
+
+        max_td_error = max(max_td_error, self._flush(buffered))
+        num_updates += buffered
+
+        # Calculate metrics
+        path = self.episode_path(episode)
+        unique_states = len(set(path))
+
+        self.episode_rewards.append(total_reward)
+        self.episode_lengths.append(steps)
+        self.last_episode = episode
+        self.convergence_data.append(max_td_error)
+        self.current_episode += 1
+
+        return {
+            'episode': self.current_episode,
+            'reward': total_reward,
+            'length': steps,
+            'states_visited': unique_states,
+            'q_updates': num_updates,
+            'max_td_error': max_td_error,
+            'avg_reward': np.mean(self.episode_rewards[-100:]) if self.episode_rewards else 0,
+            'trajectory': path,
+        }
+
+    def _reduce_states(self, reduce, dtype) -> np.ndarray:
+        """Apply reduce to the Q-values of every state id, in bounded-memory chunks."""
+        num_states = self.num_cells * (2 if self.augmented else 1)
+        out = np.empty(num_states, dtype=dtype)
+        chunk = 1 << 16
+        for begin in range(0, num_states, chunk):
+            states = np.arange(begin, min(begin + chunk, num_states))
+            out[begin:begin + len(states)] = reduce(self.action_values(states), axis=1)
+        return out
+
+    @beartype
+    def get_values(self) -> np.ndarray:
+        """Get current state values (max approximate Q-value for each state)."""
+        return self._reduce_states(np.max, float)
+
+    @beartype
+    def get_policy(self) -> np.ndarray:
+        """Get current greedy policy from the approximate Q-values."""
+        return self._reduce_states(np.argmax, np.int64)
+
+    @beartype
+    def get_episode_data(self) -> dict[str, Any]:
+        """Get episode statistics for visualization."""
+        return {
+            'episode_rewards': self.episode_rewards,
+            'episode_lengths': self.episode_lengths,
+            'convergence_data': self.convergence_data,
+            'last_trajectory': self.last_episode_trajectory,
+            'current_episode': self.current_episode
+        }
+
+    @beartype
+    def reset(self) -> None:
+        """Reset the algorithm to initial state."""
+        self.weights.fill(0)
+        self.episode_rewards.clear()
+        self.episode_lengths.clear()
+        self.training_complete = False
+        self.current_episode = 0
+        self.total_updates = 0
+        self.last_episode = Episode([], [], [])
+        self.convergence_data.clear()
+        self.last_update_details.clear()
+
+    @beartype
+    def get_description(self) -> str:
+        """Get algorithm description."""
+        return (f"Linear Q-Learning - Off-policy TD control over {self.tile_coder.num_tilings} tilings "
+                f"of width {self.tile_coder.tile_width} ({self.tile_coder.num_features} features). "
+                f"γ={self.gamma}, α={self.alpha}, ε={self.epsilon}, batch={self.batch_size}")
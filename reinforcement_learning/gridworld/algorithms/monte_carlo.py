@@ -1,17 +1,22 @@
-"""Monte Carlo (First-Visit) algorithm implementation."""
+"""Monte Carlo (First-Visit / Every-Visit / Off-Policy) algorithm implementation."""
 
 from beartype import beartype
+from environment.typecheck import hot_path
 import numpy as np
-from collections import defaultdict
-import random
 from typing import Any
 
-from .base_algorithm import BaseAlgorithm
+from .base_algorithm import BaseAlgorithm, Episode
 from environment.gridworld import GridWorld, Action, Position
+from environment.seeding import SeedLike
 
 
 class MonteCarlo(BaseAlgorithm):
-    """Monte Carlo First-Visit On-Policy Control algorithm."""
+    """Monte Carlo control with incremental return averaging.
+
+    On-policy by default (first-visit, or every-visit with every_visit=True).
+    With off_policy=True it learns the greedy target policy from the
+    epsilon-greedy behaviour policy using weighted importance sampling.
+    """
 
     @beartype
     def __init__(
@@ -19,19 +24,40 @@ class MonteCarlo(BaseAlgorithm):
         gridworld: GridWorld,
         gamma: float = 1.0,
         epsilon: float = 0.1,
-        num_episodes: int = 1000
+        num_episodes: int = 1000,
+        augmented: bool = False,
+        every_visit: bool = False,
+        off_policy: bool = False,
+        seed: SeedLike = None
     ):
-        super().__init__(gridworld)
+        super().__init__(gridworld, seed=seed)
         self.gamma = gamma
         self.epsilon = epsilon
         self.num_episodes = num_episodes
-
-        # Action-value function and returns
-        self.q_values = np.zeros((
-            gridworld.get_state_space_size(),
-            len(Action)
-        ))
-        self.q_returns = defaultdict(list)
+        self.augmented = augmented
+        self.every_visit = every_visit
+        self.off_policy = off_policy
+        self.num_cells = gridworld.get_state_space_size()
+
+        # Action-value function and returns, over (position, has_jump) x (action, use_jump) when augmented
+        if augmented:
+            self.q_values = np.zeros((
+                gridworld.get_augmented_state_space_size(),
+                gridworld.get_augmented_action_space_size()
+            ))
+        else:
+            self.q_values = np.zeros((
+                gridworld.get_state_space_size(),
+                len(Action)
+            ))
+
+        # Running visit counts (on-policy) or cumulative importance weights
+        # (off-policy) per (s, a); Q is updated incrementally against these
+        self.visit_counts = np.zeros(self.q_values.shape, dtype=np.int64)
+        self.cumulative_weights = np.zeros(self.q_values.shape)
+
+        # Reused buffer for reverse-accumulated returns, grown on demand
+        self._returns_buffer = np.zeros(1024)
 
         # Episode tracking
         self.current_episode = 0
@@ -40,27 +66,47 @@ class MonteCarlo(BaseAlgorithm):
         self.training_complete = False
 
         # For visualization
-        self.last_episode_trajectory = []
         self.convergence_data = []
 
-    @beartype
+    @hot_path
     def select_action(self, state: Position) -> Action:
         """Select action using epsilon-greedy policy w.r.t. Q-values."""
-        state_idx = self.gridworld.position_to_state(state)
-
-        if random.random() < self.epsilon:
-            valid_actions = self.gridworld.get_valid_actions(state)
-            return random.choice(valid_actions)
+        return self.select_action_and_jump(state)[0]
+
+    @hot_path
+    def select_action_and_jump(self, state: Position) -> tuple[Action, bool]:
+        """Select an epsilon-greedy (action, use_jump) pair, for GridWorld.step."""
+        state_idx = self._state_index(state, self.gridworld.has_jump)
+        return self.gridworld.decode_action(self.select_action_id(state_idx))
+
+    def _state_index(self, state: Position, has_jump: bool = False) -> int:
+        """Get the Q-table row for a state."""
+        if self.augmented:
+            return self.gridworld.encode_state(state, has_jump)
+        return self.gridworld.position_to_state(state)
+
+    def _state_id(self, cell: int, has_jump: bool) -> int:
+        """Get the Q-table row for a flat cell index and jump flag."""
+        return cell + self.num_cells if self.augmented and has_jump else cell
+
+    @hot_path
+    def select_action_id(self, state: int) -> int:
+        """Select an epsilon-greedy Q-table column, including jump moves when augmented."""
+        if self.rng.random() < self.epsilon:
+            has_jump, cell = divmod(state, self.num_cells)
+            valid_actions = self.gridworld.get_valid_action_ids(cell)
+            return self.gridworld.encode_action(
+                valid_actions[self.rng.integers(len(valid_actions))],
+                bool(has_jump and self.rng.random() < 0.5)
+            )
 
         # Greedy action: find best action(s) and break ties randomly
-        q_s = self.q_values[state_idx]
-        max_q = np.max(q_s)
-        best_actions = np.where(q_s == max_q)[0]
+        q_s = self.q_values[state]
+        best_actions = np.flatnonzero(q_s == q_s.max())
 
-        action_idx = np.random.choice(best_actions)
-        return Action(action_idx)
+        return int(self.rng.choice(best_actions))
 
-    @beartype
+    @hot_path
     def update(self, experience: dict[str, Any]) -> None:
         """Update algorithm with experience (not used in MC - we learn from full episodes)."""
         pass
@@ -73,12 +119,12 @@ class MonteCarlo(BaseAlgorithm):
     @beartype
     def get_policy(self) -> np.ndarray:
         """Get current greedy policy from Q-values, breaking ties randomly."""
-        policy = np.zeros(self.gridworld.get_state_space_size(), dtype=int)
-        for state_idx in range(self.gridworld.get_state_space_size()):
+        policy = np.zeros(len(self.q_values), dtype=int)
+        for state_idx in range(len(self.q_values)):
             q_s = self.q_values[state_idx]
             max_q = np.max(q_s)
             best_actions = np.where(q_s == max_q)[0]
-            policy[state_idx] = np.random.choice(best_actions)
+            policy[state_idx] = self.rng.choice(best_actions)
         return policy
 
     @beartype
@@ -87,119 +133,204 @@ class MonteCarlo(BaseAlgorithm):
         policy_info = []
 
         # Get all states that have been visited (have non-zero Q-values)
-        for state_idx in range(self.gridworld.get_state_space_size()):
+        for state_idx in range(len(self.q_values)):
             q_values = self.q_values[state_idx]
             if np.any(q_values != 0):  # State has been visited
-                pos = self.gridworld.state_to_position(state_idx)
+                pos, has_jump = self.gridworld.decode_state(state_idx)
 
-                max_q = np.max(q_values)
-                best_actions = np.where(q_values == max_q)[0]
-                best_action_idx = np.random.choice(best_actions)
-                best_action = Action(best_action_idx)
+                # Jump columns are only available while holding a jump
+                available = q_values if has_jump else q_values[:len(Action)]
+                max_q = np.max(available)
+                best_actions = np.where(available == max_q)[0]
+                best_action, use_jump = self.gridworld.decode_action(int(self.rng.choice(best_actions)))
                 state_value = max_q
 
                 # Count total visits to this state
-                visits = sum(len(self.q_returns.get((state_idx, i), [])) for i in range(len(Action)))
+                visits = int(self.visit_counts[state_idx].sum())
 
                 policy_info.append({
                     'position': pos,
+                    'has_jump': has_jump,
                     'best_action': best_action,
+                    'use_jump': use_jump,
                     'state_value': state_value,
                     'q_values': q_values.copy(),
                     'visits': visits
                 })
 
         # Sort by position for consistent display
-        policy_info.sort(key=lambda x: (x['position'].row, x['position'].col))
+        policy_info.sort(key=lambda x: (x['position'].row, x['position'].col, x['has_jump'], x['use_jump']))
         return policy_info
 
     @beartype
-    def generate_episode(self, max_steps: int = 1000) -> list[tuple[Position, Action, float]]:
-        """Generate a complete episode using current policy."""
-        episode = []
-        state = self.gridworld.reset()
+    def generate_episode(self, max_steps: int = 1000) -> Episode:
+        """Generate a complete episode of Q-table (row, column) ids using current policy."""
+        episode = Episode([], [], [])
+        gridworld = self.gridworld
+        start = gridworld.reset()
+        state = self._state_id(gridworld.position_to_state(start), gridworld.has_jump)
         steps = 0
 
-        while self.gridworld.status.value == 0 and steps < max_steps:  # RUNNING
-            action = self.select_action(state)
-            step_result = self.gridworld.step(action)
-            episode.append((state, action, step_result.reward))
-            state = step_result.next_state
+        while gridworld.status.value == 0 and steps < max_steps:  # RUNNING
+            action = self.select_action_id(state)
+            use_jump, move = divmod(action, len(Action))
+            step_result = gridworld.step_fast(move, bool(use_jump))
+            episode.states.append(state)
+            episode.actions.append(action)
+            episode.rewards.append(step_result.reward)
+            state = self._state_id(step_result.next_state, step_result.has_jump)
             steps += 1
 
         return episode
 
     @beartype
-    def update_q_values(self, episode: list[tuple[Position, Action, float]]) -> dict[str, Any]:
-        """Update Q-value function using first-visit Monte Carlo."""
-        G = 0
-        returns = []
-        for _, _, reward in reversed(episode):
-            G = self.gamma * G + reward
-            returns.insert(0, G)
-
-        visited_state_actions = set()
-        update_details = []
+    def update_q_values(self, episode: Episode) -> dict[str, Any]:
+        """Update Q-value function from one episode's returns."""
+        if not episode.states:
+            return {'updates': [], 'total_updates': 0}
 
-        for i, (state, action, _) in enumerate(episode):
-            state_idx = self.gridworld.position_to_state(state)
-            action_idx = action.value
-
-            if (state_idx, action_idx) not in visited_state_actions:
-                visited_state_actions.add((state_idx, action_idx))
-
-                old_q_value = self.q_values[state_idx, action_idx]
-                self.q_returns[(state_idx, action_idx)].append(returns[i])
-                new_q_value = np.mean(self.q_returns[(state_idx, action_idx)])
-                self.q_values[state_idx, action_idx] = new_q_value
-
-                # Track update details
-                update_details.append({
-                    'state': state,
-                    'action': action,
-                    'old_q': old_q_value,
-                    'new_q': new_q_value,
-                    'return': returns[i],
-                    'visit_count': len(self.q_returns[(state_idx, action_idx)])
-                })
+        states = np.asarray(episode.states, dtype=np.int64)
+        actions = np.asarray(episode.actions, dtype=np.int64)
+        returns = self._compute_returns(episode.rewards)
+
+        if self.off_policy:
+            updated = self._update_off_policy(states, actions, returns)
+        else:
+            updated = self._update_on_policy(states, actions, returns)
+
+        update_details = []
+        for step, old_q_value in updated:
+            state_idx, action_idx = episode.states[step], episode.actions[step]
+            update_details.append({
+                'state': state_idx,
+                'action': action_idx,
+                'old_q': old_q_value,
+                'new_q': self.q_values[state_idx, action_idx],
+                'return': returns[step],
+                'visit_count': int(self.visit_counts[state_idx, action_idx])
+            })
 
         return {
             'updates': update_details,
             'total_updates': len(update_details)
         }
 
+    def _compute_returns(self, rewards: list[float]) -> np.ndarray:
+        """Accumulate discounted returns backwards into the reused buffer."""
+        length = len(rewards)
+        if length > len(self._returns_buffer):
+            self._returns_buffer = np.zeros(2 ** int(np.ceil(np.log2(length))))
+
+        returns = self._returns_buffer[:length]
+        G = 0.0
+        for t in range(length - 1, -1, -1):
+            G = self.gamma * G + rewards[t]
+            returns[t] = G
+        return returns
+
+    def _update_on_policy(self, states: np.ndarray, actions: np.ndarray, returns: np.ndarray) -> list[tuple[int, float]]:
+        """Fold returns into running means; returns (first step, old Q) per updated pair."""
+        num_actions = self.q_values.shape[1]
+        flat = states * num_actions + actions
+        unique_flat, first_steps, step_slots = np.unique(flat, return_index=True, return_inverse=True)
+
+        # Report pairs in order of first visit
+        order = np.argsort(first_steps)
+        unique_flat, first_steps = unique_flat[order], first_steps[order]
+        slot_rank = np.empty_like(order)
+        slot_rank[order] = np.arange(len(order))
+        step_slots = slot_rank[step_slots]
+
+        q_flat = self.q_values.reshape(-1)
+        counts_flat = self.visit_counts.reshape(-1)
+        old_q = q_flat[unique_flat].copy()
+
+        if self.every_visit:
+            # Mean over all visits: (n * Q + Σ G) / (n + k)
+            return_sums = np.zeros(len(unique_flat))
+            visits = np.zeros(len(unique_flat), dtype=np.int64)
+            np.add.at(return_sums, step_slots, returns)
+            np.add.at(visits, step_slots, 1)
+        else:
+            return_sums = returns[first_steps]
+            visits = np.ones(len(unique_flat), dtype=np.int64)
+
+        counts = counts_flat[unique_flat] + visits
+        q_flat[unique_flat] = old_q + (return_sums - visits * old_q) / counts
+        counts_flat[unique_flat] = counts
+
+        return list(zip(first_steps.tolist(), old_q.tolist()))
+
+    def _behaviour_probability(self, state: int, action: int) -> float:
+        """Probability that select_action_id picks action in state under the current Q-values."""
+        has_jump, cell = divmod(state, self.num_cells)
+        use_jump, move = divmod(action, len(Action))
+        probability = 0.0
+
+        # Exploration: a uniform valid move, with or without the jump half the time when one is held
+        valid_actions = self.gridworld.get_valid_action_ids(cell)
+        if any(valid.value == move for valid in valid_actions) and (has_jump or not use_jump):
+            probability += self.epsilon / len(valid_actions) * (0.5 if has_jump else 1.0)
+
+        # Greedy: uniform over the tied best columns
+        q_s = self.q_values[state]
+        if q_s[action] == q_s.max():
+            probability += (1.0 - self.epsilon) / np.count_nonzero(q_s == q_s.max())
+        return probability
+
+    def _update_off_policy(self, states: np.ndarray, actions: np.ndarray, returns: np.ndarray) -> list[tuple[int, float]]:
+        """Weighted importance sampling update toward the greedy target policy."""
+        # Behaviour probabilities under the Q-values the episode was generated with
+        behaviour = [self._behaviour_probability(int(state), int(action)) for state, action in zip(states, actions)]
+
+        updated = []
+        weight = 1.0
+        for t in range(len(states) - 1, -1, -1):
+            state_idx, action_idx = states[t], actions[t]
+            old_q_value = self.q_values[state_idx, action_idx]
+
+            self.visit_counts[state_idx, action_idx] += 1
+            self.cumulative_weights[state_idx, action_idx] += weight
+            self.q_values[state_idx, action_idx] += (
+                weight / self.cumulative_weights[state_idx, action_idx] * (returns[t] - old_q_value)
+            )
+            updated.append((t, float(old_q_value)))
+
+            # The greedy target policy breaks ties uniformly, like select_action_id,
+            # and assigns zero probability past a non-greedy action
+            q_s = self.q_values[state_idx]
+            best = q_s == q_s.max()
+            if not best[action_idx]:
+                break
+            weight *= 1.0 / (np.count_nonzero(best) * behaviour[t])
+
+        updated.reverse()
+        return updated
+
     @beartype
-    def run_episode(self) -> dict[str, Any]:
+    def run_episode(self, max_steps: int = 1000) -> dict[str, Any]:
         """Run a single episode and return metrics."""
-        episode = self.generate_episode()
+        episode = self.generate_episode(max_steps)
         old_q_values = self.q_values.copy()
 
-        # Track which state-action pairs we'll update
-        state_actions_in_episode = set()
-        for state, action, _ in episode:
-            state_idx = self.gridworld.position_to_state(state)
-            state_actions_in_episode.add((state_idx, action.value))
-
         update_info = self.update_q_values(episode)
 
         # Calculate episode metrics
-        total_reward = sum(reward for _, _, reward in episode)
-        episode_length = len(episode)
-        unique_states = len(set(self.gridworld.position_to_state(state) for state, _, _ in episode))
+        total_reward = sum(episode.rewards)
+        episode_length = len(episode.states)
+        path = self.episode_path(episode)
+        unique_states = len(set(path))
 
         self.episode_rewards.append(total_reward)
         self.episode_lengths.append(episode_length)
-        self.last_episode_trajectory = episode
+        self.last_episode = episode
 
         # Track convergence (max change in Q-values)
         max_change = np.max(np.abs(self.q_values - old_q_values))
         self.convergence_data.append(max_change)
 
         # Count Q-values updated this episode
-        q_updates = 0
-        for state_idx, action_idx in state_actions_in_episode:
-            if (state_idx, action_idx) in self.q_returns:
-                q_updates += 1
+        q_updates = update_info['total_updates']
 
         self.current_episode += 1
 
@@ -211,7 +342,7 @@ class MonteCarlo(BaseAlgorithm):
             'q_updates': q_updates,
             'max_q_change': max_change,
             'avg_reward': np.mean(self.episode_rewards[-100:]) if self.episode_rewards else 0,
-            'trajectory': [(pos.row, pos.col) for pos, _, _ in episode],
+            'trajectory': path,
             'update_details': update_info['updates']
         }
 
@@ -235,14 +366,14 @@ class MonteCarlo(BaseAlgorithm):
                 print(f"  • Avg reward (last 100): {metrics['avg_reward']:.2f}")
 
                 # Show exploration vs exploitation
-                total_sa_pairs = len(self.q_returns)
+                total_sa_pairs = int(np.count_nonzero(self.visit_counts))
                 print(f"  • Total (s,a) pairs learned: {total_sa_pairs}")
                 print()
 
         self.training_complete = True
 
         # Final statistics
-        total_sa_pairs = len(self.q_returns)
+        total_sa_pairs = int(np.count_nonzero(self.visit_counts))
         states_with_values = np.count_nonzero(np.max(self.q_values, axis=1))
 
         print(f"🏁 Training Complete!")
@@ -274,17 +405,19 @@ class MonteCarlo(BaseAlgorithm):
     def reset(self) -> None:
         """Reset the algorithm to initial state."""
         self.q_values.fill(0)
-        self.q_returns.clear()
+        self.visit_counts.fill(0)
+        self.cumulative_weights.fill(0)
         self.current_episode = 0
         self.episode_rewards.clear()
         self.episode_lengths.clear()
         self.training_complete = False
-        self.last_episode_trajectory.clear()
+        self.last_episode = Episode([], [], [])
         self.convergence_data.clear()
 
     @beartype
     def get_description(self) -> str:
         """Get algorithm description."""
-        return (f"Monte Carlo (On-Policy) - Model-free algorithm that learns "
+        mode = "Off-Policy, weighted IS" if self.off_policy else ("On-Policy, every-visit" if self.every_visit else "On-Policy")
+        return (f"Monte Carlo ({mode}) - Model-free algorithm that learns "
                 f"from complete episodes by averaging returns. "
                 f"γ={self.gamma}, ε={self.epsilon}, episodes={self.num_episodes}")
@@ -1,14 +1,15 @@
 """Temporal Difference (Q-Learning) algorithm implementation."""
 
 from collections import defaultdict
-import random
 from typing import Any
 
 from beartype import beartype
+from environment.typecheck import hot_path
 import numpy as np
 
-from .base_algorithm import BaseAlgorithm
+from .base_algorithm import BaseAlgorithm, Episode
 from environment.gridworld import GridWorld, Action, Position
+from environment.seeding import SeedLike
 
 
 class QLearning(BaseAlgorithm):
@@ -21,17 +22,27 @@ class QLearning(BaseAlgorithm):
         gamma: float = 0.9,
         alpha: float = 0.1,  # Learning rate
         epsilon: float = 0.1,
+        augmented: bool = False,
+        seed: SeedLike = None,
     ):
-        super().__init__(gridworld)
+        super().__init__(gridworld, seed=seed)
         self.gamma = gamma
         self.alpha = alpha
         self.epsilon = epsilon
-
-        # Action-value function
-        self.q_values = np.zeros((
-            gridworld.get_state_space_size(),
-            len(Action)
-        ))
+        self.augmented = augmented
+        self.num_cells = gridworld.get_state_space_size()
+
+        # Action-value function, over (position, has_jump) x (action, use_jump) when augmented
+        if augmented:
+            self.q_values = np.zeros((
+                gridworld.get_augmented_state_space_size(),
+                gridworld.get_augmented_action_space_size()
+            ))
+        else:
+            self.q_values = np.zeros((
+                gridworld.get_state_space_size(),
+                len(Action)
+            ))
 
         # Metrics
         self.episode_rewards = []
@@ -40,50 +51,70 @@ class QLearning(BaseAlgorithm):
         self.current_episode = 0
 
         # For visualization
-        self.last_episode_trajectory = []
         self.convergence_data = []
         self.last_update_details = []
 
-    @beartype
+    @hot_path
     def select_action(self, state: Position) -> Action:
         """Select action using epsilon-greedy policy w.r.t. Q-values."""
-        state_idx = self.gridworld.position_to_state(state)
-
-        if random.random() < self.epsilon:
-            valid_actions = self.gridworld.get_valid_actions(state)
-            return random.choice(valid_actions)
+        return self.select_action_and_jump(state)[0]
+
+    @hot_path
+    def select_action_and_jump(self, state: Position) -> tuple[Action, bool]:
+        """Select an epsilon-greedy (action, use_jump) pair, for GridWorld.step."""
+        state_idx = self._state_index(state, self.gridworld.has_jump)
+        return self.gridworld.decode_action(self.select_action_id(state_idx))
+
+    def _state_index(self, state: Position, has_jump: bool = False) -> int:
+        """Get the Q-table row for a state."""
+        if self.augmented:
+            return self.gridworld.encode_state(state, has_jump)
+        return self.gridworld.position_to_state(state)
+
+    def _state_id(self, cell: int, has_jump: bool) -> int:
+        """Get the Q-table row for a flat cell index and jump flag."""
+        return cell + self.num_cells if self.augmented and has_jump else cell
+
+    @hot_path
+    def select_action_id(self, state: int) -> int:
+        """Select an epsilon-greedy Q-table column, including jump moves when augmented."""
+        if self.rng.random() < self.epsilon:
+            has_jump, cell = divmod(state, self.num_cells)
+            valid_actions = self.gridworld.get_valid_action_ids(cell)
+            return self.gridworld.encode_action(
+                valid_actions[self.rng.integers(len(valid_actions))],
+                bool(has_jump and self.rng.random() < 0.5)
+            )
 
         # Greedy action: find best action(s) and break ties randomly
-        q_s = self.q_values[state_idx]
-        max_q = np.max(q_s)
-        best_actions = np.where(q_s == max_q)[0]
+        q_s = self.q_values[state]
+        best_actions = np.flatnonzero(q_s == q_s.max())
 
-        action_idx = np.random.choice(best_actions)
-        return Action(action_idx)
+        return int(self.rng.choice(best_actions))
 
-    @beartype
+    @hot_path
     def update(self, experience: dict[str, Any]) -> dict[str, Any]:
-        """Update Q-value using the Q-learning rule."""
+        """Update Q-value using the Q-learning rule.
+
+        The experience holds int ids: Q-table rows for 'state'/'next_state'
+        and a Q-table column for 'action'.
+        """
         state = experience['state']
         action = experience['action']
         reward = experience['reward']
         next_state = experience['next_state']
         done = experience['done']
 
-        state_idx = self.gridworld.position_to_state(state)
-        action_idx = action.value
-        next_state_idx = self.gridworld.position_to_state(next_state)
-
         # Q-learning update
-        old_q = self.q_values[state_idx, action_idx]
+        old_q = self.q_values[state, action]
         if done:
             target = reward
         else:
-            next_max_q = np.max(self.q_values[next_state_idx])
+            next_max_q = np.max(self.q_values[next_state])
             target = reward + self.gamma * next_max_q
 
         new_q = old_q + self.alpha * (target - old_q)
-        self.q_values[state_idx, action_idx] = new_q
+        self.q_values[state, action] = new_q
 
         # Return update details
         return {
@@ -108,25 +139,29 @@ class QLearning(BaseAlgorithm):
     @beartype
     def run_episode(self, max_steps: int = 1000) -> dict[str, Any]:
         """Run a single episode and return metrics."""
-        episode_trajectory = []
+        episode = Episode([], [], [])
         update_details = []
         old_q_values = self.q_values.copy()
 
-        state = self.gridworld.reset()
+        gridworld = self.gridworld
+        start = gridworld.reset()
+        state = self._state_id(gridworld.position_to_state(start), gridworld.has_jump)
         total_reward = 0
         steps = 0
 
-        while self.gridworld.status.value == 0 and steps < max_steps:  # RUNNING
-            action = self.select_action(state)
-            step_result = self.gridworld.step(action)
+        while gridworld.status.value == 0 and steps < max_steps:  # RUNNING
+            action = self.select_action_id(state)
+            use_jump, move = divmod(action, len(Action))
+            step_result = gridworld.step_fast(move, bool(use_jump))
+            next_state = self._state_id(step_result.next_state, step_result.has_jump)
 
             # Create experience for update
             experience = {
                 'state': state,
                 'action': action,
                 'reward': step_result.reward,
-                'next_state': step_result.next_state,
-                'done': self.gridworld.status.value != 0
+                'next_state': next_state,
+                'done': step_result.done
             }
 
             # Update Q-values
@@ -134,18 +169,21 @@ class QLearning(BaseAlgorithm):
             update_details.append(update_info)
 
             # Track episode
-            episode_trajectory.append((state, action, step_result.reward))
+            episode.states.append(state)
+            episode.actions.append(action)
+            episode.rewards.append(step_result.reward)
             total_reward += step_result.reward
-            state = step_result.next_state
+            state = next_state
             steps += 1
 
         # Calculate metrics
-        unique_states = len(set(self.gridworld.position_to_state(s) for s, _, _ in episode_trajectory))
+        path = self.episode_path(episode)
+        unique_states = len(set(path))
         max_change = np.max(np.abs(self.q_values - old_q_values))
 
         self.episode_rewards.append(total_reward)
         self.episode_lengths.append(steps)
-        self.last_episode_trajectory = episode_trajectory
+        self.last_episode = episode
         self.last_update_details = update_details
         self.convergence_data.append(max_change)
         self.current_episode += 1
@@ -158,7 +196,7 @@ class QLearning(BaseAlgorithm):
             'q_updates': len(update_details),
             'max_q_change': max_change,
             'avg_reward': np.mean(self.episode_rewards[-100:]) if self.episode_rewards else 0,
-            'trajectory': [(pos.row, pos.col) for pos, _, _ in episode_trajectory],
+            'trajectory': path,
             'update_details': update_details
         }
 
@@ -183,25 +221,27 @@ class QLearning(BaseAlgorithm):
 
             # Only include states that have been updated (non-zero Q-values)
             if np.any(q_values != 0):
-                pos = self.gridworld.state_to_position(state)
-                best_action_idx = np.argmax(q_values)
-                best_action = Action(best_action_idx)
-                state_value = np.max(q_values)
+                pos, has_jump = self.gridworld.decode_state(state)
+                # Jump columns are only available while holding a jump
+                available = q_values if has_jump else q_values[:len(Action)]
+                best_action, use_jump = self.gridworld.decode_action(int(np.argmax(available)))
+                state_value = np.max(available)
 
                 # Count how many times this state has been visited
-                visits = sum(1 for details in self.last_update_details
-                           if self.gridworld.position_to_state(details['state']) == state)
+                visits = sum(1 for details in self.last_update_details if details['state'] == state)
 
                 policy_info.append({
                     'position': pos,
+                    'has_jump': has_jump,
                     'best_action': best_action,
+                    'use_jump': use_jump,
                     'state_value': state_value,
                     'q_values': q_values.copy(),
                     'visits': visits
                 })
 
         # Sort by position for consistent display
-        policy_info.sort(key=lambda x: (x['position'].row, x['position'].col))
+        policy_info.sort(key=lambda x: (x['position'].row, x['position'].col, x['has_jump'], x['use_jump']))
         return policy_info
 
     @beartype
@@ -212,7 +252,7 @@ class QLearning(BaseAlgorithm):
         self.episode_lengths.clear()
         self.training_complete = False
         self.current_episode = 0
-        self.last_episode_trajectory.clear()
+        self.last_episode = Episode([], [], [])
         self.convergence_data.clear()
         self.last_update_details.clear()
 
@@ -220,4 +260,4 @@ class QLearning(BaseAlgorithm):
     def get_description(self) -> str:
         """Get algorithm description."""
         return (f"Q-Learning - Off-policy TD control. "
-                f"γ={self.gamma}, α={self.alpha}, ε={self.epsilon}")
+                f"γ={self.gamma}, α={self.alpha}, ε={self.epsilon}, augmented={self.augmented}")
@@ -1,32 +1,29 @@
 """Random strategy algorithm for baseline comparison."""
 
-import random
 from typing import Any
 from beartype import beartype
+from environment.typecheck import hot_path
 import numpy as np
 from environment.gridworld import GridWorld, Action, Position
+from environment.seeding import SeedLike
 from .base_algorithm import BaseAlgorithm
 
 
 class RandomStrategy(BaseAlgorithm):
     """Random action selection strategy."""
 
-    def __init__(self, gridworld: GridWorld, seed: int | None = None):
-        super().__init__(gridworld)
-        self.seed = seed
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
+    def __init__(self, gridworld: GridWorld, seed: SeedLike = None):
+        super().__init__(gridworld, seed=seed)
 
-    @beartype
+    @hot_path
     def select_action(self, state: Position) -> Action:
         """Select a random valid action."""
         valid_actions = self.gridworld.get_valid_actions(state)
         if not valid_actions:
             return Action.UP  # Fallback if no valid actions
-        return random.choice(valid_actions)
+        return valid_actions[self.rng.integers(len(valid_actions))]
 
-    @beartype
+    @hot_path
     def update(self, experience: dict[str, Any]) -> None:
         """Random strategy doesn't learn from experience."""
         pass
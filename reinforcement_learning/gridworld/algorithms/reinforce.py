@@ -3,86 +3,90 @@
 import numpy as np
 from typing import Any
 from beartype import beartype
+from environment.typecheck import hot_path
 from environment.gridworld import GridWorld, Action, Position, CellType
-from algorithms.base_algorithm import BaseAlgorithm
+from environment.seeding import SeedLike
+from environment.vector_env import VectorGridWorld
+from algorithms.base_algorithm import BaseAlgorithm, Episode
 
 
 class PolicyNetwork:
-    """Simple neural network for policy parameterization."""
+    """Simple neural network for policy parameterization.
 
-    def __init__(self, state_size: int, action_size: int, learning_rate: float = 0.01):
+    With one-hot state inputs the linear layer reduces to selecting row
+    W[state], so forward/backward gather and scatter rows by state index.
+    """
+
+    def __init__(
+        self,
+        state_size: int,
+        action_size: int,
+        learning_rate: float = 0.01,
+        rng: np.random.Generator | None = None
+    ):
         self.state_size = state_size
         self.action_size = action_size
         self.learning_rate = learning_rate
 
         # Initialize weights with small random values
-        self.W = np.random.normal(0, 0.1, (state_size, action_size))
+        rng = rng if rng is not None else np.random.default_rng()
+        self.W = rng.normal(0, 0.1, (state_size, action_size))
         self.b = np.zeros(action_size)
 
-    @beartype
+    @hot_path
     def forward(self, state: int) -> np.ndarray:
         """Forward pass to get action probabilities."""
-        # One-hot encode state
-        state_vec = np.zeros(self.state_size)
-        state_vec[state] = 1.0
+        return self.forward_batch(np.array([state]))[0]
 
-        # Linear layer
-        logits = np.dot(state_vec, self.W) + self.b
+    @beartype
+    def forward_batch(self, states: np.ndarray) -> np.ndarray:
+        """Action probabilities for a batch of states, shape (len(states), action_size)."""
+        # Linear layer on one-hot inputs
+        logits = self.W[states] + self.b
 
         # Clip logits to prevent overflow
         logits = np.clip(logits, -500, 500)
 
         # Softmax to get probabilities
-        exp_logits = np.exp(logits - np.max(logits))  # Numerical stability
-        probs = exp_logits / np.sum(exp_logits)
+        exp_logits = np.exp(logits - logits.max(axis=1, keepdims=True))  # Numerical stability
+        probs = exp_logits / exp_logits.sum(axis=1, keepdims=True)
 
         # Ensure probabilities are valid and sum to 1
         probs = np.clip(probs, 1e-8, 1.0)  # Prevent zero probabilities
-        probs = probs / np.sum(probs)  # Renormalize
-
-        return probs
+        return probs / probs.sum(axis=1, keepdims=True)  # Renormalize
 
     @beartype
     def backward(self, state: int, action: int, advantage: float) -> None:
         """Backward pass to update weights using policy gradient."""
-        # Clip advantage to prevent exploding gradients
-        advantage = np.clip(advantage, -100, 100)
+        self.backward_batch(np.array([state]), np.array([action]), np.array([advantage]))
 
-        # One-hot encode state
-        state_vec = np.zeros(self.state_size)
-        state_vec[state] = 1.0
-
-        # Get current probabilities
-        probs = self.forward(state)
+    @beartype
+    def backward_batch(self, states: np.ndarray, actions: np.ndarray, advantages: np.ndarray) -> None:
+        """Apply the summed policy-gradient update for a batch of timesteps."""
+        # Clip advantage to prevent exploding gradients
+        advantages = np.clip(advantages, -100, 100)
 
-        # Compute gradient (safe division)
-        grad_log_prob = np.zeros(self.action_size)
-        prob_action = max(probs[action], 1e-8)  # Prevent division by zero
-        grad_log_prob[action] = 1.0 / prob_action
+        probs = self.forward_batch(states)
+        steps = np.arange(len(states))
 
-        # Policy gradient update
-        grad_W = np.outer(state_vec, grad_log_prob) * advantage
-        grad_b = grad_log_prob * advantage
+        # Gradient (safe division)
+        grad = np.zeros_like(probs)
+        grad[steps, actions] = advantages / np.maximum(probs[steps, actions], 1e-8)
 
         # Add entropy regularization to prevent policy collapse
         entropy_bonus = 0.01  # Small entropy coefficient
-        entropy_grad = np.zeros(self.action_size)
-        for a in range(self.action_size):
-            entropy_grad[a] = -(np.log(probs[a]) + 1.0)
+        grad += entropy_bonus * -(np.log(probs) + 1.0)
 
-        grad_W += entropy_bonus * np.outer(state_vec, entropy_grad)
-        grad_b += entropy_bonus * entropy_grad
+        # Clip per-timestep gradients to prevent exploding gradients
+        grad = np.clip(grad, -10, 10)
 
-        # Clip gradients to prevent exploding gradients
-        grad_W = np.clip(grad_W, -10, 10)
-        grad_b = np.clip(grad_b, -10, 10)
+        # Update parameters, scattering each timestep into its state's row
+        np.add.at(self.W, states, self.learning_rate * grad)
+        self.b += self.learning_rate * grad.sum(axis=0)
 
-        # Update parameters
-        self.W += self.learning_rate * grad_W
-        self.b += self.learning_rate * grad_b
-
-        # Clip weights to prevent them from becoming too large
-        self.W = np.clip(self.W, -10, 10)
+        # Clip weights to prevent them from becoming too large; only touched rows can exceed
+        touched = np.unique(states)
+        self.W[touched] = np.clip(self.W[touched], -10, 10)
         self.b = np.clip(self.b, -10, 10)
 
 
@@ -94,9 +98,10 @@ class REINFORCE(BaseAlgorithm):
         gridworld: GridWorld,
         learning_rate: float = 0.01,
         gamma: float = 0.99,
-        baseline: bool = True
+        baseline: bool = True,
+        seed: SeedLike = None
     ):
-        super().__init__(gridworld)
+        super().__init__(gridworld, seed=seed)
         self.learning_rate = learning_rate
         self.gamma = gamma
         self.use_baseline = baseline
@@ -104,7 +109,7 @@ class REINFORCE(BaseAlgorithm):
         # Initialize policy network
         state_size = gridworld.get_state_space_size()
         action_size = len(Action)
-        self.policy_net = PolicyNetwork(state_size, action_size, learning_rate)
+        self.policy_net = PolicyNetwork(state_size, action_size, learning_rate, rng=self.rng)
 
         # Episode storage
         self.episode_states: list[int] = []
@@ -119,11 +124,18 @@ class REINFORCE(BaseAlgorithm):
         # Baseline for variance reduction
         self.baseline_value = 0.0
 
-    @beartype
+        # Lockstep environments for run_parallel_episodes, created on first use
+        self.vector_env: VectorGridWorld | None = None
+
+    @hot_path
     def select_action(self, state: Position) -> Action:
         """Select action using current policy."""
-        state_idx = self.gridworld.position_to_state(state)
-        probs = self.policy_net.forward(state_idx)
+        return Action(self.select_action_id(self.gridworld.position_to_state(state)))
+
+    @hot_path
+    def select_action_id(self, state: int) -> int:
+        """Sample an action id from the policy at a flat cell index."""
+        probs = self.policy_net.forward(state)
 
         # Check for NaN or invalid probabilities
         if np.any(np.isnan(probs)) or np.any(probs < 0) or np.sum(probs) == 0:
@@ -131,20 +143,14 @@ class REINFORCE(BaseAlgorithm):
             probs = np.ones(len(Action)) / len(Action)
 
         # Sample action from probability distribution
-        action_idx = np.random.choice(len(Action), p=probs)
-        return Action(action_idx)
+        return int(self.rng.choice(len(Action), p=probs))
 
-    @beartype
+    @hot_path
     def update(self, experience: dict[str, Any]) -> None:
-        """Store experience for episode-based update."""
-        state_pos = experience['state']
-        state_idx = self.gridworld.position_to_state(state_pos)
-        action = experience['action']
-        reward = experience['reward']
-
-        self.episode_states.append(state_idx)
-        self.episode_actions.append(action.value)
-        self.episode_rewards.append(reward)
+        """Store experience (int 'state' and 'action' ids) for episode-based update."""
+        self.episode_states.append(experience['state'])
+        self.episode_actions.append(experience['action'])
+        self.episode_rewards.append(experience['reward'])
 
     @beartype
     def finish_episode(self) -> dict[str, Any]:
@@ -152,28 +158,37 @@ class REINFORCE(BaseAlgorithm):
         if not self.episode_states:
             return {"episode": self.episode_count, "reward": 0.0, "length": 0}
 
+        states = np.array(self.episode_states)
+        actions = np.array(self.episode_actions)
+        rewards = np.array(self.episode_rewards)
+
+        advantages, episode_return = self._episode_advantages(rewards)
+        self.policy_net.backward_batch(states, actions, advantages)
+        metrics = self._record_episode(episode_return, len(states))
+
+        # Hand the episode lists over and start fresh ones
+        self.last_episode = Episode(self.episode_states, self.episode_actions, self.episode_rewards)
+        self.episode_states = []
+        self.episode_actions = []
+        self.episode_rewards = []
+
+        return metrics
+
+    def _episode_advantages(self, rewards: np.ndarray) -> tuple[np.ndarray, float]:
+        """Update the baseline with one episode and return its (advantages, total reward)."""
         # Calculate returns (discounted rewards)
-        returns = self._calculate_returns()
+        returns = self._calculate_returns(rewards)
 
         # Update baseline
-        episode_return = sum(self.episode_rewards)
+        episode_return = float(rewards.sum())
         if self.use_baseline:
             self.baseline_value = 0.9 * self.baseline_value + 0.1 * episode_return
-
-        # Policy gradient updates
-        for t in range(len(self.episode_states)):
-            state = self.episode_states[t]
-            action = self.episode_actions[t]
-
             # Use return as advantage (or return - baseline)
-            advantage = returns[t]
-            if self.use_baseline:
-                advantage -= self.baseline_value
+            return returns - self.baseline_value, episode_return
+        return returns.copy(), episode_return
 
-            # Update policy network
-            self.policy_net.backward(state, action, advantage)
-
-        # Update statistics
+    def _record_episode(self, episode_return: float, length: int) -> dict[str, Any]:
+        """Update running statistics for a finished episode."""
         self.episode_count += 1
         self.total_reward_history.append(episode_return)
 
@@ -182,61 +197,91 @@ class REINFORCE(BaseAlgorithm):
             self.total_reward_history.pop(0)
         self.avg_reward = np.mean(self.total_reward_history)
 
-        # Prepare metrics
-        metrics = {
+        return {
             "episode": self.episode_count,
             "reward": episode_return,
-            "length": len(self.episode_states),
+            "length": length,
             "avg_reward": self.avg_reward,
             "baseline": self.baseline_value
         }
 
-        # Clear episode data
-        self.episode_states.clear()
-        self.episode_actions.clear()
-        self.episode_rewards.clear()
-
-        return metrics
-
     @beartype
-    def _calculate_returns(self) -> list[float]:
-        """Calculate discounted returns for each timestep."""
-        returns = []
+    def _calculate_returns(self, rewards: np.ndarray) -> np.ndarray:
+        """Calculate discounted returns for each timestep, backwards into a new array."""
+        returns = np.empty(len(rewards))
         G = 0.0
+        for t in range(len(rewards) - 1, -1, -1):
+            G = rewards[t] + self.gamma * G
+            returns[t] = G
+        return returns
 
-        # Calculate returns backwards
-        for reward in reversed(self.episode_rewards):
-            G = reward + self.gamma * G
-            returns.insert(0, G)
+    @beartype
+    def run_parallel_episodes(self, num_episodes: int, max_steps: int = 1000) -> dict[str, Any]:
+        """Run num_episodes episodes in lockstep and apply one batched policy update."""
+        if self.vector_env is None or self.vector_env.num_envs != num_episodes or self.vector_env.max_steps != max_steps:
+            self.vector_env = VectorGridWorld(self.gridworld, num_envs=num_episodes, max_steps=max_steps)
+        self.vector_env.reset()
+
+        states = np.zeros((max_steps, num_episodes), dtype=np.int64)
+        actions = np.zeros((max_steps, num_episodes), dtype=np.int64)
+        rewards = np.zeros((max_steps, num_episodes))
+        lengths = np.zeros(num_episodes, dtype=np.int64)
+        active = np.ones(num_episodes, dtype=bool)
+
+        for t in range(max_steps):
+            if not active.any():
+                break
+            current = self.vector_env.states.copy()
+
+            # Inverse-CDF sampling from every environment's action distribution at once
+            probs = self.policy_net.forward_batch(current)
+            draws = self.rng.random((num_episodes, 1))
+            chosen = np.minimum((probs.cumsum(axis=1) < draws).sum(axis=1), probs.shape[1] - 1)
+
+            result = self.vector_env.step(chosen)
+            states[t], actions[t], rewards[t] = current, chosen, np.where(active, result.rewards, 0.0)
+            lengths += active
+            active &= ~(result.dones | result.truncated)
+
+        batch_states, batch_actions, batch_advantages = [], [], []
+        episode_metrics = []
+        for env in range(num_episodes):
+            length = lengths[env]
+            advantages, episode_return = self._episode_advantages(rewards[:length, env])
+            batch_states.append(states[:length, env])
+            batch_actions.append(actions[:length, env])
+            batch_advantages.append(advantages)
+            episode_metrics.append(self._record_episode(episode_return, int(length)))
+
+        self.policy_net.backward_batch(
+            np.concatenate(batch_states),
+            np.concatenate(batch_actions),
+            np.concatenate(batch_advantages)
+        )
 
-        return returns
+        return {
+            "episode": self.episode_count,
+            "episodes": num_episodes,
+            "reward": float(np.mean([m["reward"] for m in episode_metrics])),
+            "length": float(lengths.mean()),
+            "avg_reward": self.avg_reward,
+            "baseline": self.baseline_value
+        }
 
     @beartype
     def get_values(self) -> np.ndarray | None:
         """Get state values (not directly available in REINFORCE)."""
         # For visualization, we can show expected returns under current policy
-        values = np.zeros(self.gridworld.get_state_space_size())
-
-        for state in range(self.gridworld.get_state_space_size()):
-            pos = self.gridworld.state_to_position(state)
-            if self.gridworld.grid[pos.row, pos.col] != CellType.OBSTACLE:
-                # Simple approximation: use baseline value
-                values[state] = self.baseline_value
-
-        return values
+        # Simple approximation: use baseline value on every non-obstacle cell
+        walkable = self.gridworld.grid.ravel() != CellType.OBSTACLE
+        return np.where(walkable, self.baseline_value, 0.0)
 
     @beartype
     def get_policy(self) -> np.ndarray | None:
         """Get policy for visualization."""
-        policy = np.zeros(self.gridworld.get_state_space_size(), dtype=int)
-
-        for state in range(self.gridworld.get_state_space_size()):
-            pos = self.gridworld.state_to_position(state)
-            if self.gridworld.grid[pos.row, pos.col] != CellType.OBSTACLE:
-                probs = self.policy_net.forward(state)
-                policy[state] = np.argmax(probs)
-
-        return policy
+        walkable = self.gridworld.grid.ravel() != CellType.OBSTACLE
+        probs = self.policy_net.forward_batch(np.arange(self.gridworld.get_state_space_size()))
+        return np.where(walkable, np.argmax(probs, axis=1), 0)
 
     @beartype
     def get_action_probabilities(self, state: Position) -> np.ndarray:
@@ -257,12 +302,13 @@ class REINFORCE(BaseAlgorithm):
         # Reinitialize policy network
         state_size = self.gridworld.get_state_space_size()
         action_size = len(Action)
-        self.policy_net = PolicyNetwork(state_size, action_size, self.learning_rate)
+        self.policy_net = PolicyNetwork(state_size, action_size, self.learning_rate, rng=self.rng)
 
         # Clear episode data
         self.episode_states.clear()
         self.episode_actions.clear()
         self.episode_rewards.clear()
+        self.last_episode = Episode([], [], [])
 
         # Reset statistics
         self.episode_count = 0
@@ -283,25 +329,26 @@ class REINFORCE(BaseAlgorithm):
     @beartype
     def run_episode(self, max_steps: int = 1000) -> dict[str, Any]:
         """Run a complete episode and update policy."""
-        self.gridworld.reset()
+        gridworld = self.gridworld
+        state = gridworld.position_to_state(gridworld.reset())
         steps = 0
 
-        while not self.gridworld.is_terminal() and steps < max_steps:
-            current_state = self.gridworld.agent_pos
-            action = self.select_action(current_state)
+        while gridworld.status.value == 0 and steps < max_steps:  # RUNNING
+            action = self.select_action_id(state)
 
             # Take action
-            step_result = self.gridworld.step(action)
+            step_result = gridworld.step_fast(action)
 
             # Store experience
             experience = {
-                'state': current_state,
+                'state': state,
                 'action': action,
                 'reward': step_result.reward,
                 'next_state': step_result.next_state,
                 'done': step_result.done
             }
             self.update(experience)
+            state = step_result.next_state
             steps += 1
 
         # Finish episode and update policy
@@ -0,0 +1,185 @@
+"""Sarsa(λ) and Watkins's Q(λ) control with eligibility traces."""
+
+from typing import Any
+
+from beartype import beartype
+from environment.typecheck import hot_path
+import numpy as np
+
+from .q_learning import QLearning
+from .base_algorithm import Episode
+from .eligibility_traces import SparseTraces
+from environment.gridworld import GridWorld, Action
+from environment.seeding import SeedLike
+
+
+class SarsaLambda(QLearning):
+    """Sarsa(λ): On-policy TD control with eligibility traces over (s, a)."""
+
+    @beartype
+    def __init__(
+        self,
+        gridworld: GridWorld,
+        gamma: float = 0.9,
+        alpha: float = 0.1,
+        epsilon: float = 0.1,
+        lambda_: float = 0.8,
+        augmented: bool = False,
+        replacing_traces: bool = False,
+        trace_threshold: float = 1e-4,
+        seed: SeedLike = None,
+    ):
+        super().__init__(gridworld, gamma=gamma, alpha=alpha, epsilon=epsilon, augmented=augmented, seed=seed)
+        self.lambda_ = lambda_
+        self.traces = SparseTraces(threshold=trace_threshold, replacing=replacing_traces)
+
+    def _bootstrap(self, next_state_idx: int, next_action_idx: int) -> float:
+        """Q estimate of the successor used in the TD target."""
+        return self.q_values[next_state_idx, next_action_idx]
+
+    def _keeps_traces(self, next_state_idx: int, next_action_idx: int) -> bool:
+        """Whether traces carry into the next step (asked before the update); Sarsa(λ) always keeps them."""
+        return True
+
+    @hot_path
+    def update(self, experience: dict[str, Any]) -> dict[str, Any]:
+        """Update every traced Q-value; the experience must carry next_action.
+
+        All ids are Q-table rows ('state', 'next_state') and columns
+        ('action', 'next_action').
+        """
+        state = experience['state']
+        action = experience['action']
+        reward = experience['reward']
+        next_state = experience['next_state']
+        next_action = experience['next_action']
+        done = experience['done']
+
+        old_q = self.q_values[state, action]
+        if done:
+            target = reward
+        else:
+            target = reward + self.gamma * self._bootstrap(next_state, next_action)
+        td_error = target - old_q
+        keep_traces = not done and self._keeps_traces(next_state, next_action)
+
+        self.traces.visit(state * self.q_values.shape[1] + action)
+        self.traces.apply(self.q_values, self.alpha * td_error)
+        active_traces = len(self.traces)
+
+        if keep_traces:
+            self.traces.decay(self.gamma * self.lambda_)
+        else:
+            self.traces.clear()
+
+        return {
+            'state': state,
+            'action': action,
+            'old_q': old_q,
+            'new_q': self.q_values[state, action],
+            'target': target,
+            'td_error': td_error,
+            'active_traces': active_traces
+        }
+
+    @beartype
+    def run_episode(self, max_steps: int = 1000) -> dict[str, Any]:
+        """Run a single episode and return metrics."""
+        episode = Episode([], [], [])
+        update_details = []
+        old_q_values = self.q_values.copy()
+        self.traces.clear()
+
+        gridworld = self.gridworld
+        start = gridworld.reset()
+        state = self._state_id(gridworld.position_to_state(start), gridworld.has_jump)
+        action = self.select_action_id(state)
+        total_reward = 0
+        steps = 0
+
+        while gridworld.status.value == 0 and steps < max_steps:  # RUNNING
+            use_jump, move = divmod(action, len(Action))
+            step_result = gridworld.step_fast(move, bool(use_jump))
+            next_state = self._state_id(step_result.next_state, step_result.has_jump)
+            next_action = self.select_action_id(next_state)
+
+            # Create experience for update
+            experience = {
+                'state': state,
+                'action': action,
+                'reward': step_result.reward,
+                'next_state': next_state,
+                'next_action': next_action,
+                'done': step_result.done
+            }
+
+            # Update Q-values
+            update_info = self.update(experience)
+            update_details.append(update_info)
+
+            # Track episode
+            episode.states.append(state)
+            episode.actions.append(action)
+            episode.rewards.append(step_result.reward)
+            total_reward += step_result.reward
+            state, action = next_state, next_action
+            steps += 1
+
+        # Calculate metrics
+        path = self.episode_path(episode)
+        unique_states = len(set(path))
+        max_change = np.max(np.abs(self.q_values - old_q_values))
+
+        self.episode_rewards.append(total_reward)
+        self.episode_lengths.append(steps)
+        self.last_episode = episode
+        self.last_update_details = update_details
+        self.convergence_data.append(max_change)
+        self.current_episode += 1
+
+        return {
+            'episode': self.current_episode,
+            'reward': total_reward,
+            'length': steps,
+            'states_visited': unique_states,
+            'q_updates': len(update_details),
+            'max_q_change': max_change,
+            'avg_reward': np.mean(self.episode_rewards[-100:]) if self.episode_rewards else 0,
+            'trajectory': path,
+            'update_details': update_details
+        }
+
+    @beartype
+    def reset(self) -> None:
+        """Reset the algorithm to initial state."""
+        super().reset()
+        self.traces.clear()
+
+    @beartype
+    def get_description(self) -> str:
+        """Get algorithm description."""
+        return (f"Sarsa(λ) - On-policy TD control with eligibility traces. "
+                f"γ={self.gamma}, α={self.alpha}, ε={self.epsilon}, λ={self.lambda_}")
+
+
+class WatkinsQLambda(SarsaLambda):
+    """Watkins's Q(λ): Off-policy Q-learning with traces cut at exploratory actions."""
+
+    def _bootstrap(self, next_state_idx: int, next_action_idx: int) -> float:
+        """Greedy successor value, as in one-step Q-learning."""
+        return np.max(self.q_values[next_state_idx])
+
+    def _keeps_traces(self, next_state_idx: int, next_action_idx: int) -> bool:
+        """Keep traces only while the behaviour policy follows the greedy one.
+
+        A* = argmax Q(s', ·) is taken before the TD update, as Watkins's
+        algorithm specifies; when s' == s the update itself could move it.
+        """
+        q_next = self.q_values[next_state_idx]
+        return bool(q_next[next_action_idx] == np.max(q_next))
+
+    @beartype
+    def get_description(self) -> str:
+        """Get algorithm description."""
+        return (f"Watkins Q(λ) - Off-policy TD control with eligibility traces. "
+                f"γ={self.gamma}, α={self.alpha}, ε={self.epsilon}, λ={self.lambda_}")
@@ -0,0 +1,86 @@
+"""TD(λ) algorithm implementation for state value prediction."""
+
+from typing import Any
+from beartype import beartype
+from environment.typecheck import hot_path
+
+from .temporal_difference import TD0
+from .eligibility_traces import SparseTraces
+from environment.gridworld import GridWorld
+from environment.seeding import SeedLike
+
+
+class TDLambda(TD0):
+    """TD(λ): TD(0) with eligibility traces (backward view).
+
+    Each TD error is applied to every recently visited state in proportion
+    to its trace, so credit reaches the start of long paths in one episode.
+    """
+
+    @beartype
+    def __init__(
+        self,
+        gridworld: GridWorld,
+        gamma: float = 0.9,
+        alpha: float = 0.1,
+        epsilon: float = 0.1,
+        lambda_: float = 0.8,
+        replacing_traces: bool = False,
+        trace_threshold: float = 1e-4,
+        seed: SeedLike = None,
+    ):
+        super().__init__(gridworld, gamma=gamma, alpha=alpha, epsilon=epsilon, seed=seed)
+        self.lambda_ = lambda_
+        self.traces = SparseTraces(threshold=trace_threshold, replacing=replacing_traces)
+
+    @hot_path
+    def update(self, experience: dict[str, Any]) -> dict[str, Any]:
+        """Update state values of all traced states using the TD(λ) rule."""
+        state = experience['state']
+        reward = experience['reward']
+        next_state = experience['next_state']
+        done = experience['done']
+
+        old_value = self.state_values[state]
+        if done:
+            target = reward
+        else:
+            target = reward + self.gamma * self.state_values[next_state]
+        td_error = target - old_value
+
+        self.traces.visit(state)
+        self.traces.apply(self.state_values, self.alpha * td_error)
+        self.values_version += 1
+        active_traces = len(self.traces)
+
+        if done:
+            self.traces.clear()
+        else:
+            self.traces.decay(self.gamma * self.lambda_)
+
+        return {
+            'state': state,
+            'old_value': old_value,
+            'new_value': self.state_values[state],
+            'target': target,
+            'td_error': td_error,
+            'active_traces': active_traces
+        }
+
+    @beartype
+    def run_episode(self, max_steps: int = 1000) -> dict[str, Any]:
+        """Run a single episode, starting from empty traces."""
+        self.traces.clear()
+        return super().run_episode(max_steps)
+
+    @beartype
+    def reset(self) -> None:
+        """Reset the algorithm to initial state."""
+        super().reset()
+        self.traces.clear()
+
+    @beartype
+    def get_description(self) -> str:
+        """Get algorithm description."""
+        return (f"TD(λ) - On-policy state value prediction with eligibility traces. "
+                f"γ={self.gamma}, α={self.alpha}, ε={self.epsilon}, λ={self.lambda_}")
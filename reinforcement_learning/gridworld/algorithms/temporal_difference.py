@@ -1,12 +1,13 @@
 """Temporal Difference (TD(0)) algorithm implementation for state value prediction."""
 
-import random
 from typing import Any
 from beartype import beartype
+from environment.typecheck import hot_path
 import numpy as np
 
-from .base_algorithm import BaseAlgorithm
+from .base_algorithm import BaseAlgorithm, Episode
 from environment.gridworld import GridWorld, Action, Position
+from environment.seeding import SeedLike
 
 
 class TD0(BaseAlgorithm):
@@ -19,14 +20,20 @@ class TD0(BaseAlgorithm):
         gamma: float = 0.9,
         alpha: float = 0.1,
         epsilon: float = 0.1,
+        seed: SeedLike = None,
     ):
-        super().__init__(gridworld)
+        super().__init__(gridworld, seed=seed)
         self.gamma = gamma
         self.alpha = alpha
         self.epsilon = epsilon
 
-        # State value function
+        # State value function; values_version is bumped on every write
         self.state_values = np.zeros(gridworld.get_state_space_size())
+        self.values_version = 0
+
+        # Greedy policy memo, keyed on (values_version, grid_version)
+        self._policy_cache: np.ndarray | None = None
+        self._policy_cache_key: tuple[int, int] | None = None
 
         # Metrics
         self.episode_rewards = []
@@ -35,59 +42,56 @@ class TD0(BaseAlgorithm):
         self.current_episode = 0
 
         # For visualization
-        self.last_episode_trajectory = []
         self.convergence_data = []
         self.last_update_details = []
 
-    @beartype
+    @hot_path
     def select_action(self, state: Position) -> Action:
         """Select action using epsilon-greedy policy w.r.t. state values."""
-        if random.random() < self.epsilon:
-            valid_actions = self.gridworld.get_valid_actions(state)
-            return random.choice(valid_actions)
+        return Action(self.select_action_id(self.gridworld.position_to_state(state)))
 
-        # Greedy action: choose action that leads to highest value next state
-        state_idx = self.gridworld.position_to_state(state)
-        valid_actions = self.gridworld.get_valid_actions(state)
+    @hot_path
+    def select_action_id(self, state: int) -> int:
+        """Select an epsilon-greedy action id for a flat cell index."""
+        if self.rng.random() < self.epsilon:
+            valid_actions = self.gridworld.get_valid_action_ids(state)
+            return int(valid_actions[self.rng.integers(len(valid_actions))])
 
-        best_value = float('-inf')
-        best_actions = []
+        # Greedy action: choose action that leads to highest value next state
+        next_values = self._next_state_values(state)
 
-        for action in valid_actions:
-            # Simulate taking this action to see next state
-            next_state = self.gridworld._get_next_position(state, action)
-            next_state_idx = self.gridworld.position_to_state(next_state)
-            next_value = self.state_values[next_state_idx]
+        best_actions = np.flatnonzero(next_values == next_values.max())
+        return int(self.rng.choice(best_actions))
 
-            if next_value > best_value:
-                best_value = next_value
-                best_actions = [action]
-            elif next_value == best_value:
-                best_actions.append(action)
+    def _next_state_values(self, state_idx: int | np.ndarray) -> np.ndarray:
+        """Value of the cell each action leads to, -inf for invalid actions.
 
-        return random.choice(best_actions)
+        Accepts a single state index (returns (A,)) or an array of them
+        (returns (..., A)).
+        """
+        tables = self.gridworld.get_neighbor_tables()
+        valid = (tables.valid_actions[state_idx][..., None] >> np.arange(len(Action))) & 1
+        return np.where(valid, self.state_values[tables.next_states[state_idx]], -np.inf)
 
-    @beartype
+    @hot_path
     def update(self, experience: dict[str, Any]) -> dict[str, Any]:
-        """Update state value using TD(0) rule."""
+        """Update state value using TD(0) rule; 'state'/'next_state' are flat cell indices."""
         state = experience['state']
         reward = experience['reward']
         next_state = experience['next_state']
         done = experience['done']
 
-        state_idx = self.gridworld.position_to_state(state)
-        next_state_idx = self.gridworld.position_to_state(next_state)
-
         # TD(0) update
-        old_value = self.state_values[state_idx]
+        old_value = self.state_values[state]
         if done:
             target = reward
         else:
-            target = reward + self.gamma * self.state_values[next_state_idx]
+            target = reward + self.gamma * self.state_values[next_state]
 
         td_error = target - old_value
         new_value = old_value + self.alpha * td_error
-        self.state_values[state_idx] = new_value
+        self.state_values[state] = new_value
+        self.values_version += 1
 
         # Return update details
         return {
@@ -104,44 +108,35 @@ class TD0(BaseAlgorithm):
         return self.state_values.copy()
 
     @beartype
-    def get_policy(self) -> np.ndarray:
-        """Get current greedy policy from state values."""
-        policy = np.zeros(self.gridworld.get_state_space_size(), dtype=int)
-
-        for state_idx in range(self.gridworld.get_state_space_size()):
-            pos = self.gridworld.state_to_position(state_idx)
-            valid_actions = self.gridworld.get_valid_actions(pos)
+    def compute_policy(self) -> np.ndarray:
+        """Compute the greedy policy from state values (first best valid action)."""
+        all_states = np.arange(self.gridworld.get_state_space_size())
+        return np.argmax(self._next_state_values(all_states), axis=1)
 
-            best_value = float('-inf')
-            best_action = valid_actions[0]  # Default
-
-            for action in valid_actions:
-                next_pos = self.gridworld._get_next_position(pos, action)
-                next_state_idx = self.gridworld.position_to_state(next_pos)
-                next_value = self.state_values[next_state_idx]
-
-                if next_value > best_value:
-                    best_value = next_value
-                    best_action = action
-
-            policy[state_idx] = best_action.value
-
-        return policy
+    @beartype
+    def get_policy(self) -> np.ndarray:
+        """Get current greedy policy, recomputed only when values or grid changed."""
+        key = (self.values_version, self.gridworld.grid_version)
+        if self._policy_cache_key != key:
+            self._policy_cache = self.compute_policy()
+            self._policy_cache_key = key
+        return self._policy_cache.copy()
 
     @beartype
     def run_episode(self, max_steps: int = 1000) -> dict[str, Any]:
         """Run a single episode and return metrics."""
-        episode_trajectory = []
+        episode = Episode([], [], [])
         update_details = []
         old_values = self.state_values.copy()
 
-        state = self.gridworld.reset()
+        gridworld = self.gridworld
+        state = gridworld.position_to_state(gridworld.reset())
         total_reward = 0
         steps = 0
 
-        while self.gridworld.status.value == 0 and steps < max_steps:  # RUNNING
-            action = self.select_action(state)
-            step_result = self.gridworld.step(action)
+        while gridworld.status.value == 0 and steps < max_steps:  # RUNNING
+            action = self.select_action_id(state)
+            step_result = gridworld.step_fast(action)
 
             # Create experience for update
             experience = {
@@ -149,7 +144,7 @@ class TD0(BaseAlgorithm):
                 'action': action,
                 'reward': step_result.reward,
                 'next_state': step_result.next_state,
-                'done': self.gridworld.status.value != 0
+                'done': step_result.done
             }
 
             # Update state values
@@ -157,18 +152,21 @@ class TD0(BaseAlgorithm):
             update_details.append(update_info)
 
             # Track episode
-            episode_trajectory.append((state, action, step_result.reward))
+            episode.states.append(state)
+            episode.actions.append(action)
+            episode.rewards.append(step_result.reward)
             total_reward += step_result.reward
             state = step_result.next_state
             steps += 1
 
         # Calculate metrics
-        unique_states = len(set(self.gridworld.position_to_state(s) for s, _, _ in episode_trajectory))
+        path = self.episode_path(episode)
+        unique_states = len(set(path))
         max_change = np.max(np.abs(self.state_values - old_values))
 
         self.episode_rewards.append(total_reward)
         self.episode_lengths.append(steps)
-        self.last_episode_trajectory = episode_trajectory
+        self.last_episode = episode
         self.last_update_details = update_details
         self.convergence_data.append(max_change)
         self.current_episode += 1
@@ -181,7 +179,7 @@ class TD0(BaseAlgorithm):
             'value_updates': len(update_details),
             'max_value_change': max_change,
             'avg_reward': np.mean(self.episode_rewards[-100:]) if self.episode_rewards else 0,
-            'trajectory': [(pos.row, pos.col) for pos, _, _ in episode_trajectory],
+            'trajectory': path,
             'update_details': update_details
         }
 
@@ -200,6 +198,7 @@ class TD0(BaseAlgorithm):
     def get_all_policy_info(self) -> list[dict[str, Any]]:
         """Get complete policy information for all states with non-zero values."""
         policy_info = []
+        policy = self.get_policy()
 
         for state in range(self.gridworld.get_state_space_size()):
             state_value = self.state_values[state]
@@ -209,22 +208,10 @@ class TD0(BaseAlgorithm):
                 pos = self.gridworld.state_to_position(state)
 
                 # Get best action for this state
-                valid_actions = self.gridworld.get_valid_actions(pos)
-                best_value = float('-inf')
-                best_action = valid_actions[0]
-
-                for action in valid_actions:
-                    next_pos = self.gridworld._get_next_position(pos, action)
-                    next_state_idx = self.gridworld.position_to_state(next_pos)
-                    next_value = self.state_values[next_state_idx]
-
-                    if next_value > best_value:
-                        best_value = next_value
-                        best_action = action
+                best_action = Action(policy[state])
 
                 # Count how many times this state has been visited
-                visits = sum(1 for details in self.last_update_details
-                           if self.gridworld.position_to_state(details['state']) == state)
+                visits = sum(1 for details in self.last_update_details if details['state'] == state)
 
                 policy_info.append({
                     'position': pos,
@@ -241,11 +228,12 @@ class TD0(BaseAlgorithm):
     def reset(self) -> None:
         """Reset the algorithm to initial state."""
         self.state_values.fill(0)
+        self.values_version += 1
         self.episode_rewards.clear()
         self.episode_lengths.clear()
         self.training_complete = False
         self.current_episode = 0
-        self.last_episode_trajectory.clear()
+        self.last_episode = Episode([], [], [])
         self.convergence_data.clear()
         self.last_update_details.clear()
 
@@ -0,0 +1 @@
+"""Performance benchmarks for GridWorld environments and algorithms."""
@@ -0,0 +1,272 @@
+"""Convergence and throughput benchmarks across grid sizes.
+
+uv run python -m benchmarks.convergence [--sizes 10 50 100 500 1000 2000] [--budget 30]
+uv run python -m benchmarks.convergence --compare <commit>
+
+For every grid size and algorithm this reports steps/sec, episodes and
+wall-clock seconds until the moving-average reward reaches a threshold
+(derived from the shortest-path return), peak traced memory, and the error
+of the learned state values against the DP optimum. Results are written
+to benchmarks/results/<commit>.json so runs on different commits can be
+compared; --compare flags throughput regressions against an earlier one.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from typing import Any, Callable
+
+import numpy as np
+
+from environment.gridworld import GridWorld, CellType
+from environment.shortest_paths import shortest_path_return
+from environment.typecheck import FAST_MODE
+from algorithms.base_algorithm import BaseAlgorithm
+from algorithms.dynamic_programming import DynamicProgramming
+from algorithms.q_learning import QLearning
+from algorithms.linear_q_learning import LinearQLearning
+from algorithms.temporal_difference import TD0
+from algorithms.monte_carlo import MonteCarlo
+from algorithms.reinforce import REINFORCE
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+GAMMA = 0.9
+
+# Learners under test; all share GAMMA so their values are comparable to DP
+LEARNERS: dict[str, Callable[[GridWorld, int], BaseAlgorithm]] = {
+    "q_learning": lambda env, seed: QLearning(env, gamma=GAMMA, alpha=0.2, epsilon=0.1, seed=seed),
+    "linear_q_learning": lambda env, seed: LinearQLearning(env, gamma=GAMMA, alpha=0.2, epsilon=0.1, seed=seed),
+    "td0": lambda env, seed: TD0(env, gamma=GAMMA, alpha=0.2, epsilon=0.1, seed=seed),
+    "monte_carlo": lambda env, seed: MonteCarlo(env, gamma=GAMMA, epsilon=0.1, seed=seed),
+    "reinforce": lambda env, seed: REINFORCE(env, gamma=GAMMA, learning_rate=0.05, seed=seed),
+}
+
+
+def make_grid(size: int, seed: int = 0) -> GridWorld:
+    """Open grid with ~10% obstacles and the goal in the far corner.
+
+    No traps: ending early in a trap would beat the reward of a long walk to
+    the goal and make the reward threshold meaningless on large grids.
+    """
+    rng = np.random.default_rng(seed)
+    grid = np.where(rng.random((size, size)) < 0.1, CellType.OBSTACLE, CellType.EMPTY).astype(int)
+
+    # Keep the start, the goal and a path along the edges open
+    grid[0, :] = CellType.EMPTY
+    grid[:, -1] = CellType.EMPTY
+    grid[-1, -1] = CellType.GOAL
+    return GridWorld(size=size, grid_config=grid)
+
+
+def value_errors(values: np.ndarray | None, optimal: np.ndarray, mask: np.ndarray) -> dict[str, float | None]:
+    """RMSE and max abs error of state values over non-terminal walkable states."""
+    if values is None:
+        return {"value_rmse": None, "value_max_error": None}
+    diff = values[mask] - optimal[mask]
+    return {"value_rmse": float(np.sqrt(np.mean(diff ** 2))), "value_max_error": float(np.max(np.abs(diff)))}
+
+
+def learned_values(algorithm: BaseAlgorithm) -> np.ndarray | None:
+    """State values a learner actually estimates, None for policy-gradient learners.
+
+    REINFORCE's get_values paints its scalar baseline on every cell for
+    display; comparing that with the DP optimum would measure nothing.
+    """
+    if isinstance(algorithm, REINFORCE):
+        return None
+    return algorithm.get_values()
+
+
+def bench_dp(env: GridWorld) -> tuple[dict[str, Any], DynamicProgramming]:
+    """Solve with value iteration; throughput is state-action backups per second."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    dp = DynamicProgramming(env, gamma=GAMMA, theta=1e-4, max_iterations=10_000)
+    with contextlib.redirect_stdout(io.StringIO()):
+        dp.solve()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    backups = dp.iteration * dp.transition_model.num_states * dp.transition_model.num_actions
+    return {
+        "algorithm": "dynamic_programming",
+        "steps_per_sec": backups / seconds,
+        "episodes": dp.iteration,
+        "episodes_to_threshold": dp.iteration if dp.converged else None,
+        "seconds_to_threshold": seconds if dp.converged else None,
+        "seconds": seconds,
+        "peak_memory_mb": peak / 2**20,
+        "value_rmse": 0.0,
+        "value_max_error": 0.0,
+    }, dp
+
+
+def bench_learner(
+    name: str,
+    env: GridWorld,
+    threshold: float,
+    optimal: np.ndarray,
+    mask: np.ndarray,
+    budget: float,
+    max_episodes: int,
+    max_steps: int,
+    window: int = 20
+) -> dict[str, Any]:
+    """Train until the moving-average reward reaches threshold or the budget runs out."""
+    # Peak memory from a short traced run; tracing would distort the timings below
+    tracemalloc.start()
+    traced = LEARNERS[name](env, 0)
+    for _ in range(3):
+        traced.run_episode(max_steps)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del traced
+
+    algorithm = LEARNERS[name](env, 0)
+    rewards = []
+    total_steps = 0
+    episodes_to_threshold = seconds_to_threshold = None
+    start = time.perf_counter()
+
+    while len(rewards) < max_episodes and time.perf_counter() - start < budget:
+        metrics = algorithm.run_episode(max_steps)
+        rewards.append(metrics['reward'])
+        total_steps += metrics['length']
+
+        if episodes_to_threshold is None and len(rewards) >= window and np.mean(rewards[-window:]) >= threshold:
+            episodes_to_threshold = len(rewards)
+            seconds_to_threshold = time.perf_counter() - start
+            break
+
+    seconds = time.perf_counter() - start
+    return {
+        "algorithm": name,
+        "steps_per_sec": total_steps / seconds,
+        "episodes": len(rewards),
+        "episodes_to_threshold": episodes_to_threshold,
+        "seconds_to_threshold": seconds_to_threshold,
+        "seconds": seconds,
+        "peak_memory_mb": peak / 2**20,
+        **value_errors(learned_values(algorithm), optimal, mask),
+    }
+
+
+def run_size(size: int, learners: list[str], budget: float, max_episodes: int) -> list[dict[str, Any]]:
+    """Benchmark DP and every learner on one grid size."""
+    env = make_grid(size)
+    max_steps = 20 * size
+    dp_row, dp = bench_dp(env)
+
+    tables = dp.transition_model.build_sparse_tables()
+    mask = ~(tables.terminal | tables.blocked)
+    # BFS oracle; with no traps the optimal policy walks the shortest path
+    optimal_return = shortest_path_return(env)
+    threshold = optimal_return - 0.1 * abs(optimal_return)
+
+    rows = [dp_row]
+    for name in learners:
+        rows.append(bench_learner(name, env, threshold, dp.values, mask, budget, max_episodes, max_steps))
+    for row in rows:
+        row.update(size=size, optimal_return=optimal_return, threshold=threshold)
+    return rows
+
+
+def current_commit() -> str:
+    """Short hash of HEAD, marked dirty when the work tree has changes."""
+    def git(*args: str) -> str:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    try:
+        commit = git("rev-parse", "--short", "HEAD")
+        return commit + ("-dirty" if git("status", "--porcelain", "--untracked-files=no") else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(rows: list[dict[str, Any]], commit: str) -> str:
+    """Write benchmark rows with environment metadata to results/<commit>.json."""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{commit}.json")
+    with open(path, "w") as f:
+        json.dump({
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "fast_mode": FAST_MODE,
+            "rows": rows,
+        }, f, indent=2)
+    return path
+
+
+def compare(rows: list[dict[str, Any]], baseline_commit: str, tolerance: float = 0.1) -> list[str]:
+    """List (size, algorithm) pairs whose steps/sec dropped by more than tolerance."""
+    with open(os.path.join(RESULTS_DIR, f"{baseline_commit}.json")) as f:
+        baseline = {(row["size"], row["algorithm"]): row for row in json.load(f)["rows"]}
+
+    regressions = []
+    for row in rows:
+        old = baseline.get((row["size"], row["algorithm"]))
+        if old and row["steps_per_sec"] < (1 - tolerance) * old["steps_per_sec"]:
+            regressions.append(
+                f"size={row['size']} {row['algorithm']}: {old['steps_per_sec']:,.0f} -> {row['steps_per_sec']:,.0f} steps/sec"
+            )
+    return regressions
+
+
+def print_table(rows: list[dict[str, Any]]) -> None:
+    """Print one line per (size, algorithm)."""
+    def fmt(value: Any, spec: str) -> str:
+        return "-" if value is None else format(value, spec)
+
+    print(f"{'size':>6} {'algorithm':<20}{'steps/sec':>14}{'episodes':>10}{'to thresh':>10}"
+          f"{'secs':>9}{'peak MB':>9}{'V rmse':>9}")
+    for row in rows:
+        print(f"{row['size']:>6} {row['algorithm']:<20}{fmt(row['steps_per_sec'], ',.0f'):>14}"
+              f"{row['episodes']:>10}{fmt(row['episodes_to_threshold'], 'd'):>10}"
+              f"{fmt(row['seconds_to_threshold'] or row['seconds'], '.2f'):>9}"
+              f"{fmt(row['peak_memory_mb'], '.1f'):>9}{fmt(row['value_rmse'], '.3f'):>9}")
+
+
+def main():
+    """Run the suite, store results for this commit and optionally compare."""
+    parser = argparse.ArgumentParser(description="GridWorld convergence and throughput benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 500, 1000, 2000])
+    parser.add_argument("--algorithms", nargs="+", choices=sorted(LEARNERS), default=list(LEARNERS))
+    parser.add_argument("--budget", type=float, default=30.0, help="seconds per learner and size")
+    parser.add_argument("--max-episodes", type=int, default=5000)
+    parser.add_argument("--compare", default=None, help="commit whose results to compare against")
+    args = parser.parse_args()
+
+    commit = current_commit()
+    print(f"📏 GridWorld benchmarks @ {commit} (fast mode: {FAST_MODE})")
+    print("=" * 50)
+
+    rows = []
+    for size in args.sizes:
+        print(f"🔹 {size}x{size}")
+        size_rows = run_size(size, args.algorithms, args.budget, args.max_episodes)
+        print_table(size_rows)
+        rows.extend(size_rows)
+
+    path = save_results(rows, commit)
+    print(f"\n💾 Saved results to {path}")
+
+    if args.compare:
+        regressions = compare(rows, args.compare)
+        if regressions:
+            print(f"⚠️  Throughput regressions vs {args.compare}:")
+            for line in regressions:
+                print(f"   {line}")
+        else:
+            print(f"✅ No throughput regressions vs {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
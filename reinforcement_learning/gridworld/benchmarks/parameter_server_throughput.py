@@ -0,0 +1,158 @@
+"""Parameter server throughput over loopback: one server vs shards.
+
+uv run python -m benchmarks.parameter_server_throughput [--shards 1 2 4] [--workers 8] [--pushes 50] [--megabytes 8]
+
+Worker processes push gradients of the given size as fast as the server
+takes them, pulling the parameters every --pull-every pushes. The single
+ParameterServer row is the asyncio server on its own; the sharded rows
+start a ShardedParameterServer with that many shard processes, so
+pushes/sec should grow with the shard count up to the number of cores.
+A second table compares small pipelined pushes on one connection with
+lockstep (one request in flight) pushes.
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# The system package lives next to gridworld and imports it as a package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from system.parameter_server import ParameterClient, ParameterServer
+from system.sharded_parameter_server import ShardedParameterClient, ShardedParameterServer
+
+
+def make_parameters(megabytes: float, num_arrays: int = 4) -> dict[str, np.ndarray]:
+    """float32 parameters of about megabytes in total, split over num_arrays arrays."""
+    size = max(1, int(megabytes * 2**20 / 4 / num_arrays))
+    return {f"layer_{i}": np.zeros(size, dtype=np.float32) for i in range(num_arrays)}
+
+
+def _push_worker(
+    connection: dict[str, Any],
+    worker_id: str,
+    shapes: dict[str, tuple[int, ...]],
+    num_pushes: int,
+    pull_every: int,
+    ready: Any,
+    start: Any
+) -> None:
+    """Connect, wait for the start signal, then push num_pushes gradients."""
+    if "plan" in connection:
+        client = ShardedParameterClient(worker_id, **connection)
+    else:
+        client = ParameterClient(worker_id, **connection)
+    rng = np.random.default_rng()
+    gradients = {name: rng.standard_normal(shape).astype(np.float32) for name, shape in shapes.items()}
+
+    ready.put(worker_id)
+    start.wait()
+    for push in range(1, num_pushes + 1):
+        client.push_gradients(gradients)
+        if push % pull_every == 0:
+            client.get_parameters()
+    client.flush()
+    client.close()
+
+
+def measure(num_shards: int, num_workers: int, num_pushes: int, megabytes: float, pull_every: int) -> dict[str, float]:
+    """Pushes/sec and pushed MB/sec of num_workers processes; num_shards=0 is a single ParameterServer."""
+    parameters = make_parameters(megabytes)
+    shapes = {name: value.shape for name, value in parameters.items()}
+    server_kwargs = {"update_frequency": num_workers, "aggregation_method": "average"}
+
+    if num_shards:
+        server = ShardedParameterServer(parameters, num_shards=num_shards, **server_kwargs)
+        connection = server.connection_info()
+    else:
+        server = ParameterServer(parameters, **server_kwargs)
+        server.start_server("localhost", 0)
+        host, port = server.address
+        connection = {"host": host, "port": port}
+
+    context = mp.get_context("spawn")
+    ready, start = context.Queue(), context.Event()
+    workers = [
+        context.Process(
+            target=_push_worker,
+            args=(connection, f"worker_{i}", shapes, num_pushes, pull_every, ready, start)
+        )
+        for i in range(num_workers)
+    ]
+    for worker in workers:
+        worker.start()
+    for _ in workers:
+        ready.get(timeout=120)
+
+    began = time.perf_counter()
+    start.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - began
+
+    if num_shards:
+        server.shutdown()
+    else:
+        server.stop_server()
+
+    pushes = num_workers * num_pushes
+    return {"pushes_per_sec": pushes / elapsed, "mb_per_sec": pushes * megabytes / elapsed}
+
+
+def measure_pipelining(num_pushes: int, max_in_flight: int) -> float:
+    """Pushes/sec of small gradients on one connection with max_in_flight requests outstanding."""
+    parameters = make_parameters(0.004, num_arrays=1)
+    server = ParameterServer(parameters, update_frequency=100)
+    server.start_server("localhost", 0)
+    host, port = server.address
+    gradients = {name: np.ones_like(value) for name, value in parameters.items()}
+
+    with ParameterClient("pipeline", host=host, port=port, max_in_flight=max_in_flight) as client:
+        began = time.perf_counter()
+        for _ in range(num_pushes):
+            client.push_gradients(gradients)
+        client.flush()
+        elapsed = time.perf_counter() - began
+    server.stop_server()
+    return num_pushes / elapsed
+
+
+def main():
+    """Print push throughput per shard count and pipelined vs lockstep pushes."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--pushes", type=int, default=50, help="pushes per worker")
+    parser.add_argument("--megabytes", type=float, default=8.0, help="gradient size per push")
+    parser.add_argument("--pull-every", type=int, default=10)
+    parser.add_argument("--small-pushes", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"⏱️  Parameter server throughput ({args.workers} workers x {args.pushes} pushes "
+          f"of {args.megabytes:g} MB, {os.cpu_count()} cores)")
+    print("=" * 60)
+    print(f"{'server':<12}{'pushes/sec':>14}{'MB/sec':>12}{'speedup':>10}")
+    baseline = None
+    for num_shards in [0, *args.shards]:
+        rates = measure(num_shards, args.workers, args.pushes, args.megabytes, args.pull_every)
+        baseline = baseline or rates["pushes_per_sec"]
+        label = f"{num_shards} shard{'s' * (num_shards > 1)}" if num_shards else "single"
+        print(f"{label:<12}{rates['pushes_per_sec']:>14,.1f}{rates['mb_per_sec']:>12,.1f}"
+              f"{rates['pushes_per_sec'] / baseline:>9.2f}x")
+
+    print()
+    print(f"Small pushes on one connection ({args.small_pushes:,} pushes)")
+    lockstep = measure_pipelining(args.small_pushes, max_in_flight=1)
+    pipelined = measure_pipelining(args.small_pushes, max_in_flight=32)
+    print(f"{'lockstep':<12}{lockstep:>14,.0f}/s")
+    print(f"{'pipelined':<12}{pipelined:>14,.0f}/s{pipelined / lockstep:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Environment step throughput: beartype-checked vs fast mode.
+
+uv run python -m benchmarks.step_throughput [num_steps] [repeats]
+
+Fast mode is fixed at import time, so each mode is measured in a fresh
+interpreter with GRIDWORLD_FAST_MODE set accordingly. Each method gets a
+warm-up pass and is then timed repeats times; the best pass is reported,
+since slower passes only add scheduler and cache noise. step() is the
+hot_path-checked method; step_fast() is never type-checked, so its
+checked/fast ratio shows the noise floor.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def measure(num_steps: int, repeats: int = 5) -> dict[str, float]:
+    """Best-of-repeats steps/sec of step() and step_fast() in the current interpreter."""
+    import numpy as np
+    from environment.game1 import Game1
+    from environment.gridworld import Action
+
+    env = Game1()
+    rng = np.random.default_rng(0)
+    action_ids = rng.integers(0, len(Action), size=num_steps)
+    actions = [Action(a) for a in action_ids]
+    action_ints = action_ids.tolist()
+
+    def step_pass(count: int) -> float:
+        env.reset()
+        start = time.perf_counter()
+        for action in actions[:count]:
+            if env.step(action).done:
+                env.reset()
+        return count / (time.perf_counter() - start)
+
+    def step_fast_pass(count: int) -> float:
+        env.reset()
+        start = time.perf_counter()
+        for action in action_ints[:count]:
+            if env.step_fast(action).done:
+                env.reset()
+        return count / (time.perf_counter() - start)
+
+    rates = {}
+    for method, run_pass in (("step", step_pass), ("step_fast", step_fast_pass)):
+        run_pass(min(num_steps, 10_000))  # warm-up
+        rates[method] = max(run_pass(num_steps) for _ in range(repeats))
+    return rates
+
+
+def run_mode(fast_mode: bool, num_steps: int, repeats: int) -> dict[str, float]:
+    """Run measure() in a subprocess with the given fast-mode setting."""
+    env = dict(os.environ, GRIDWORLD_FAST_MODE="1" if fast_mode else "0")
+    code = (
+        "import json; from benchmarks.step_throughput import measure; "
+        f"print(json.dumps(measure({num_steps}, {repeats})))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """Print best-of-N steps/sec per method in checked and fast mode."""
+    num_steps = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    print(f"⏱️  GridWorld step throughput ({num_steps:,} steps, best of {repeats})")
+    print("=" * 50)
+    checked, fast = run_mode(False, num_steps, repeats), run_mode(True, num_steps, repeats)
+
+    print(f"{'method':<12}{'checked':>12}{'fast':>12}{'fast/checked':>14}")
+    for method in checked:
+        print(f"{method:<12}{checked[method]:>12,.0f}{fast[method]:>12,.0f}{fast[method] / checked[method]:>13.2f}x")
+    print(f"step_fast vs checked step: {fast['step_fast'] / checked['step']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
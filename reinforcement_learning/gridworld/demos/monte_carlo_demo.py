@@ -83,7 +83,7 @@ class MonteCarloDemo:
             'successful_episodes': successful_episodes,
             'success_rate': successful_episodes / num_episodes * 100,
             'total_episodes': self.mc_algorithm.current_episode,
-            'total_sa_pairs': len(self.mc_algorithm.q_returns)
+            'total_sa_pairs': int(np.count_nonzero(self.mc_algorithm.visit_counts))
         }
 
         print(f"\n📊 Batch Complete!")
@@ -133,7 +133,7 @@ class MonteCarloDemo:
             full_path = " → ".join([f"({pos.row},{pos.col})" for pos, _, _ in trajectory])
             print(f"             Path: {full_path}")
 
-        total_q_pairs = len(self.mc_algorithm.q_returns)
+        total_q_pairs = int(np.count_nonzero(self.mc_algorithm.visit_counts))
         print(f"             Total (s,a) pairs learned: {total_q_pairs}")
 
         # Store update details for later display
@@ -144,7 +144,7 @@ class MonteCarloDemo:
             print(f"             📊 All Q-updates ({len(update_details)}):")
             for u in update_details:
                 change = u['new_q'] - u['old_q']
-                print(f"               ({u['state'].row},{u['state'].col})-{u['action'].name}: "
+                print(f"               {self._update_label(u)}: "
                       f"{u['old_q']:.3f} → {u['new_q']:.3f} ({change:+.3f}) "
                       f"[G={u['return']:.2f}, n={u['visit_count']}]")
 
@@ -265,10 +265,7 @@ class MonteCarloDemo:
             print(f"  V({row},{col}) = {state_value:+8.3f}")
 
             # Show how many times we've visited this state-action pairs
-            visits = 0
-            for action in Action:
-                if (state_idx, action.value) in self.mc_algorithm.q_returns:
-                    visits += len(self.mc_algorithm.q_returns[(state_idx, action.value)])
+            visits = int(self.mc_algorithm.visit_counts[state_idx].sum())
             print(f"  Total visits: {visits}")
 
         print("=" * 50)
@@ -369,7 +366,7 @@ class MonteCarloDemo:
                             print(f"\n📊 All Q-updates from last episode ({len(self.last_update_details)}):")
                             for u in self.last_update_details:
                                 change = u['new_q'] - u['old_q']
-                                print(f"  ({u['state'].row},{u['state'].col})-{u['action'].name}: "
+                                print(f"  {self._update_label(u)}: "
                                       f"{u['old_q']:.3f} → {u['new_q']:.3f} ({change:+.3f}) "
                                       f"[G={u['return']:.2f}, n={u['visit_count']}]")
                         else:
@@ -391,6 +388,12 @@ class MonteCarloDemo:
         self.renderer.close()
         print("👋 Demo finished!")
 
+    def _update_label(self, update: dict) -> str:
+        """Format an update's int state/action ids as '(row,col)-ACTION' for display."""
+        pos, _ = self.env.decode_state(update['state'])
+        action, _ = self.env.decode_action(update['action'])
+        return f"({pos.row},{pos.col})-{action.name}"
+
     @beartype
     def _print_q_update_details(self, update_details: list[dict]) -> None:
         """Print detailed Q-value update information."""
@@ -403,8 +406,6 @@ class MonteCarloDemo:
         sorted_updates = sorted(update_details, key=lambda x: abs(x['new_q'] - x['old_q']), reverse=True)
 
         for i, update in enumerate(sorted_updates[:5]):
-            state = update['state']
-            action = update['action']
             old_q = update['old_q']
             new_q = update['new_q']
             return_val = update['return']
@@ -413,7 +414,7 @@ class MonteCarloDemo:
             change = new_q - old_q
             change_str = f"{change:+6.3f}" if change != 0 else " 0.000"
 
-            print(f"               ({state.row},{state.col})-{action.name}: "
+            print(f"               {self._update_label(update)}: "
                   f"{old_q:6.3f} → {new_q:6.3f} ({change_str}) "
                   f"[G={return_val:6.2f}, n={visit_count}]")
 
@@ -436,7 +437,9 @@ class MonteCarloDemo:
 
             # Show Q-values for all actions
             q_str = " ".join([f"{Action(i).name}:{q_values[i]:.2f}" for i in range(len(Action))])
-            print(f"               ({pos.row},{pos.col}): {best_action.name} "
+            jump_tag = " [jump]" if info['has_jump'] else ""
+            action_name = best_action.name + ("+JUMP" if info['use_jump'] else "")
+            print(f"               ({pos.row},{pos.col}){jump_tag}: {action_name} "
                   f"[V={state_value:.2f}, visits={visits}] Q=[{q_str}]")
 
 
@@ -144,7 +144,7 @@ class QLearningDemo:
             print(f"             📊 All Q-updates ({len(update_details)}):")
             for u in update_details:
                 td_error = u['td_error']
-                print(f"               ({u['state'].row},{u['state'].col})-{u['action'].name}: "
+                print(f"               {self._update_label(u)}: "
                       f"{u['old_q']:.3f} → {u['new_q']:.3f} (Δ{td_error:+.3f}) "
                       f"[target={u['target']:.2f}]")
 
@@ -354,7 +354,7 @@ class QLearningDemo:
                             print(f"\n📊 All Q-updates from last episode ({len(self.last_update_details)}):")
                             for u in self.last_update_details:
                                 td_error = u['td_error']
-                                print(f"  ({u['state'].row},{u['state'].col})-{u['action'].name}: "
+                                print(f"  {self._update_label(u)}: "
                                       f"{u['old_q']:.3f} → {u['new_q']:.3f} (Δ{td_error:+.3f}) "
                                       f"[target={u['target']:.2f}]")
                         else:
@@ -382,6 +382,12 @@ class QLearningDemo:
         self.renderer.set_values(self.qlearning_algorithm.get_values())
         self.renderer.set_policy(self.qlearning_algorithm.get_policy())
 
+    def _update_label(self, update: dict) -> str:
+        """Format an update's int state/action ids as '(row,col)-ACTION' for display."""
+        pos, _ = self.env.decode_state(update['state'])
+        action, _ = self.env.decode_action(update['action'])
+        return f"({pos.row},{pos.col})-{action.name}"
+
     @beartype
     def _print_q_update_details(self, update_details: list[dict]) -> None:
         """Print detailed Q-value update information."""
@@ -394,14 +400,12 @@ class QLearningDemo:
         sorted_updates = sorted(update_details, key=lambda x: abs(x['td_error']), reverse=True)
 
         for i, update in enumerate(sorted_updates[:5]):
-            state = update['state']
-            action = update['action']
             old_q = update['old_q']
             new_q = update['new_q']
             target = update['target']
             td_error = update['td_error']
 
-            print(f"               ({state.row},{state.col})-{action.name}: "
+            print(f"               {self._update_label(update)}: "
                   f"{old_q:6.3f} → {new_q:6.3f} (Δ{td_error:+6.3f}) "
                   f"[target={target:6.2f}]")
 
@@ -424,7 +428,9 @@ class QLearningDemo:
 
             # Show Q-values for all actions
             q_str = " ".join([f"{Action(i).name}:{q_values[i]:.2f}" for i in range(len(Action))])
-            print(f"               ({pos.row},{pos.col}): {best_action.name} "
+            jump_tag = " [jump]" if info['has_jump'] else ""
+            action_name = best_action.name + ("+JUMP" if info['use_jump'] else "")
+            print(f"               ({pos.row},{pos.col}){jump_tag}: {action_name} "
                   f"[V={state_value:.2f}, visits={visits}] Q=[{q_str}]")
 
 
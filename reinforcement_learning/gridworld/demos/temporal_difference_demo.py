@@ -144,7 +144,7 @@ class TD0Demo:
             print(f"             📊 All V-updates ({len(update_details)}):")
             for u in update_details:
                 td_error = u['td_error']
-                print(f"               ({u['state'].row},{u['state'].col}): "
+                print(f"               {self._state_label(u['state'])}: "
                       f"{u['old_value']:.3f} → {u['new_value']:.3f} (Δ{td_error:+.3f}) "
                       f"[target={u['target']:.2f}]")
 
@@ -230,6 +230,11 @@ class TD0Demo:
             text_rect.center = rect.center
             self.renderer.screen.blit(text_surf, text_rect)
 
+    def _state_label(self, state: int) -> str:
+        """Format an int state id as '(row,col)' for display."""
+        pos = self.env.state_to_position(state)
+        return f"({pos.row},{pos.col})"
+
     @beartype
     def print_debug_info(self) -> None:
         """Print detailed state values for debugging."""
@@ -338,7 +343,7 @@ class TD0Demo:
                             print(f"\n📊 All V-updates from last episode ({len(self.last_update_details)}):")
                             for u in self.last_update_details:
                                 td_error = u['td_error']
-                                print(f"  ({u['state'].row},{u['state'].col}): "
+                                print(f"  {self._state_label(u['state'])}: "
                                       f"{u['old_value']:.3f} → {u['new_value']:.3f} (Δ{td_error:+.3f}) "
                                       f"[target={u['target']:.2f}]")
                         else:
@@ -1,7 +1,9 @@
 """GridWorld environment package."""
 
-from .gridworld import GridWorld, Action, CellType, Position, StepResult, GameStatus
-from .transition_model import TransitionModel, Transition
+from .gridworld import GridWorld, Action, CellType, Position, StepResult, FastStepResult, NeighborTables, DistanceTables, GameStatus
+from .shortest_paths import compute_distance_tables, shortest_path_return
+from .transition_model import TransitionModel, Transition, TransitionTables, SparseTransitions
 from .game1 import Game1
+from .vector_env import VectorGridWorld, VectorStepResult
 
-__all__ = ["GridWorld", "Action", "CellType", "Position", "StepResult", "TransitionModel", "Transition", "Game1", "GameStatus"]
+__all__ = ["GridWorld", "Action", "CellType", "Position", "StepResult", "FastStepResult", "NeighborTables", "DistanceTables", "compute_distance_tables", "shortest_path_return", "TransitionModel", "Transition", "TransitionTables", "SparseTransitions", "Game1", "GameStatus", "VectorGridWorld", "VectorStepResult"]
@@ -3,6 +3,7 @@
 import numpy as np
 from beartype import beartype
 from .gridworld import GridWorld, CellType, Position
+from .seeding import SeedLike
 
 
 class Game1(GridWorld):
@@ -14,7 +15,8 @@ class Game1(GridWorld):
         step_penalty: float = -0.1,
         goal_reward: float = 10.0,
         trap_penalty: float = -10.0,
-        wall_penalty: float = -1.0
+        wall_penalty: float = -1.0,
+        seed: SeedLike = None
     ):
         # Create the specific grid configuration for Game 1
         grid_config = self._create_game1_grid(size)
@@ -27,7 +29,8 @@ class Game1(GridWorld):
             trap_penalty=trap_penalty,
             wall_penalty=wall_penalty,
             grid_config=grid_config,
-            jump_destinations=jump_destinations
+            jump_destinations=jump_destinations,
+            seed=seed
         )
 
     @staticmethod
@@ -1,9 +1,12 @@
 """Generic GridWorld environment engine."""
 
+import copy
 from enum import IntEnum
 from typing import NamedTuple
 from beartype import beartype
 import numpy as np
+from .typecheck import hot_path
+from .seeding import SeedLike, make_rng
 
 
 class GameStatus(IntEnum):
@@ -43,6 +46,55 @@ class StepResult(NamedTuple):
     info: dict
 
 
+class NeighborTables(NamedTuple):
+    """Per-cell move lookups over flat cell indices (row * size + col)."""
+    next_states: np.ndarray  # (N, len(Action)) cell reached by a plain move, self when blocked
+    jump_next_states: np.ndarray  # (N, len(Action)) cell reached by a two-cell jump move
+    valid_actions: np.ndarray  # (N,) uint8 bitmask, bit a set when action a is valid
+
+
+class DistanceTables(NamedTuple):
+    """Shortest-path facts over augmented states (cell + has_jump * size * size).
+
+    Entries [:size * size] are the states without the jump ability, indexed
+    like position_to_state. Distances count actions and are -1 where there
+    is no path.
+    """
+    distance_to_goal: np.ndarray  # (2N,) int32, fewest actions to any goal
+    distance_from_start: np.ndarray  # (2N,) int32, fewest actions from (start_pos, no jump)
+    reachable: np.ndarray  # (2N,) bool, distance_from_start >= 0
+    trap_adjacent: np.ndarray  # (2N,) bool, some action lands in a trap
+    successors: np.ndarray  # (2N, 2 * len(Action)) int64, next state per augmented action
+
+
+# Directions a move can slip into, perpendicular to the intended one
+SLIP_ACTIONS = {
+    Action.UP: (Action.LEFT, Action.RIGHT),
+    Action.DOWN: (Action.LEFT, Action.RIGHT),
+    Action.LEFT: (Action.UP, Action.DOWN),
+    Action.RIGHT: (Action.UP, Action.DOWN)
+}
+
+# Valid action lists for every bitmask value
+_ACTIONS_BY_MASK = [tuple(action for action in Action if mask >> action & 1) for mask in range(1 << len(Action))]
+
+
+class FastStepResult:
+    """Mutable, slotted step result reused across GridWorld.step_fast calls."""
+
+    __slots__ = ("next_state", "reward", "done", "collision", "jump_used", "teleported", "has_jump", "cell_type")
+
+    def __init__(self):
+        self.next_state = 0
+        self.reward = 0.0
+        self.done = False
+        self.collision = False
+        self.jump_used = False
+        self.teleported = False
+        self.has_jump = False
+        self.cell_type = int(CellType.EMPTY)
+
+
 class GridWorld:
     """Generic GridWorld environment engine."""
 
@@ -54,7 +106,10 @@ class GridWorld:
         trap_penalty: float = -10.0,
         wall_penalty: float = -1.0,
         grid_config: np.ndarray | None = None,
-        jump_destinations: dict[tuple[int, int], tuple[int, int]] | None = None
+        jump_destinations: dict[tuple[int, int], tuple[int, int]] | None = None,
+        slip_prob: float = 0.0,
+        wind: np.ndarray | None = None,
+        seed: SeedLike = None
     ):
         self.size = size
         self.step_penalty = step_penalty
@@ -86,11 +141,128 @@ class GridWorld:
             Action.RIGHT: (0, 1)
         }
 
+        # Preallocated result for step_fast
+        self._fast_result = FastStepResult()
+
+        # Bumped whenever the layout changes so cached tables can be rebuilt
+        self.grid_version = 0
+        self._neighbor_tables: NeighborTables | None = None
+        self._neighbor_tables_version = -1
+        self._distance_tables: DistanceTables | None = None
+        self._distance_tables_key: tuple[int, Position] | None = None
+
+        # Stochastic dynamics, deterministic by default
+        self.rng = make_rng(seed)
+        self.slip_prob = 0.0
+        self.wind: np.ndarray | None = None
+        self.set_dynamics(slip_prob, wind)
+
     @beartype
     def set_grid_config(self, grid_config: np.ndarray, jump_destinations: dict[tuple[int, int], tuple[int, int]] | None = None) -> None:
         """Set grid configuration and jump destinations."""
         self.grid = grid_config.copy()
         self.jump_destinations = jump_destinations or {}
+        self.grid_version += 1
+
+    @beartype
+    def set_dynamics(self, slip_prob: float = 0.0, wind: np.ndarray | None = None) -> None:
+        """Set slip probability and wind field.
+
+        With probability slip_prob a move goes in one of the two perpendicular
+        directions instead (chosen uniformly). wind is a (size, size, 2) int
+        array of (d_row, d_col) pushes applied from the cell the agent leaves:
+        after the move the agent is pushed one cell at a time, rows first,
+        stopping at edges and obstacles. Cell effects apply where it ends up.
+        """
+        if not 0.0 <= slip_prob <= 1.0:
+            raise ValueError(f"slip_prob must be in [0, 1], got {slip_prob}")
+        if wind is not None:
+            if wind.shape != (self.size, self.size, 2):
+                raise ValueError(f"wind must have shape {(self.size, self.size, 2)}, got {wind.shape}")
+            wind = wind.astype(np.int64)
+            if not wind.any():
+                wind = None
+
+        self.slip_prob = slip_prob
+        self.wind = wind
+        self.grid_version += 1
+
+    @beartype
+    def clone(self, seed: SeedLike = None) -> "GridWorld":
+        """Copy with fresh episode state that shares the layout and cached tables.
+
+        The grid, jump destinations, wind and neighbor tables are shared, not
+        copied, so clones of a prepared environment are cheap; treat them as
+        read-only (set_grid_config on a clone replaces rather than mutates).
+        """
+        clone = copy.copy(self)
+        clone.rng = make_rng(seed)
+        clone._fast_result = FastStepResult()
+        clone.reset(self.start_pos)
+        return clone
+
+    @beartype
+    def reseed(self, seed: SeedLike) -> None:
+        """Restart the environment's random stream (used for slipping) from seed."""
+        self.rng = make_rng(seed)
+
+    @property
+    def is_stochastic(self) -> bool:
+        """Whether an action can lead to more than one outcome (wind alone is deterministic)."""
+        return self.slip_prob > 0.0
+
+    @hot_path
+    def get_neighbor_tables(self) -> NeighborTables:
+        """Get (and cache) next-cell and valid-action tables for every cell.
+
+        Rebuilt after set_grid_config; edit self.grid in place only through
+        set_grid_config, or bump grid_version yourself.
+        """
+        if self._neighbor_tables is not None and self._neighbor_tables_version == self.grid_version:
+            return self._neighbor_tables
+
+        num_cells = self.size * self.size
+        cells = np.arange(num_cells)
+        rows, cols = np.divmod(cells, self.size)
+        walkable = self.grid.ravel() != CellType.OBSTACLE
+
+        def move_targets(scale: int) -> np.ndarray:
+            targets = np.empty((num_cells, len(Action)), dtype=np.int64)
+            for action in Action:
+                dr, dc = self.action_deltas[action]
+                target_rows, target_cols = rows + dr * scale, cols + dc * scale
+                in_bounds = (target_rows >= 0) & (target_rows < self.size) & (target_cols >= 0) & (target_cols < self.size)
+                target = np.where(in_bounds, target_rows * self.size + target_cols, cells)
+                targets[:, action] = np.where(in_bounds & walkable[target], target, cells)
+            return targets
+
+        next_states = move_targets(1)
+        jump_next_states = move_targets(2)
+
+        # Same rule as _is_walkable(_get_next_position(pos, action))
+        valid = walkable[next_states]
+        valid_actions = (valid << np.arange(len(Action))).sum(axis=1).astype(np.uint8)
+
+        self._neighbor_tables = NeighborTables(next_states, jump_next_states, valid_actions)
+        self._neighbor_tables_version = self.grid_version
+        return self._neighbor_tables
+
+    @beartype
+    def get_distance_tables(self, start_pos: Position | None = None) -> DistanceTables:
+        """Get (and cache) distance-to-goal, reachability and trap adjacency arrays.
+
+        Indexed by augmented state (see DistanceTables), built by environment.shortest_paths.
+        Reachability is measured from start_pos (default: the last reset's start).
+        """
+        # Imported here because shortest_paths builds on TransitionModel, which imports this module
+        from .shortest_paths import compute_distance_tables
+
+        start_pos = self.start_pos if start_pos is None else start_pos
+        key = (self.grid_version, start_pos)
+        if self._distance_tables is None or self._distance_tables_key != key:
+            self._distance_tables = compute_distance_tables(self, start_pos)
+            self._distance_tables_key = key
+        return self._distance_tables
 
     def _is_valid_position(self, pos: Position) -> bool:
         """Check if position is within grid bounds."""
@@ -133,42 +305,96 @@ class GridWorld:
 
         return next_pos
 
-    @beartype
+    def _apply_wind(self, origin: Position, pos: Position) -> Position:
+        """Push pos by the wind blowing in origin, one walkable cell at a time."""
+        d_row, d_col = self.wind[origin.row, origin.col]
+        for _ in range(abs(d_row)):
+            pushed = Position(pos.row + (1 if d_row > 0 else -1), pos.col)
+            if not self._is_walkable(pushed):
+                break
+            pos = pushed
+        for _ in range(abs(d_col)):
+            pushed = Position(pos.row, pos.col + (1 if d_col > 0 else -1))
+            if not self._is_walkable(pushed):
+                break
+            pos = pushed
+        return pos
+
+    @hot_path
     def step(self, action: Action, use_jump: bool = False) -> StepResult:
         """Take a step in the environment."""
         if self.status == GameStatus.DONE:
             # Return current state without changes if episode is over
             return StepResult(self.agent_pos, 0.0, True, {})
 
+        old_pos = self.agent_pos
+        result = self._advance(action, use_jump)
+
+        info = {
+            "collision": result.collision,
+            "jump_used": result.jump_used,
+            "teleported": result.teleported,
+            "old_pos": old_pos,
+            "cell_type": result.cell_type,
+            "episode_steps": self.episode_steps
+        }
+        return StepResult(self.agent_pos, result.reward, result.done, info)
+
+    def step_fast(self, action: int, use_jump: bool = False) -> FastStepResult:
+        """Take a step without type checks or info dicts.
+
+        Returns the environment's preallocated FastStepResult, overwritten
+        on every call; copy out fields that must outlive the next step.
+        """
+        if self.status == GameStatus.DONE:
+            result = self._fast_result
+            result.next_state = self.agent_pos.row * self.size + self.agent_pos.col
+            result.reward = 0.0
+            result.done = True
+            result.collision = result.jump_used = result.teleported = False
+            return result
+
+        return self._advance(action, use_jump)
+
+    def _advance(self, action: int, use_jump: bool) -> FastStepResult:
+        """Apply one action to a running episode, filling the shared step result."""
         self.episode_steps += 1
+        result = self._fast_result
 
         # Can only use jump if agent has it and chooses to use it
         is_jump_attempt = use_jump and self.has_jump
 
+        # Slippery floors can turn the move sideways
+        if self.slip_prob > 0.0 and self.rng.random() < self.slip_prob:
+            action = SLIP_ACTIONS[Action(action)][self.rng.integers(2)]
+
         # Calculate next position
         old_pos = self.agent_pos
         next_pos = self._get_next_position(old_pos, action, is_jump_attempt)
+        move_successful = next_pos != old_pos
+
+        if self.wind is not None:
+            next_pos = self._apply_wind(old_pos, next_pos)
 
         # Update agent position
         self.agent_pos = next_pos
-        move_successful = self.agent_pos != old_pos
 
-        # Initialize reward and info
         reward = self.step_penalty
-        info = {"collision": False, "jump_used": False, "teleported": False}
+        result.collision = not move_successful
+        result.jump_used = False
+        result.teleported = False
 
         # Penalize for wall collisions
         if not move_successful:
             reward += self.wall_penalty
-            info["collision"] = True
 
         # Handle jump consumption
         if is_jump_attempt and move_successful:
             self.has_jump = False
-            info["jump_used"] = True
+            result.jump_used = True
 
         # Handle cell-specific rewards and effects
-        cell_type = self.grid[self.agent_pos.row, self.agent_pos.col]
+        cell_type = int(self.grid[next_pos.row, next_pos.col])
 
         if cell_type == CellType.GOAL:
             reward += self.goal_reward
@@ -178,29 +404,27 @@ class GridWorld:
             self.status = GameStatus.DONE
         elif cell_type == CellType.JUMP_PAD:
             # Check if this jump pad has a specific destination
-            current_pos_tuple = (self.agent_pos.row, self.agent_pos.col)
+            current_pos_tuple = (next_pos.row, next_pos.col)
             if current_pos_tuple in self.jump_destinations:
                 dest_row, dest_col = self.jump_destinations[current_pos_tuple]
                 dest_pos = Position(dest_row, dest_col)
                 if self._is_walkable(dest_pos):
                     self.agent_pos = dest_pos
-                    info["teleported"] = True
+                    result.teleported = True
             else:
                 # Regular jump pad - gives jump ability
                 self.has_jump = True
 
         self.total_reward += reward
 
-        info.update({
-            "old_pos": old_pos,
-            "cell_type": cell_type,
-            "episode_steps": self.episode_steps
-        })
-
-        done = self.status == GameStatus.DONE
-        return StepResult(self.agent_pos, reward, done, info)
+        result.next_state = self.agent_pos.row * self.size + self.agent_pos.col
+        result.reward = reward
+        result.done = self.status == GameStatus.DONE
+        result.has_jump = self.has_jump
+        result.cell_type = cell_type
+        return result
 
-    @beartype
+    @hot_path
     def is_terminal(self) -> bool:
         """Check if the episode has ended."""
         return self.status == GameStatus.DONE
@@ -215,29 +439,71 @@ class GridWorld:
         """Get number of available actions."""
         return len(Action)
 
-    @beartype
+    @hot_path
     def position_to_state(self, pos: Position) -> int:
         """Convert position to state index."""
         return pos.row * self.size + pos.col
 
-    @beartype
+    @hot_path
     def state_to_position(self, state: int) -> Position:
         """Convert state index to position."""
         return Position(state // self.size, state % self.size)
 
     @beartype
+    def get_augmented_state_space_size(self) -> int:
+        """Get number of (position, has_jump) states."""
+        return 2 * self.size * self.size
+
+    @beartype
+    def get_augmented_action_space_size(self) -> int:
+        """Get number of actions including jump moves."""
+        return 2 * len(Action)
+
+    @hot_path
+    def encode_state(self, pos: Position, has_jump: bool = False) -> int:
+        """Convert (position, has_jump) to augmented state index.
+
+        States without the jump ability share indices with position_to_state,
+        states holding it are offset by size * size.
+        """
+        return int(has_jump) * self.size * self.size + pos.row * self.size + pos.col
+
+    @hot_path
+    def decode_state(self, state: int) -> tuple[Position, bool]:
+        """Convert augmented state index to (position, has_jump)."""
+        has_jump, cell = divmod(state, self.size * self.size)
+        return Position(cell // self.size, cell % self.size), bool(has_jump)
+
+    @hot_path
+    def encode_action(self, action: Action, use_jump: bool = False) -> int:
+        """Convert (action, use_jump) to augmented action index."""
+        return int(use_jump) * len(Action) + action.value
+
+    @hot_path
+    def decode_action(self, action: int) -> tuple[Action, bool]:
+        """Convert augmented action index to (action, use_jump)."""
+        use_jump, move = divmod(action, len(Action))
+        return Action(move), bool(use_jump)
+
+    @hot_path
+    def get_augmented_state(self) -> int:
+        """Get augmented state index of the agent."""
+        return self.encode_state(self.agent_pos, self.has_jump)
+
+    @hot_path
     def get_valid_actions(self, pos: Position | None = None) -> list[Action]:
         """Get valid actions from a position."""
         if pos is None:
             pos = self.agent_pos
 
-        valid_actions = []
-        for action in Action:
-            next_pos = self._get_next_position(pos, action)
-            if self._is_walkable(next_pos):
-                valid_actions.append(action)
+        if not self._is_valid_position(pos):
+            return []
+        return list(self.get_valid_action_ids(pos.row * self.size + pos.col))
 
-        return valid_actions
+    @hot_path
+    def get_valid_action_ids(self, cell: int) -> tuple[Action, ...]:
+        """Get valid actions from a flat cell index (row * size + col), without building a Position."""
+        return _ACTIONS_BY_MASK[self.get_neighbor_tables().valid_actions[cell]]
 
     @beartype
     def render_text(self) -> str:
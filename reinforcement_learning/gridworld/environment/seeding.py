@@ -0,0 +1,30 @@
+"""Random number generator plumbing shared by environments and algorithms."""
+
+from beartype import beartype
+import numpy as np
+
+# Anything np.random.default_rng accepts as a seed
+SeedLike = int | np.random.SeedSequence | None
+
+
+@beartype
+def make_rng(seed: SeedLike = None) -> np.random.Generator:
+    """Create an independent Generator (fresh OS entropy when seed is None)."""
+    return np.random.default_rng(seed)
+
+
+@beartype
+def spawn_seeds(seed: SeedLike, count: int) -> list[np.random.SeedSequence]:
+    """Spawn count statistically independent child seeds from one root seed.
+
+    Give each parallel worker one child; a worker that needs several
+    streams (e.g. environment and algorithm) spawns again from its child.
+    """
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return root.spawn(count)
+
+
+@beartype
+def spawn_rngs(seed: SeedLike, count: int) -> list[np.random.Generator]:
+    """Spawn count independent Generators from one root seed."""
+    return [np.random.default_rng(child) for child in spawn_seeds(seed, count)]
@@ -0,0 +1,97 @@
+"""Shortest-path distances, reachability and trap adjacency over the GridWorld state graph."""
+
+from beartype import beartype
+import numpy as np
+
+from .gridworld import GridWorld, Action, CellType, Position, DistanceTables
+from .transition_model import TransitionModel
+
+
+def _successor_graph(gridworld: GridWorld) -> tuple[np.ndarray, np.ndarray]:
+    """Next augmented state of every (state, augmented action) and the expandable-state mask.
+
+    Uses the intended move of each action: slipping is ignored, wind and
+    teleports are applied. Terminal and obstacle states have no out-edges.
+    """
+    model = TransitionModel(gridworld, augmented=True)
+    cell, has_jump = model._cell_layout()
+    successors = np.empty((model.num_states, model.num_actions), dtype=np.int64)
+    for action in range(model.num_actions):
+        use_jump, move = divmod(action, len(Action))
+        successors[:, action], _ = model._move_outcomes(cell, has_jump, move, bool(use_jump))
+
+    terminal, blocked = model._state_flags(cell)
+    return successors, ~(terminal | blocked)
+
+
+def _bfs(indptr: np.ndarray, neighbors: np.ndarray, sources: np.ndarray, num_states: int) -> np.ndarray:
+    """Multi-source BFS over a CSR adjacency, one vectorized frontier per level."""
+    distance = np.full(num_states, -1, dtype=np.int32)
+    frontier = np.unique(sources)
+    distance[frontier] = 0
+    level = 0
+
+    while len(frontier):
+        level += 1
+        starts, counts = indptr[frontier], indptr[frontier + 1] - indptr[frontier]
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        candidates = neighbors[offsets]
+        frontier = np.unique(candidates[distance[candidates] < 0])
+        distance[frontier] = level
+    return distance
+
+
+def _csr(sources: np.ndarray, targets: np.ndarray, num_states: int, presorted: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """CSR adjacency (indptr, neighbors) of the edges sources -> targets."""
+    indptr = np.zeros(num_states + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=num_states), out=indptr[1:])
+    if presorted:
+        return indptr, targets
+    return indptr, targets[np.argsort(sources, kind="stable")]
+
+
+@beartype
+def compute_distance_tables(gridworld: GridWorld, start_pos: Position | None = None) -> DistanceTables:
+    """Run forward BFS from the start and multi-source backward BFS from every goal.
+
+    Every action costs one step, so breadth-first search gives the same
+    distances as Dijkstra at O(states * actions) total work.
+    """
+    num_cells = gridworld.size * gridworld.size
+    start_pos = gridworld.start_pos if start_pos is None else start_pos
+    successors, expandable = _successor_graph(gridworld)
+    num_states, num_actions = successors.shape
+
+    # Edges out of expandable states in source order, dropping self-loops from blocked moves
+    sources = np.repeat(np.arange(num_states, dtype=np.int32), num_actions)
+    targets = successors.ravel().astype(np.int32)
+    keep = np.repeat(expandable, num_actions) & (sources != targets)
+    sources, targets = sources[keep], targets[keep]
+
+    cell_types = np.tile(gridworld.grid.ravel(), 2)
+    goals = np.flatnonzero(cell_types == CellType.GOAL)
+    distance_to_goal = _bfs(*_csr(targets, sources, num_states), goals, num_states)
+
+    start = np.array([gridworld.position_to_state(start_pos)])
+    if cell_types[start[0]] == CellType.OBSTACLE:
+        distance_from_start = np.full(num_states, -1, dtype=np.int32)
+    else:
+        distance_from_start = _bfs(*_csr(sources, targets, num_states, presorted=True), start, num_states)
+
+    trap_adjacent = expandable & (cell_types[successors % num_cells] == CellType.TRAP).any(axis=1)
+    return DistanceTables(distance_to_goal, distance_from_start, distance_from_start >= 0, trap_adjacent, successors)
+
+
+@beartype
+def shortest_path_return(gridworld: GridWorld, start_pos: Position | None = None) -> float | None:
+    """Undiscounted return of the shortest walk from the start to a goal, None if unreachable.
+
+    The best achievable return with deterministic dynamics, as long as
+    goal_reward outweighs the step penalties (and any closer trap).
+    """
+    tables = gridworld.get_distance_tables(start_pos)
+    start = gridworld.position_to_state(gridworld.start_pos if start_pos is None else start_pos)
+    steps = int(tables.distance_to_goal[start])
+    if steps < 0:
+        return None
+    return steps * gridworld.step_penalty + gridworld.goal_reward
@@ -2,8 +2,9 @@
 
 from typing import NamedTuple
 from beartype import beartype
+from .typecheck import hot_path
 import numpy as np
-from environment.gridworld import GridWorld, Action, Position, CellType
+from .gridworld import GridWorld, Action, Position, CellType, SLIP_ACTIONS
 
 
 class Transition(NamedTuple):
@@ -12,38 +13,106 @@ class Transition(NamedTuple):
     reward: float
 
 
+class TransitionTables(NamedTuple):
+    """Dense (state, action) lookup tables for vectorized planning."""
+    next_states: np.ndarray  # (S, A) int32
+    rewards: np.ndarray  # (S, A) float64
+    terminal: np.ndarray  # (S,) bool, goal or trap cells
+    blocked: np.ndarray  # (S,) bool, obstacle cells
+
+
+class SparseTransitions(NamedTuple):
+    """CSR transition storage, one row per flattened (state, action) pair.
+
+    Outcomes of row s * A + a are next_states/probs/rewards[indptr[row]:indptr[row + 1]].
+    """
+    indptr: np.ndarray  # (S * A + 1,) int64
+    next_states: np.ndarray  # (nnz,) int32
+    probs: np.ndarray  # (nnz,) float64
+    rewards: np.ndarray  # (nnz,) float64
+    terminal: np.ndarray  # (S,) bool, goal or trap cells
+    blocked: np.ndarray  # (S,) bool, obstacle cells
+    row_ids: np.ndarray  # (nnz,) int64, row of every stored outcome (the COO view of indptr)
+
+
 class TransitionModel:
-    """Computes deterministic transitions (s',r) for GridWorld."""
+    """Computes transitions P(s',r|s,a) for GridWorld.
 
-    def __init__(self, gridworld: GridWorld):
+    get_transition and build_tables need deterministic dynamics (wind is
+    fine); build_sparse_tables also covers slipping, see GridWorld.set_dynamics.
+
+    With augmented=True states encode (position, has_jump) and actions
+    encode (action, use_jump), see GridWorld.encode_state/encode_action.
+    """
+
+    def __init__(self, gridworld: GridWorld, augmented: bool = False):
         self.gridworld = gridworld
         self.size = gridworld.size
+        self.augmented = augmented
+
+        if augmented:
+            self.num_states = gridworld.get_augmented_state_space_size()
+            self.num_actions = gridworld.get_augmented_action_space_size()
+        else:
+            self.num_states = gridworld.get_state_space_size()
+            self.num_actions = gridworld.get_action_space_size()
 
-        # Cache for computed transitions
+        # Cache for computed transitions, dropped when the grid layout changes
         self._transition_cache: dict[tuple[int, int], Transition] = {}
+        self._tables: TransitionTables | None = None
+        self._sparse_tables: SparseTransitions | None = None
+        self._cache_version = gridworld.grid_version
 
-    @beartype
+    @hot_path
+    def decode_state(self, state: int) -> tuple[Position, bool]:
+        """Convert a model state index to (position, has_jump)."""
+        if self.augmented:
+            return self.gridworld.decode_state(state)
+        return self.gridworld.state_to_position(state), False
+
+    @hot_path
     def get_transition(self, state: int, action: int) -> Transition:
         """Get the deterministic transition from a state, given an action."""
+        if self._cache_version != self.gridworld.grid_version:
+            self.clear_cache()
+        if self.gridworld.is_stochastic:
+            raise ValueError("get_transition needs deterministic dynamics, use get_outcomes")
+
         cache_key = (state, action)
         if cache_key in self._transition_cache:
             return self._transition_cache[cache_key]
 
-        pos = self.gridworld.state_to_position(state)
-        action_enum = Action(action)
+        pos, has_jump = self.decode_state(state)
+        if self.augmented:
+            action_enum, use_jump = self.gridworld.decode_action(action)
+        else:
+            action_enum, use_jump = Action(action), False
 
-        next_pos, reward = self._compute_transition_outcome(pos, action_enum)
-        next_state = self.gridworld.position_to_state(next_pos)
+        next_pos, reward, next_has_jump = self._compute_transition_outcome(pos, action_enum, has_jump, use_jump)
+        if self.augmented:
+            next_state = self.gridworld.encode_state(next_pos, next_has_jump)
+        else:
+            next_state = self.gridworld.position_to_state(next_pos)
 
         transition = Transition(next_state=next_state, reward=reward)
 
         self._transition_cache[cache_key] = transition
         return transition
 
-    def _compute_transition_outcome(self, pos: Position, action: Action) -> tuple[Position, float]:
-        """Compute the deterministic outcome of taking an action from a position."""
-        # Get next position from standard move
-        next_pos = self.gridworld._get_next_position(pos, action)
+    def _compute_transition_outcome(
+        self,
+        pos: Position,
+        action: Action,
+        has_jump: bool = False,
+        use_jump: bool = False
+    ) -> tuple[Position, float, bool]:
+        """Compute the deterministic outcome of taking an action from a position.
+
+        Mirrors GridWorld.step without slipping, including wind, jump
+        consumption and regular jump pads granting the ability. Returns (next_pos, reward, next_has_jump).
+        """
+        is_jump_attempt = use_jump and has_jump
+        next_pos = self.gridworld._get_next_position(pos, action, is_jump_attempt)
 
         # Calculate reward
         reward = self.gridworld.step_penalty
@@ -51,8 +120,13 @@ class TransitionModel:
         # Check for wall collision
         if next_pos == pos:
             reward += self.gridworld.wall_penalty
+        elif is_jump_attempt:
+            has_jump = False
+
+        if self.gridworld.wind is not None:
+            next_pos = self.gridworld._apply_wind(pos, next_pos)
 
-        # Handle rewards and teleporting jump pads
+        # Handle rewards and jump pads
         cell_type = self.gridworld.grid[next_pos.row, next_pos.col]
         if cell_type == CellType.GOAL:
             reward += self.gridworld.goal_reward
@@ -62,39 +136,216 @@ class TransitionModel:
             current_pos_tuple = (next_pos.row, next_pos.col)
             if current_pos_tuple in self.gridworld.jump_destinations:
                 dest_row, dest_col = self.gridworld.jump_destinations[current_pos_tuple]
+                dest_pos = Position(dest_row, dest_col)
                 # The final position is the teleport destination
-                next_pos = Position(dest_row, dest_col)
+                if self.gridworld._is_walkable(dest_pos):
+                    next_pos = dest_pos
+            else:
+                has_jump = True
+
+        return next_pos, reward, has_jump
+
+    def _cell_layout(self) -> tuple[np.ndarray, np.ndarray]:
+        """Cell index and has_jump flag of every model state."""
+        num_cells = self.size * self.size
+        layers = self.num_states // num_cells
+        cell = np.tile(np.arange(num_cells), layers)
+        has_jump = np.repeat(np.arange(layers) == 1, num_cells)
+        return cell, has_jump
+
+    def _move_outcomes(
+        self,
+        cell: np.ndarray,
+        has_jump: np.ndarray,
+        move: int,
+        use_jump: bool
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Next model state and reward of one concrete move from every state.
+
+        Vectorized version of _compute_transition_outcome for a fixed move.
+        """
+        gw = self.gridworld
+        num_cells = self.size * self.size
+        cells = gw.grid.ravel()
+        neighbors = gw.get_neighbor_tables()
+
+        is_jump = has_jump & use_jump
+        landing = np.where(is_jump, neighbors.jump_next_states[cell, move], neighbors.next_states[cell, move])
+        moved = landing != cell
+
+        if gw.wind is not None:
+            wind = gw.wind.reshape(num_cells, 2)[cell]
+            for axis, (negative, positive) in enumerate(((Action.UP, Action.DOWN), (Action.LEFT, Action.RIGHT))):
+                direction = np.where(wind[:, axis] > 0, positive, negative)
+                strength = np.abs(wind[:, axis])
+                for push in range(int(strength.max(initial=0))):
+                    landing = np.where(push < strength, neighbors.next_states[landing, direction], landing)
+
+        reward = np.full(len(cell), gw.step_penalty)
+        reward += np.where(moved, 0.0, gw.wall_penalty)
+        landing_type = cells[landing]
+        reward += np.where(landing_type == CellType.GOAL, gw.goal_reward, 0.0)
+        reward += np.where(landing_type == CellType.TRAP, gw.trap_penalty, 0.0)
 
-        return next_pos, reward
+        # Pads with a configured destination never grant a jump; they only
+        # teleport when the destination is walkable
+        has_destination, teleport = self._pad_tables()
+        next_has_jump = has_jump & ~(is_jump & moved)
+        is_pad = landing_type == CellType.JUMP_PAD
+        destination = teleport[landing]
+        next_has_jump |= is_pad & ~has_destination[landing]
+        final = np.where(is_pad & (destination >= 0), destination, landing)
+
+        if self.augmented:
+            final = final + next_has_jump * num_cells
+        return final, reward
+
+    def _pad_tables(self) -> tuple[np.ndarray, np.ndarray]:
+        """Per-cell has-destination mask and teleport target (-1 if none or blocked)."""
+        gw = self.gridworld
+        num_cells = self.size * self.size
+        has_destination = np.zeros(num_cells, dtype=bool)
+        teleport = np.full(num_cells, -1, dtype=np.int64)
+        for (row, col), (dest_row, dest_col) in gw.jump_destinations.items():
+            has_destination[row * self.size + col] = True
+            if gw._is_walkable(Position(dest_row, dest_col)):
+                teleport[row * self.size + col] = dest_row * self.size + dest_col
+        return has_destination, teleport
+
+    def _state_flags(self, cell: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Terminal and blocked masks over model states."""
+        # Cell types repeat once per has_jump layer in augmented mode
+        cell_types = self.gridworld.grid.ravel()[cell]
+        terminal = (cell_types == CellType.GOAL) | (cell_types == CellType.TRAP)
+        blocked = cell_types == CellType.OBSTACLE
+        return terminal, blocked
+
+    @beartype
+    def build_tables(self) -> TransitionTables:
+        """Build (and cache) dense next-state/reward tables over all (s, a).
+
+        Computed with array operations over every cell at once; matches
+        get_transition entry for entry. Needs deterministic dynamics, use
+        build_sparse_tables when moves can slip.
+        """
+        if self._cache_version != self.gridworld.grid_version:
+            self.clear_cache()
+        if self._tables is not None:
+            return self._tables
+        if self.gridworld.is_stochastic:
+            raise ValueError("Dense transition tables need deterministic dynamics, use build_sparse_tables")
+
+        cell, has_jump = self._cell_layout()
+        next_states = np.zeros((self.num_states, self.num_actions), dtype=np.int32)
+        rewards = np.zeros((self.num_states, self.num_actions), dtype=np.float64)
+        for action in range(self.num_actions):
+            use_jump, move = divmod(action, len(Action))
+            next_states[:, action], rewards[:, action] = self._move_outcomes(cell, has_jump, move, bool(use_jump))
+
+        terminal, blocked = self._state_flags(cell)
+        self._tables = TransitionTables(next_states, rewards, terminal, blocked)
+        return self._tables
+
+    @beartype
+    def build_sparse_tables(self) -> SparseTransitions:
+        """Build (and cache) CSR transitions (s, a) -> [(s', p, r)] over all (s, a).
+
+        Each (s, a) has one outcome per direction the move can actually go
+        (the intended one plus the slip directions when slip_prob > 0), so
+        storage is O(S * A * outcomes) instead of O(S^2 * A).
+        """
+        if self._cache_version != self.gridworld.grid_version:
+            self.clear_cache()
+        if self._sparse_tables is not None:
+            return self._sparse_tables
+
+        slip_prob = self.gridworld.slip_prob
+        cell, has_jump = self._cell_layout()
+        num_rows = self.num_states * self.num_actions
+
+        # Outcome columns per (s, a): intended move, then the two slip moves
+        branches = [(0, 1.0 - slip_prob)]
+        if slip_prob > 0.0:
+            branches += [(1, slip_prob / 2), (2, slip_prob / 2)]
+        branches = [(branch, prob) for branch, prob in branches if prob > 0.0]
+
+        next_states = np.zeros((num_rows, len(branches)), dtype=np.int32)
+        rewards = np.zeros((num_rows, len(branches)), dtype=np.float64)
+        probs = np.zeros((num_rows, len(branches)), dtype=np.float64)
+        for action in range(self.num_actions):
+            use_jump, move = divmod(action, len(Action))
+            rows = np.arange(self.num_states) * self.num_actions + action
+            for column, (branch, prob) in enumerate(branches):
+                actual = move if branch == 0 else SLIP_ACTIONS[Action(move)][branch - 1]
+                next_states[rows, column], rewards[rows, column] = self._move_outcomes(
+                    cell, has_jump, int(actual), bool(use_jump)
+                )
+                probs[rows, column] = prob
+
+        indptr = np.arange(num_rows + 1, dtype=np.int64) * len(branches)
+        terminal, blocked = self._state_flags(cell)
+        row_ids = np.repeat(np.arange(num_rows, dtype=np.int64), np.diff(indptr))
+        self._sparse_tables = SparseTransitions(
+            indptr, next_states.ravel(), probs.ravel(), rewards.ravel(), terminal, blocked, row_ids
+        )
+        return self._sparse_tables
+
+    @beartype
+    def expected_action_values(self, values: np.ndarray, gamma: float) -> np.ndarray:
+        """Expectation backup Q(s,a) = Σ p(s',r|s,a)[r + γV(s')] as a sparse mat-vec."""
+        sparse = self.build_sparse_tables()
+        contributions = sparse.probs * (sparse.rewards + gamma * values[sparse.next_states])
+        row_sums = np.bincount(sparse.row_ids, weights=contributions, minlength=self.num_states * self.num_actions)
+        return row_sums.reshape(self.num_states, self.num_actions)
+
+    @beartype
+    def get_outcomes(self, state: int, action: int) -> list[tuple[int, float, float]]:
+        """All (next_state, probability, reward) outcomes of a state-action pair."""
+        sparse = self.build_sparse_tables()
+        row = state * self.num_actions + action
+        start, stop = sparse.indptr[row], sparse.indptr[row + 1]
+        return list(zip(
+            sparse.next_states[start:stop].tolist(),
+            sparse.probs[start:stop].tolist(),
+            sparse.rewards[start:stop].tolist()
+        ))
 
     @beartype
     def get_transition_matrix(self, action: int) -> tuple[np.ndarray, np.ndarray]:
         """Get full transition matrix P and reward matrix R for given action."""
-        num_states = self.gridworld.get_state_space_size()
-        P = np.zeros((num_states, num_states))
-        R = np.zeros((num_states, num_states))
+        P = np.zeros((self.num_states, self.num_states))
+        R = np.zeros((self.num_states, self.num_states))
+
+        sparse = self.build_sparse_tables()
+        rows = sparse.row_ids
+        outcomes = rows % self.num_actions == action
+        states = rows[outcomes] // self.num_actions
+        next_states = sparse.next_states[outcomes]
+        probs = sparse.probs[outcomes]
 
-        for state in range(num_states):
-            transition = self.get_transition(state, action)
-            P[state, transition.next_state] = 1.0
-            R[state, transition.next_state] = transition.reward
+        # R holds the expected reward given (s, s'), outcomes can share s'
+        np.add.at(P, (states, next_states), probs)
+        np.add.at(R, (states, next_states), probs * sparse.rewards[outcomes])
+        R = np.divide(R, P, out=np.zeros_like(R), where=P > 0)
 
         return P, R
 
     @beartype
     def is_terminal_state(self, state: int) -> bool:
         """Check if state is terminal (goal or trap)."""
-        pos = self.gridworld.state_to_position(state)
+        pos, _ = self.decode_state(state)
         cell_type = self.gridworld.grid[pos.row, pos.col]
         return cell_type in [CellType.GOAL, CellType.TRAP]
 
     @beartype
     def get_expected_reward(self, state: int, action: int) -> float:
-        """Get immediate reward for state-action pair."""
-        transition = self.get_transition(state, action)
-        return transition.reward
+        """Get expected immediate reward for state-action pair."""
+        return sum(prob * reward for _, prob, reward in self.get_outcomes(state, action))
 
     @beartype
     def clear_cache(self) -> None:
         """Clear transition cache (useful if environment changes)."""
         self._transition_cache.clear()
+        self._tables = None
+        self._sparse_tables = None
+        self._cache_version = self.gridworld.grid_version
@@ -0,0 +1,22 @@
+"""Runtime type checking switch for hot-path methods.
+
+Set GRIDWORLD_FAST_MODE=1 before importing the environment or algorithms to
+skip beartype on methods called every step:
+
+    GRIDWORLD_FAST_MODE=1 uv run python -m benchmarks.step_throughput
+"""
+
+import os
+from typing import Callable, TypeVar
+from beartype import beartype
+
+F = TypeVar("F", bound=Callable)
+
+FAST_MODE = os.environ.get("GRIDWORLD_FAST_MODE", "0").lower() in ("1", "true", "yes")
+
+
+def hot_path(func: F) -> F:
+    """Apply beartype unless fast mode is enabled."""
+    if FAST_MODE:
+        return func
+    return beartype(func)
@@ -0,0 +1,121 @@
+"""Lockstep batch of GridWorld episodes backed by transition tables."""
+
+from typing import NamedTuple
+from beartype import beartype
+import numpy as np
+from .gridworld import GridWorld, Position
+from .seeding import SeedLike, make_rng
+from .transition_model import SparseTransitions, TransitionModel, TransitionTables
+
+
+class VectorStepResult(NamedTuple):
+    """Result of stepping every environment once."""
+    next_states: np.ndarray  # (E,) state reached, before auto-reset
+    rewards: np.ndarray  # (E,)
+    dones: np.ndarray  # (E,) reached a goal or trap
+    truncated: np.ndarray  # (E,) hit max_steps without terminating
+
+
+class VectorGridWorld:
+    """Steps num_envs copies of a GridWorld in lockstep with array lookups.
+
+    Dynamics come from TransitionModel.build_tables, so each step is a
+    gather over (state, action) rather than num_envs GridWorld.step calls.
+    When the gridworld slips, build_sparse_tables is used instead and each
+    step samples one outcome per environment from its (state, action) row,
+    drawing from gridworld's random stream unless a seed is given.
+    Finished episodes are reset to the start state automatically.
+    """
+
+    @beartype
+    def __init__(
+        self,
+        gridworld: GridWorld,
+        num_envs: int = 64,
+        max_steps: int = 1000,
+        augmented: bool = False,
+        start_pos: Position | None = None,
+        tables: TransitionTables | SparseTransitions | None = None,
+        seed: SeedLike = None
+    ):
+        self.gridworld = gridworld
+        self.num_envs = num_envs
+        self.max_steps = max_steps
+        self.augmented = augmented
+        self.rng = gridworld.rng if seed is None else make_rng(seed)
+
+        model = TransitionModel(gridworld, augmented=augmented)
+        self.num_states, self.num_actions = model.num_states, model.num_actions
+        if tables is None:
+            tables = model.build_sparse_tables() if gridworld.is_stochastic else model.build_tables()
+        self.tables = tables
+        if isinstance(tables, SparseTransitions):
+            # Running probability mass, so a uniform draw per row picks its outcome by bisection
+            self._cumulative_probs = np.cumsum(tables.probs)
+            self._row_mass = np.concatenate(([0.0], self._cumulative_probs))[tables.indptr]
+
+        start_pos = start_pos or Position(0, 0)
+        self.start_state = gridworld.position_to_state(start_pos)
+
+        self.states = np.full(num_envs, self.start_state, dtype=np.int64)
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+        self.episode_rewards = np.zeros(num_envs, dtype=np.float64)
+
+        # Completed episode statistics, in completion order
+        self.completed_rewards: list[float] = []
+        self.completed_lengths: list[int] = []
+
+    @beartype
+    def reset(self) -> np.ndarray:
+        """Reset every environment to the start state."""
+        self.states.fill(self.start_state)
+        self.episode_steps.fill(0)
+        self.episode_rewards.fill(0.0)
+        self.completed_rewards.clear()
+        self.completed_lengths.clear()
+        return self.states
+
+    def step(self, actions: np.ndarray, envs: np.ndarray | None = None) -> VectorStepResult:
+        """Apply one action per environment and auto-reset finished episodes.
+
+        With envs, only those environments step (actions[i] for envs[i]),
+        the rest keep their state, and the result covers envs only.
+        """
+        states = self.states if envs is None else self.states[envs]
+        index = slice(None) if envs is None else envs
+        if isinstance(self.tables, SparseTransitions):
+            next_states, rewards = self._sample_outcomes(states, actions)
+        else:
+            next_states = self.tables.next_states[states, actions].astype(np.int64)
+            rewards = self.tables.rewards[states, actions]
+        dones = self.tables.terminal[next_states]
+
+        self.episode_steps[index] += 1
+        self.episode_rewards[index] += rewards
+        truncated = ~dones & (self.episode_steps[index] >= self.max_steps)
+
+        finished = np.flatnonzero(dones | truncated)
+        if envs is not None:
+            finished = envs[finished]
+        if finished.size:
+            self.completed_rewards.extend(self.episode_rewards[finished].tolist())
+            self.completed_lengths.extend(self.episode_steps[finished].tolist())
+            self.episode_steps[finished] = 0
+            self.episode_rewards[finished] = 0.0
+
+        # A fresh array, so callers may keep the states they acted on
+        self.states = next_states.copy() if envs is None else self.states.copy()
+        if envs is not None:
+            self.states[envs] = next_states
+        self.states[finished] = self.start_state
+        return VectorStepResult(next_states, rewards, dones, truncated)
+
+    def _sample_outcomes(self, states: np.ndarray, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Draw one (next_state, reward) per environment from the CSR outcome rows."""
+        rows = states * self.num_actions + actions
+        low, high = self._row_mass[rows], self._row_mass[rows + 1]
+        targets = low + self.rng.random(len(rows)) * (high - low)
+        outcomes = np.searchsorted(self._cumulative_probs, targets, side="right")
+        # Rounding can land on a neighbouring row's outcome; keep every draw inside its row
+        outcomes = np.clip(outcomes, self.tables.indptr[rows], self.tables.indptr[rows + 1] - 1)
+        return self.tables.next_states[outcomes].astype(np.int64), self.tables.rewards[outcomes]
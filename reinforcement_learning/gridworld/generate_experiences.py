@@ -3,6 +3,7 @@
 import sys
 from beartype import beartype
 from environment.game1 import Game1
+from environment.seeding import spawn_seeds
 from algorithms.random_strategy import RandomStrategy
 from utils.experience_recorder import ExperienceRecorder
 
@@ -11,7 +12,11 @@ from utils.experience_recorder import ExperienceRecorder
 def run_episode(algorithm: RandomStrategy, env: Game1, recorder: ExperienceRecorder, episode_num: int) -> float:
     """Run a single episode and record experiences."""
     seed = 42 + episode_num  # Different seed for each episode
-    algorithm.seed = seed
+
+    # Independent algorithm and environment streams, both reproducible from seed
+    algorithm_seed, env_seed = spawn_seeds(seed, 2)
+    algorithm.reseed(algorithm_seed)
+    env.reseed(env_seed)
 
     recorder.start_episode(
         algorithm_name=algorithm.name,
@@ -28,9 +33,9 @@ def run_episode(algorithm: RandomStrategy, env: Game1, recorder: ExperienceRecor
 
     while env.status.name == "RUNNING" and step < 1000:  # Max 1000 steps to prevent infinite loops
         current_state = env.agent_pos
-        action = algorithm.select_action(current_state)
+        action, use_jump = algorithm.select_action_and_jump(current_state)
 
-        result = env.step(action)
+        result = env.step(action, use_jump)
         step += 1
         total_reward += result.reward
 
@@ -0,0 +1 @@
+"""Headless hyperparameter sweeps for GridWorld algorithms."""
@@ -0,0 +1,255 @@
+"""Headless hyperparameter sweeps over a process pool.
+
+uv run python -m sweeps.hyperparameter_sweep q_learning alpha=0.05,0.1,0.2 epsilon=0.05,0.1 \
+    --seeds 5 --episodes 500 --workers 8 --output sweeps/results/q_learning.npz
+
+Every (configuration, seed) pair is one run of run_episode calls on a clone
+of a single prepared environment. The environment is built once in the
+parent, with its neighbor tables cached and made read-only, and handed to
+each worker once through the pool initializer. Learning curves are written
+as one column per field to an .npz file.
+"""
+
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, NamedTuple
+
+from beartype import beartype
+import numpy as np
+
+from environment.game1 import Game1
+from environment.gridworld import GridWorld
+from environment.seeding import spawn_seeds
+from algorithms.q_learning import QLearning
+from algorithms.linear_q_learning import LinearQLearning
+from algorithms.temporal_difference import TD0
+from algorithms.td_lambda import TDLambda
+from algorithms.sarsa_lambda import SarsaLambda, WatkinsQLambda
+from algorithms.monte_carlo import MonteCarlo
+from algorithms.reinforce import REINFORCE
+
+# Algorithms addressable by name, so runs pickle as plain strings
+ALGORITHMS = {
+    "q_learning": QLearning,
+    "linear_q_learning": LinearQLearning,
+    "td0": TD0,
+    "td_lambda": TDLambda,
+    "sarsa_lambda": SarsaLambda,
+    "watkins_q_lambda": WatkinsQLambda,
+    "monte_carlo": MonteCarlo,
+    "reinforce": REINFORCE,
+}
+
+
+class SweepRun(NamedTuple):
+    """One (configuration, seed) run of a sweep."""
+    run_id: int
+    algorithm: str
+    params: dict[str, Any]
+    seed: int
+    num_episodes: int
+    max_steps: int
+
+
+class RunResult(NamedTuple):
+    """Learning curve of one run."""
+    run_id: int
+    rewards: np.ndarray  # (num_episodes,) float64
+    lengths: np.ndarray  # (num_episodes,) int32
+    seconds: float
+
+
+# Environment shared by every run in a worker process, set by _init_worker
+_shared_env: GridWorld | None = None
+
+
+@beartype
+def expand_grid(param_grid: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """All combinations of a parameter grid, in row-major order."""
+    names = list(param_grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(param_grid[name] for name in names))]
+
+
+@beartype
+def prepare_environment(env: GridWorld) -> GridWorld:
+    """Copy env with its own grid and cached tables, frozen for sharing across runs.
+
+    env itself is left writable; clones share their grid and tables, so
+    the copy gets a fresh grid array and a bumped grid_version to rebuild
+    the tables from it.
+    """
+    prepared = env.clone()
+    prepared.grid = env.grid.copy()
+    prepared.grid_version += 1
+    _freeze(prepared)
+    return prepared
+
+
+def _freeze(env: GridWorld) -> None:
+    """Build env's neighbor tables if needed and make them and the grid read-only."""
+    for array in (env.grid, *env.get_neighbor_tables()):
+        array.setflags(write=False)
+
+
+def _init_worker(env: GridWorld) -> None:
+    """Pool initializer: keep the prepared environment for all runs in this worker.
+
+    Under spawn and forkserver env arrives pickled, and unpickled arrays
+    are writable again, so it is frozen once more here.
+    """
+    global _shared_env
+    _freeze(env)
+    _shared_env = env
+
+
+def _execute_run(run: SweepRun) -> RunResult:
+    """Train one algorithm instance and return its learning curve."""
+    algorithm_seed, env_seed = spawn_seeds(run.seed, 2)
+    env = _shared_env.clone(seed=env_seed)
+    algorithm = ALGORITHMS[run.algorithm](env, seed=algorithm_seed, **run.params)
+
+    rewards = np.zeros(run.num_episodes)
+    lengths = np.zeros(run.num_episodes, dtype=np.int32)
+    start = time.perf_counter()
+    for episode in range(run.num_episodes):
+        metrics = algorithm.run_episode(run.max_steps)
+        rewards[episode] = metrics['reward']
+        lengths[episode] = metrics['length']
+
+    return RunResult(run.run_id, rewards, lengths, time.perf_counter() - start)
+
+
+@beartype
+def run_sweep(
+    env: GridWorld,
+    algorithm: str,
+    param_grid: dict[str, list[Any]],
+    seeds: list[int],
+    num_episodes: int = 500,
+    max_steps: int = 1000,
+    workers: int | None = None,
+    output_path: str | None = None
+) -> dict[str, np.ndarray]:
+    """Run every configuration for every seed and return columnar results.
+
+    Runs with the same seed share their random streams across
+    configurations (common random numbers), which makes differences
+    between configurations less noisy. Columns: run_id, seed, one column
+    per swept parameter, seconds, and (runs, num_episodes) rewards/lengths.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{algorithm}', choose from {sorted(ALGORITHMS)}")
+
+    configs = expand_grid(param_grid)
+    runs = [
+        SweepRun(run_id, algorithm, params, seed, num_episodes, max_steps)
+        for run_id, (params, seed) in enumerate(itertools.product(configs, seeds))
+    ]
+
+    print(f"🧪 Sweeping {algorithm}: {len(configs)} configurations x {len(seeds)} seeds = {len(runs)} runs")
+    env = prepare_environment(env)
+    results: list[RunResult | None] = [None] * len(runs)
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(env,)) as pool:
+        chunksize = max(1, len(runs) // (4 * (workers or os.cpu_count() or 1)))
+        for done, result in enumerate(pool.map(_execute_run, runs, chunksize=chunksize), start=1):
+            results[result.run_id] = result
+            if done % max(1, len(runs) // 10) == 0 or done == len(runs):
+                print(f"   {done}/{len(runs)} runs ({time.perf_counter() - start:.1f}s)")
+
+    columns = {
+        "run_id": np.arange(len(runs)),
+        "seed": np.array([run.seed for run in runs]),
+        "seconds": np.array([result.seconds for result in results]),
+        "rewards": np.stack([result.rewards for result in results]),
+        "lengths": np.stack([result.lengths for result in results]),
+    }
+    for name in param_grid:
+        columns[f"param_{name}"] = np.array([run.params[name] for run in runs])
+
+    if output_path is not None:
+        save_results(output_path, columns)
+        print(f"💾 Saved results to {output_path}")
+    return columns
+
+
+@beartype
+def save_results(path: str, columns: dict[str, np.ndarray]) -> None:
+    """Write result columns to an .npz file, one array per column."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    np.savez(path, **columns)
+
+
+@beartype
+def load_results(path: str) -> dict[str, np.ndarray]:
+    """Read result columns written by save_results."""
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+@beartype
+def parse_grid(specs: list[str]) -> dict[str, list[Any]]:
+    """Parse 'name=v1,v2,...' specs; values become int, float or bool where possible."""
+    def parse_value(text: str) -> Any:
+        if text in ("True", "False"):
+            return text == "True"
+        for convert in (int, float):
+            try:
+                return convert(text)
+            except ValueError:
+                pass
+        return text
+
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        grid[name] = [parse_value(value) for value in values.split(",")]
+    return grid
+
+
+def main():
+    """Run a sweep from the command line and print the best configurations."""
+    parser = argparse.ArgumentParser(description="Headless hyperparameter sweep on Game1")
+    parser.add_argument("algorithm", choices=sorted(ALGORITHMS))
+    parser.add_argument("grid", nargs="*", help="parameter values, e.g. alpha=0.05,0.1 gamma=0.9,0.99")
+    parser.add_argument("--seeds", type=int, default=3, help="number of seeds per configuration")
+    parser.add_argument("--episodes", type=int, default=500)
+    parser.add_argument("--max-steps", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=None, help="results .npz path")
+    args = parser.parse_args()
+
+    param_grid = parse_grid(args.grid)
+    output = args.output or f"sweeps/results/{args.algorithm}.npz"
+    columns = run_sweep(
+        Game1(),
+        args.algorithm,
+        param_grid,
+        seeds=list(range(args.seeds)),
+        num_episodes=args.episodes,
+        max_steps=args.max_steps,
+        workers=args.workers,
+        output_path=output
+    )
+
+    # Rank configurations by mean reward over the last 10% of episodes
+    tail = max(1, args.episodes // 10)
+    final_rewards = columns["rewards"][:, -tail:].mean(axis=1)
+    configs = expand_grid(param_grid)
+    per_config = final_rewards.reshape(len(configs), args.seeds)
+    order = np.argsort(-per_config.mean(axis=1))
+
+    print(f"\n🏆 Top configurations (mean reward over last {tail} episodes)")
+    for rank, index in enumerate(order[:10], start=1):
+        mean, std = per_config[index].mean(), per_config[index].std()
+        print(f"   {rank}. {configs[index]}: {mean:+.2f} ± {std:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -333,7 +333,8 @@ class PygameRenderer:
                     continue
 
                 state = self.gridworld.position_to_state(pos)
-                action = Action(self.policy[state])
+                # Jump moves (augmented action ids) point the same way as plain moves
+                action = Action(self.policy[state] % len(Action))
 
                 rect = self._get_cell_rect(row, col)
                 center = rect.center
@@ -10,6 +10,10 @@ import threading
 from pathlib import Path
 
 from gridworld.algorithms.base_algorithm import BaseAlgorithm
+from .parameter_sync import (
+    ParameterReplica, ParameterStore, ParameterUpdate, load_policy_parameters, policy_parameters
+)
+from .sharded_parameter_server import ShardedParameterClient, ShardSlice
 
 
 class DistributedAgent:
@@ -37,7 +41,20 @@ class DistributedAgent:
             use_gpu: Whether to use GPU for training
             device: Specific device to use
         """
-        pass
+        self.algorithm = algorithm
+        self.learning_rate = learning_rate
+        self.batch_size = batch_size
+        self.update_frequency = update_frequency
+        self.target_update_frequency = target_update_frequency
+        self.use_gpu = use_gpu
+        self.device = device
+
+        # Versions this agent publishes, and the copy of remote versions it follows
+        self.parameter_store = ParameterStore()
+        self.replica = ParameterReplica()
+
+        # Routed connection to a (sharded) parameter server, once connected
+        self.router: Optional[ShardedParameterClient] = None
 
     @beartype
     def learn_from_batch(self, batch: dict[str, np.ndarray]) -> dict[str, float]:
@@ -67,10 +84,28 @@ class DistributedAgent:
     def get_policy_parameters(self) -> dict[str, Any]:
         """Get current policy parameters for distribution.
 
+        The arrays are the algorithm's own, not copies; they are also
+        published to parameter_store as a new version if they changed.
+
         Returns:
             Dictionary of policy parameters
         """
-        pass
+        parameters = policy_parameters(self.algorithm)
+        self.parameter_store.publish(parameters)
+        return parameters
+
+    @beartype
+    def get_parameter_update(self, since_version: int) -> ParameterUpdate:
+        """Get the update taking a replica at since_version to the current parameters.
+
+        Args:
+            since_version: Version the receiver holds (0 for none)
+
+        Returns:
+            Deltas of the changed arrays, or a full snapshot for far-behind receivers
+        """
+        self.get_policy_parameters()
+        return self.parameter_store.update_for(since_version)
 
     @beartype
     def set_policy_parameters(self, parameters: dict[str, Any]) -> None:
@@ -79,7 +114,69 @@ class DistributedAgent:
         Args:
             parameters: New policy parameters
         """
-        pass
+        load_policy_parameters(self.algorithm, parameters)
+
+    @beartype
+    def apply_parameter_update(self, update: ParameterUpdate) -> None:
+        """Apply a versioned update from parameter server to the policy.
+
+        Args:
+            update: Update based on this agent's replica version
+        """
+        self.replica.apply(update)
+        load_policy_parameters(self.algorithm, self.replica.parameters)
+
+    @beartype
+    def connect_parameter_server(
+        self,
+        worker_id: str,
+        plan: dict[str, list[ShardSlice]],
+        addresses: list[tuple[str, int]],
+        shapes: dict[str, tuple[int, ...]]
+    ) -> None:
+        """Connect to every shard of a parameter server.
+
+        Args:
+            worker_id: Unique identifier for this agent
+            plan: The server's shard plan (ShardedParameterServer.connection_info())
+            addresses: (host, port) of each shard
+            shapes: Full shape of every array parameter
+        """
+        if self.router is not None:
+            self.router.close()
+        self.router = ShardedParameterClient(worker_id, plan, addresses, shapes)
+
+    @beartype
+    def push_gradients_to_server(self, gradients: dict[str, np.ndarray], weight: float = 1.0) -> None:
+        """Send gradients to the shards that own each parameter.
+
+        Args:
+            gradients: Gradients by parameter name, full shapes
+            weight: Weight for gradient aggregation
+        """
+        if self.router is None:
+            raise RuntimeError("Not connected to a parameter server")
+        self.router.push_gradients(gradients, weight)
+
+    @beartype
+    def pull_parameters_from_server(self) -> dict[str, Any]:
+        """Pull the current parameters from every shard and load them into the policy.
+
+        Returns:
+            The reassembled parameters
+        """
+        if self.router is None:
+            raise RuntimeError("Not connected to a parameter server")
+        parameters = self.router.get_parameters()
+        load_policy_parameters(self.algorithm, parameters)
+        return parameters
+
+    @beartype
+    def disconnect_parameter_server(self) -> None:
+        """Close the connections to the parameter server."""
+        if self.router is not None:
+            self.router.close()
+            self.router = None
 
     @beartype
     def compute_gradients(self, batch: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
@@ -1,86 +1,316 @@
 """Distributed environment component for experience generation."""
 
-from typing import Any, Optional
+import multiprocessing as mp
+import time
+import traceback
+from typing import Any, Callable, Optional
 from beartype import beartype
 import numpy as np
-import torch
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from multiprocessing import Queue
+from queue import Empty
 
-from gridworld.environment import GridWorld
+from gridworld.environment import VectorGridWorld
 from gridworld.algorithms.base_algorithm import BaseAlgorithm
+from .replay_buffer import ReplayBufferPool, DEFAULT_EXPERIENCE_SPEC
+from .parameter_sync import ParameterReplica, ParameterStore, policy_parameters
+
+# Columns of every experience chunk, in DEFAULT_EXPERIENCE_SPEC order
+EXPERIENCE_KEYS = list(DEFAULT_EXPERIENCE_SPEC)
+
+# Seconds between worker liveness checks while waiting for results
+_POLL_SECONDS = 1.0
+
+
+def select_actions(params: dict[str, Any], states: np.ndarray, rng: np.random.Generator, num_actions: int) -> np.ndarray:
+    """One action per state from policy parameters, for a whole batch of states."""
+    if "q_values" in params:
+        # Epsilon-greedy, breaking ties randomly
+        q = params["q_values"][states]
+        is_best = q == q.max(axis=1, keepdims=True)
+        greedy = np.argmax(np.where(is_best, rng.random(q.shape), -1.0), axis=1)
+    elif "W" in params:
+        # Softmax policy, inverse-CDF sampled
+        logits = params["W"][states] + params["b"]
+        probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs /= probs.sum(axis=1, keepdims=True)
+        draws = rng.random((len(states), 1))
+        return np.minimum((probs.cumsum(axis=1) < draws).sum(axis=1), probs.shape[1] - 1)
+    elif "policy" in params:
+        greedy = params["policy"][states]
+    else:
+        return rng.integers(0, num_actions, size=len(states))
+
+    explore = rng.random(len(states)) < params.get("epsilon", 0.0)
+    return np.where(explore, rng.integers(0, num_actions, size=len(states)), greedy)
 
 
 class DistributedEnvironment:
-    """Manages multiple environment instances for parallel experience generation."""
+    """Manages multiple environment instances for parallel experience generation.
+
+    Each worker process steps its own VectorGridWorld of num_envs_per_worker
+    lockstep environments. Policy parameters are published as numbered
+    versions; a worker is sent the deltas since its own version only when
+    it lags the latest by more than max_staleness versions. Workers
+    write experiences as columns into their own buffer of a shared-memory
+    transport pool (or straight into a ReplayBufferPool), so only small
+    control messages go through the queues.
+    """
 
     @beartype
     def __init__(
         self,
-        env_factory: callable,
+        env_factory: Callable,
         num_workers: int = 4,
         use_gpu: bool = False,
-        device: Optional[str] = None
+        device: Optional[str] = None,
+        num_envs_per_worker: int = 64,
+        augmented: bool = False,
+        chunk_size: int = 65536,
+        replay_pool: Optional[ReplayBufferPool] = None,
+        seed: Optional[int] = None,
+        start_method: Optional[str] = None,
+        max_staleness: int = 0,
+        quantize_updates: bool = False
     ):
         """Initialize distributed environment.
 
         Args:
-            env_factory: Factory function to create environment instances
+            env_factory: Factory returning a gridworld.environment GridWorld (e.g. Game1)
             num_workers: Number of parallel environment workers
             use_gpu: Whether to use GPU for computation
             device: Specific device to use (e.g., 'cuda:0')
+            num_envs_per_worker: Lockstep environments per worker
+            augmented: Use (position, has_jump) states and jump actions
+            chunk_size: Rows per worker in the shared transport buffers
+            replay_pool: Shared pool that generate_to_replay writes into,
+                worker i owning buffer i
+            seed: Root seed; every worker gets an independent child stream
+            start_method: multiprocessing start method (default: platform default)
+            max_staleness: Versions a worker may lag before it is sent an update
+            quantize_updates: Broadcast float parameter changes as int8 deltas
         """
-        pass
+        if replay_pool is not None and replay_pool.num_buffers < num_workers:
+            raise ValueError(
+                f"replay_pool needs one buffer per worker ({num_workers}), has {replay_pool.num_buffers}"
+            )
+
+        self.env_factory = env_factory
+        self.num_workers = num_workers
+        self.use_gpu = use_gpu
+        self.device = device
+        self.num_envs_per_worker = num_envs_per_worker
+        self.augmented = augmented
+        self.chunk_size = chunk_size
+        self.worker_seeds = np.random.SeedSequence(seed).spawn(num_workers)
+
+        # Published policy versions, and the version each worker holds
+        self.max_staleness = max_staleness
+        self.parameter_store = ParameterStore(quantize=quantize_updates)
+        self.policy_version = 0
+        self._worker_versions = [0] * num_workers
+        self._broadcast_bytes = 0
+        self._updates_sent = 0
+
+        # Worker i writes its chunks into buffer i of the transport pool
+        self._transport = ReplayBufferPool(
+            num_buffers=num_workers,
+            buffer_capacity=chunk_size,
+            experience_spec=DEFAULT_EXPERIENCE_SPEC
+        )
+        self._transport_handle = self._transport.handle
+        self._replay_handle = replay_pool.handle if replay_pool is not None else None
+
+        self._next_task_id = 0
+        # Why the workers can no longer serve tasks, once one has died
+        self._failure: Optional[str] = None
+        self._worker_stats = [
+            {"steps": 0, "episodes": 0, "reward_sum": 0.0, "busy_seconds": 0.0}
+            for _ in range(num_workers)
+        ]
+
+        context = mp.get_context(start_method)
+        self._result_queue = context.Queue()
+        self._task_queues = [context.Queue() for _ in range(num_workers)]
+        self._processes = [
+            context.Process(
+                target=self._worker_process,
+                args=(worker_id, self._task_queues[worker_id], self._result_queue),
+                daemon=True
+            )
+            for worker_id in range(num_workers)
+        ]
+        for process in self._processes:
+            process.start()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Configuration only, for starting workers with spawn/forkserver."""
+        state = self.__dict__.copy()
+        for name in ("_transport", "_result_queue", "_task_queues", "_processes", "parameter_store"):
+            state.pop(name, None)
+        return state
+
+    def _sync_policy(self, policy: Optional[BaseAlgorithm]) -> None:
+        """Publish the policy's current parameters (a new version if they changed)."""
+        if policy is not None:
+            self.update_policy(policy_parameters(policy))
+
+    def _sync_workers(self) -> None:
+        """Send an update to every worker lagging by more than max_staleness versions."""
+        for worker_id, version in enumerate(self._worker_versions):
+            if self.policy_version - version > self.max_staleness:
+                update = self.parameter_store.update_for(version)
+                self._task_queues[worker_id].put(("params", update))
+                self._worker_versions[worker_id] = update.version
+                self._broadcast_bytes += update.nbytes
+                self._updates_sent += 1
+
+    def _split(self, total: int) -> list[int]:
+        """Share total as evenly as possible across workers."""
+        base, extra = divmod(total, self.num_workers)
+        return [base + (worker_id < extra) for worker_id in range(self.num_workers)]
+
+    def _fail(self, reason: str) -> RuntimeError:
+        """Mark the environment as unusable; returns the error to raise."""
+        self._failure = reason
+        return RuntimeError(reason)
+
+    def _next_result(self) -> tuple:
+        """Next worker message, checking between polls that every worker is still alive."""
+        while True:
+            try:
+                return self._result_queue.get(timeout=_POLL_SECONDS)
+            except Empty:
+                pass
+            for worker_id, process in enumerate(self._processes):
+                if process.exitcode is not None:
+                    raise self._fail(f"Environment worker {worker_id} exited with code {process.exitcode}")
+
+    def _run_tasks(self, kind: str, quotas: list[int], *args: Any) -> list[list[dict[str, np.ndarray]]]:
+        """Send one task per worker and collect every worker's chunks, in worker order.
+
+        A worker that fails or dies leaves the environment failed: this and
+        every later call raise RuntimeError, and a new DistributedEnvironment
+        is needed.
+        """
+        if self._failure is not None:
+            raise RuntimeError(f"Distributed environment is no longer usable: {self._failure}")
+        self._sync_workers()
+        task_id = self._next_task_id
+        self._next_task_id += 1
+        for worker_id, quota in enumerate(quotas):
+            self._task_queues[worker_id].put((kind, task_id, self.policy_version, quota, *args))
+
+        chunks: list[list[dict[str, np.ndarray]]] = [[] for _ in range(self.num_workers)]
+        pending = self.num_workers
+        while pending:
+            message = self._next_result()
+            if message[0] == "error":
+                raise self._fail(f"Environment worker {message[1]} failed:\n{message[2]}")
+
+            _, message_task, worker_id, payload = message
+            if message_task != task_id:
+                # Left over from an aborted task; the worker waits for its ack
+                if message[0] == "chunk":
+                    self._task_queues[worker_id].put(("ack",))
+                continue
+            if message[0] == "chunk":
+                view = self._transport.get_buffer_view(worker_id)
+                chunks[worker_id].append({key: column.copy() for key, column in view.items()})
+                del view
+                self._task_queues[worker_id].put(("ack",))
+            else:
+                stats = self._worker_stats[worker_id]
+                for key, value in payload.items():
+                    stats[key] += value
+                pending -= 1
+        return chunks
+
+    @staticmethod
+    def _concatenate(chunks: list[list[dict[str, np.ndarray]]]) -> dict[str, np.ndarray]:
+        """Join worker chunks into one column per key."""
+        parts = [chunk for worker_chunks in chunks for chunk in worker_chunks]
+        if not parts:
+            return {key: np.zeros(0, dtype=dtype) for key, (dtype, _) in DEFAULT_EXPERIENCE_SPEC.items()}
+        return {key: np.concatenate([part[key] for part in parts]) for key in EXPERIENCE_KEYS}
 
     @beartype
     def generate_experiences(
         self,
-        policy: BaseAlgorithm,
+        policy: Optional[BaseAlgorithm],
         num_episodes: int,
         max_steps_per_episode: int = 1000
-    ) -> list[dict[str, Any]]:
+    ) -> dict[str, np.ndarray]:
         """Generate experiences using current policy across multiple environments.
 
+        Every worker restarts its environments and runs its share of the
+        episodes to completion (or max_steps_per_episode).
+
         Args:
             policy: Current policy to follow for experience generation
+                (None keeps the parameters last sent with update_policy)
             num_episodes: Total number of episodes to generate
             max_steps_per_episode: Maximum steps per episode
 
         Returns:
-            List of experience dictionaries containing states, actions, rewards, etc.
+            Experience columns ('state', 'action', 'reward', 'next_state',
+            'done'), worker by worker
         """
-        pass
+        self._sync_policy(policy)
+        return self._concatenate(self._run_tasks("episodes", self._split(num_episodes), max_steps_per_episode))
 
     @beartype
     def generate_batch_experiences(
         self,
-        policy: BaseAlgorithm,
+        policy: Optional[BaseAlgorithm],
         batch_size: int
     ) -> dict[str, np.ndarray]:
         """Generate a batch of experiences for training.
 
+        Workers continue their running episodes, so consecutive batches
+        form one continuous stream of experience.
+
         Args:
-            policy: Current policy to follow
+            policy: Current policy to follow (None keeps the last parameters)
             batch_size: Number of experiences to generate
 
         Returns:
             Batched experiences as numpy arrays
         """
-        pass
+        self._sync_policy(policy)
+        return self._concatenate(self._run_tasks("steps", self._split(batch_size)))
+
+    @beartype
+    def generate_to_replay(self, policy: Optional[BaseAlgorithm], num_steps: int) -> int:
+        """Generate num_steps experiences directly into the replay pool.
+
+        Worker i appends to buffer i of the pool passed as replay_pool, so
+        nothing is copied back to this process. Returns the rows written.
+        """
+        if self._replay_handle is None:
+            raise ValueError("generate_to_replay needs a replay_pool")
+        self._sync_policy(policy)
+        quotas = self._split(num_steps)
+        self._run_tasks("replay", quotas)
+        return sum(quotas)
 
     @beartype
     def update_policy(self, new_policy_params: dict[str, Any]) -> None:
         """Update the policy parameters across all workers.
 
+        Publishes a new version when anything changed. Workers receive it
+        lazily, with their next task, once they lag by more than
+        max_staleness versions.
+
         Args:
             new_policy_params: New policy parameters from parameter server
         """
-        pass
+        self.policy_version = self.parameter_store.publish(new_policy_params)
 
     @beartype
     def reset_environments(self) -> None:
         """Reset all environment instances."""
-        pass
+        for queue in self._task_queues:
+            queue.put(("reset",))
 
     @beartype
     def get_environment_stats(self) -> dict[str, Any]:
@@ -89,17 +319,191 @@ class DistributedEnvironment:
         Returns:
             Dictionary containing worker statistics and performance metrics
         """
-        pass
+        steps = sum(stats["steps"] for stats in self._worker_stats)
+        episodes = sum(stats["episodes"] for stats in self._worker_stats)
+        busy = sum(stats["busy_seconds"] for stats in self._worker_stats)
+        return {
+            "num_workers": self.num_workers,
+            "envs_per_worker": self.num_envs_per_worker,
+            "policy_version": self.policy_version,
+            "worker_versions": list(self._worker_versions),
+            "parameter_updates_sent": self._updates_sent,
+            "parameter_bytes_sent": self._broadcast_bytes,
+            "total_steps": steps,
+            "total_episodes": episodes,
+            "avg_episode_reward": sum(stats["reward_sum"] for stats in self._worker_stats) / max(episodes, 1),
+            "steps_per_worker_second": steps / busy if busy else 0.0,
+            "workers": [dict(stats) for stats in self._worker_stats],
+        }
 
     @beartype
     def shutdown(self) -> None:
         """Shutdown all environment workers and cleanup resources."""
-        pass
+        for queue in self._task_queues:
+            queue.put(None)
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._transport.close()
 
     def _worker_process(self, worker_id: int, task_queue: Queue, result_queue: Queue) -> None:
         """Worker process for generating experiences."""
-        pass
+        try:
+            self._worker_loop(worker_id, task_queue, result_queue)
+        except Exception:
+            result_queue.put(("error", worker_id, traceback.format_exc()))
+
+    def _worker_loop(self, worker_id: int, task_queue: Queue, result_queue: Queue) -> None:
+        """Serve tasks until the None sentinel arrives."""
+        self._setup_gpu_context()
+        rng = np.random.default_rng(self.worker_seeds[worker_id])
+        gridworld = self.env_factory()
+        env = VectorGridWorld(
+            gridworld,
+            num_envs=self.num_envs_per_worker,
+            augmented=self.augmented,
+            start_pos=gridworld.start_pos,
+            seed=self.worker_seeds[worker_id].spawn(1)[0]
+        )
+        transport = ReplayBufferPool.attach(self._transport_handle, writer_id=worker_id)
+        replay = None
+        if self._replay_handle is not None:
+            replay = ReplayBufferPool.attach(self._replay_handle, writer_id=worker_id)
+
+        replica = ParameterReplica()
+
+        while (message := task_queue.get()) is not None:
+            kind = message[0]
+            if kind == "params":
+                replica.apply(message[1])
+                continue
+            if kind == "reset":
+                env.reset()
+                continue
+
+            _, task_id, task_version, quota, *args = message
+            if replica.lag(task_version) > self.max_staleness:
+                raise RuntimeError(f"Task needs policy version {task_version}, worker has {replica.version}")
+            params = replica.parameters
+
+            output = transport.buffers[worker_id]
+            output.clear()
+
+            def emit(columns: dict[str, np.ndarray]) -> None:
+                # Flush full chunks to the parent, which acks once it has copied them
+                if replay is not None and kind == "replay":
+                    replay.add_columns(columns)
+                    return
+                offset, count = 0, len(columns["state"])
+                while offset < count:
+                    take = min(count - offset, output.capacity - output.size())
+                    output.add_columns({key: values[offset:offset + take] for key, values in columns.items()})
+                    offset += take
+                    if output.is_full():
+                        result_queue.put(("chunk", task_id, worker_id, output.size()))
+                        task_queue.get()  # ack
+                        output.clear()
+
+            start = time.perf_counter()
+            if kind == "episodes":
+                stats = self._run_episodes(env, params, rng, quota, args[0], emit)
+            else:
+                stats = self._run_steps(env, params, rng, quota, emit)
+            if output.size():
+                result_queue.put(("chunk", task_id, worker_id, output.size()))
+                task_queue.get()  # ack
+                output.clear()
+
+            stats["busy_seconds"] = time.perf_counter() - start
+            result_queue.put(("done", task_id, worker_id, stats))
+
+        transport.close()
+        if replay is not None:
+            replay.close()
+
+    @staticmethod
+    def _run_steps(
+        env: VectorGridWorld,
+        params: dict[str, Any],
+        rng: np.random.Generator,
+        quota: int,
+        emit: Callable[[dict[str, np.ndarray]], None]
+    ) -> dict[str, Any]:
+        """Step the lockstep environments until quota transitions are emitted.
+
+        The last step of a task advances only as many environments as
+        transitions are still needed, so every step taken is emitted and
+        the next task continues each environment's stream where it stopped.
+        """
+        env.completed_rewards.clear()
+        produced = 0
+        while produced < quota:
+            take = min(env.num_envs, quota - produced)
+            envs = None if take == env.num_envs else np.arange(take)
+            states = env.states if envs is None else env.states[envs]
+            actions = select_actions(params, states, rng, env.num_actions)
+            result = env.step(actions, envs)
+            emit({
+                "state": states,
+                "action": actions,
+                "reward": result.rewards,
+                "next_state": result.next_states,
+                "done": result.dones,
+            })
+            produced += take
+
+        finished = env.completed_rewards
+        return {"steps": produced, "episodes": len(finished), "reward_sum": float(sum(finished))}
+
+    @staticmethod
+    def _run_episodes(
+        env: VectorGridWorld,
+        params: dict[str, Any],
+        rng: np.random.Generator,
+        quota: int,
+        max_steps: int,
+        emit: Callable[[dict[str, np.ndarray]], None]
+    ) -> dict[str, Any]:
+        """Run exactly quota episodes, starting a new one in a slot only while some remain."""
+        env.max_steps = max_steps
+        env.reset()
+        active = np.arange(env.num_envs) < quota
+        started = int(active.sum())
+        steps = 0
+        reward_sum = 0.0
+
+        while active.any():
+            states = env.states
+            actions = select_actions(params, states, rng, env.num_actions)
+            result = env.step(actions)
+            emit({
+                "state": states[active],
+                "action": actions[active],
+                "reward": result.rewards[active],
+                "next_state": result.next_states[active],
+                "done": result.dones[active],
+            })
+            steps += int(active.sum())
+            reward_sum += float(result.rewards[active].sum())
+
+            # Finished slots pick up the remaining episodes, the rest go idle
+            finished = np.flatnonzero(active & (result.dones | result.truncated))
+            restart = finished[:max(0, quota - started)]
+            started += len(restart)
+            active[finished] = False
+            active[restart] = True
+
+        return {"steps": steps, "episodes": quota, "reward_sum": reward_sum}
 
     def _setup_gpu_context(self) -> None:
-        """Setup GPU context for workers if using GPU."""
-        pass
+        """Setup GPU context for workers if using GPU.
+
+        Rollouts are NumPy array operations; a worker only pins its CUDA
+        device so that torch policies evaluated in it land on that device.
+        """
+        if not self.use_gpu:
+            return
+        import torch  # Only needed when GPU workers are requested
+        torch.cuda.set_device(self.device or "cuda:0")
@@ -3,17 +3,226 @@
 from typing import Any, Optional
 from beartype import beartype
 import numpy as np
+import asyncio
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
-import pickle
-from pathlib import Path
+import struct
 import socket
 import json
+import os
+from collections import deque
+from pathlib import Path
+
+from .parameter_sync import ParameterReplica, ParameterStore, ParameterUpdate, TensorDelta
+
+# Frame prefix: request id, header length, body length
+_PREFIX = struct.Struct("<IIQ")
+
+# Arrays start on cache-line boundaries within a frame body
+_ALIGNMENT = 64
+
+# Most buffers handed to one sendmsg call (below IOV_MAX everywhere)
+_MAX_IOV = 512
+
+_METADATA_FILE = "meta.json"
+
+# Seconds a partial round of gradients may wait before it is applied anyway
+_FLUSH_INTERVAL = 1.0
+
+# 'async' applies every push on arrival, scaled down by its staleness
+AGGREGATION_METHODS = ("average", "sum", "weighted", "async")
+
+
+def _jsonable(value: Any) -> Any:
+    """Plain Python value for a JSON header (NumPy scalars become Python scalars)."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def encode_frame(request_id: int, header: dict[str, Any], arrays: dict[str, np.ndarray]) -> list[Any]:
+    """Buffers of one frame: fixed prefix, JSON header, then raw array bytes.
+
+    The header lists each array's name, dtype, shape and offset in the body.
+    Array data is passed on as views of the arrays themselves, so nothing
+    is pickled or copied before it reaches the socket.
+    """
+    descriptors = []
+    buffers = []
+    offset = 0
+    for name, array in arrays.items():
+        array = np.asarray(array)
+        if array.dtype.hasobject:
+            raise ValueError(f"Array '{name}' has object dtype and can't be framed")
+        padding = -offset % _ALIGNMENT
+        if padding:
+            buffers.append(bytes(padding))
+            offset += padding
+        descriptors.append([name, array.dtype.str, list(array.shape), offset])
+        if array.nbytes:
+            buffers.append(memoryview(np.ascontiguousarray(array).reshape(-1).view(np.uint8)))
+        offset += array.nbytes
+
+    encoded_header = json.dumps({**header, "arrays": descriptors}).encode()
+    return [_PREFIX.pack(request_id, len(encoded_header), offset), encoded_header, *buffers]
+
+
+def decode_arrays(header: dict[str, Any], body: bytes | bytearray) -> dict[str, np.ndarray]:
+    """Arrays described by a frame header, as views into its body (no copies)."""
+    arrays = {}
+    for name, dtype, shape, offset in header["arrays"]:
+        dtype = np.dtype(dtype)
+        if dtype.hasobject:
+            raise ValueError(f"Array '{name}' has object dtype")
+        count = int(np.prod(shape, dtype=np.int64))
+        if count == 0:
+            arrays[name] = np.empty(shape, dtype=dtype)
+        else:
+            arrays[name] = np.frombuffer(body, dtype=dtype, count=count, offset=offset).reshape(shape)
+    return arrays
+
+
+def encode_update(update: ParameterUpdate) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    """Frame header fields and arrays for a ParameterUpdate."""
+    arrays = {}
+    snapshot_values = {}
+    for name, value in update.snapshot.items():
+        if isinstance(value, np.ndarray):
+            arrays[f"s/{name}"] = value
+        else:
+            snapshot_values[name] = _jsonable(value)
+
+    deltas = []
+    for position, delta in enumerate(update.deltas):
+        entries = {}
+        for name, change in delta.items():
+            if not isinstance(change, TensorDelta):
+                entries[name] = ["value", _jsonable(change)]
+                continue
+            arrays[f"d{position}/{name}/values"] = change.values
+            if change.indices is not None:
+                arrays[f"d{position}/{name}/indices"] = change.indices
+            entries[name] = ["array", change.scale, change.indices is not None]
+        deltas.append(entries)
+
+    header = {
+        "version": update.version,
+        "base_version": update.base_version,
+        "snapshot_arrays": [name for name, value in update.snapshot.items() if isinstance(value, np.ndarray)],
+        "snapshot_values": snapshot_values,
+        "deltas": deltas,
+    }
+    return header, arrays
+
+
+def decode_update(header: dict[str, Any], arrays: dict[str, np.ndarray]) -> ParameterUpdate:
+    """Rebuild a ParameterUpdate from encode_update's header and arrays."""
+    snapshot = {name: arrays[f"s/{name}"] for name in header["snapshot_arrays"]}
+    snapshot.update(header["snapshot_values"])
+
+    deltas = []
+    for position, entries in enumerate(header["deltas"]):
+        delta = {}
+        for name, (kind, *fields) in entries.items():
+            if kind == "value":
+                delta[name] = fields[0]
+            else:
+                scale, sparse = fields
+                indices = arrays[f"d{position}/{name}/indices"] if sparse else None
+                delta[name] = TensorDelta(indices, arrays[f"d{position}/{name}/values"], scale)
+        deltas.append(delta)
+    return ParameterUpdate(header["version"], header["base_version"], snapshot, deltas)
+
+
+def _send_buffers(sock: socket.socket, buffers: list[Any]) -> None:
+    """Write every buffer to a blocking socket with scatter-gather sends."""
+    views = [memoryview(buffer) for buffer in buffers if len(buffer)]
+    while views:
+        sent = sock.sendmsg(views[:_MAX_IOV])
+        while views and sent >= len(views[0]):
+            sent -= len(views[0])
+            views.pop(0)
+        if sent:
+            views[0] = views[0][sent:]
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytearray:
+    """Read exactly size bytes from a blocking socket into a fresh buffer."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if not count:
+            raise ConnectionError("Connection closed by parameter server")
+        received += count
+    return buffer
+
+
+class GradientAccumulator:
+    """Running weighted sums of gradient pushes in preallocated buffers.
+
+    Each push is added in place as it arrives, so the cost is O(params) per
+    push and reading the result needs no stacking of stored gradients.
+    """
+
+    def __init__(self, shapes: dict[str, tuple[int, ...]]):
+        self.sums = {name: np.zeros(shape) for name, shape in shapes.items()}
+        self.weights = {name: 0.0 for name in shapes}
+        self.pushes = 0
+        self._scratch = {name: np.empty(shape) for name, shape in shapes.items()}
+
+    def add(self, gradients: dict[str, np.ndarray], weight: float = 1.0, scale: float = 1.0) -> None:
+        """Add weight * scale * gradients to the running sums; only weight counts toward the totals."""
+        factor = weight * scale
+        for name, gradient in gradients.items():
+            total = self.sums[name]
+            if factor == 1.0:
+                np.add(total, gradient, out=total)
+            else:
+                scratch = self._scratch[name]
+                np.multiply(gradient, factor, out=scratch)
+                np.add(total, scratch, out=total)
+            self.weights[name] += weight
+        self.pushes += 1
+
+    def scale(self, normalize: bool) -> dict[str, float]:
+        """Factor turning each sum into the aggregate (the weighted mean when normalize)."""
+        return {
+            name: (1.0 / weight if normalize else 1.0)
+            for name, weight in self.weights.items() if weight
+        }
+
+    def result(self, normalize: bool) -> dict[str, np.ndarray]:
+        """Aggregated gradients, as new arrays."""
+        return {name: self.sums[name] * factor for name, factor in self.scale(normalize).items()}
+
+    def reset(self) -> None:
+        """Zero the sums for the next round."""
+        for name, total in self.sums.items():
+            total.fill(0.0)
+            self.weights[name] = 0.0
+        self.pushes = 0
 
 
 class ParameterServer:
-    """Centralized parameter server for distributed RL training."""
+    """Centralized parameter server for distributed RL training.
+
+    Workers push gradients and pull parameters either in-process, through
+    the public methods, or over the network after start_server(): an
+    asyncio server speaking a binary framing protocol (see encode_frame),
+    one persistent connection per worker (ParameterClient). Every applied
+    update is published as a new parameter version, and pulls carry only
+    the deltas since the version a worker already has.
+
+    Pushes are accumulated in place (GradientAccumulator) and applied every
+    update_frequency pushes, or one by one with the 'async' method. A
+    push's staleness is how many versions the worker's parameters were
+    behind when it computed the gradients; 'async' (and any method with
+    staleness_weighting) scales a push by 1 / (1 + staleness). With a
+    staleness_bound the server enforces stale synchronous parallel
+    consistency: each push advances its worker's clock, and a worker more
+    than staleness_bound clocks ahead of the slowest registered worker
+    waits in its pull until the slowest catches up.
+    """
 
     @beartype
     def __init__(
@@ -22,18 +231,68 @@ class ParameterServer:
         aggregation_method: str = "average",
         update_frequency: int = 10,
         save_frequency: int = 100,
-        checkpoint_path: Optional[str] = None
+        checkpoint_path: Optional[str] = None,
+        learning_rate: float = 0.001,
+        staleness_weighting: bool = False,
+        staleness_bound: Optional[int] = None
     ):
         """Initialize parameter server.
 
         Args:
             initial_parameters: Initial policy parameters
-            aggregation_method: Method for aggregating gradients ('average', 'sum', 'weighted')
+            aggregation_method: Method for aggregating gradients ('average', 'sum',
+                'weighted', or 'async' for staleness-weighted asynchronous SGD)
             update_frequency: How often to aggregate and broadcast updates
+                (gradient pushes per update)
             save_frequency: How often to save checkpoints
             checkpoint_path: Path for saving checkpoints
+            learning_rate: Learning rate for updates triggered by pushes
+            staleness_weighting: Scale pushes by 1 / (1 + staleness) ('async' always does)
+            staleness_bound: Clocks a worker may run ahead of the slowest (SSP); None disables
         """
-        pass
+        if aggregation_method not in AGGREGATION_METHODS:
+            raise ValueError(f"aggregation_method must be one of {AGGREGATION_METHODS}, got '{aggregation_method}'")
+
+        self.parameters = {
+            name: np.array(value) if isinstance(value, np.ndarray) else value
+            for name, value in initial_parameters.items()
+        }
+        self.aggregation_method = aggregation_method
+        self.update_frequency = update_frequency
+        self.save_frequency = save_frequency
+        self.checkpoint_path = checkpoint_path
+        self.learning_rate = learning_rate
+        self.staleness_weighting = staleness_weighting or aggregation_method == "async"
+        self.staleness_bound = staleness_bound
+
+        self.parameter_store = ParameterStore()
+        self.version = self.parameter_store.publish(self.parameters)
+
+        self.workers: dict[str, dict[str, Any]] = {}
+        self._accumulator = GradientAccumulator(self._array_shapes())
+        self._pending_since = 0.0
+        self.updates_applied = 0
+        self.gradients_received = 0
+        self._staleness_sum = 0
+        self._max_staleness = 0
+        self._lock = threading.RLock()
+
+        # SSP waits: in-process pulls block on the condition, network pulls
+        # await futures resolved on the event loop
+        self._clocks_changed = threading.Condition(self._lock)
+        self._ssp_waiters: list[asyncio.Future] = []
+
+        # Network server state, set while start_server() is running
+        self.address: Optional[tuple[str, int]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._connections: set[asyncio.StreamWriter] = set()
+        self._startup_error: Optional[BaseException] = None
+
+    def _array_shapes(self) -> dict[str, tuple[int, ...]]:
+        """Shapes of the parameters gradients can be pushed for."""
+        return {name: value.shape for name, value in self.parameters.items() if isinstance(value, np.ndarray)}
 
     @beartype
     def register_worker(self, worker_id: str) -> bool:
@@ -45,7 +304,16 @@ class ParameterServer:
         Returns:
             True if registration successful
         """
-        pass
+        with self._lock:
+            if worker_id in self.workers:
+                return False
+            # Late joiners start at the slowest clock instead of holding everyone back
+            clock = min((worker["clock"] for worker in self.workers.values()), default=0)
+            # New workers count as current until their first pull
+            self.workers[worker_id] = {
+                "version": self.version, "clock": clock, "pushes": 0, "pulls": 0, "last_seen": time.time()
+            }
+            return True
 
     @beartype
     def unregister_worker(self, worker_id: str) -> bool:
@@ -57,53 +325,200 @@ class ParameterServer:
         Returns:
             True if unregistration successful
         """
-        pass
+        with self._lock:
+            removed = self.workers.pop(worker_id, None) is not None
+            if removed:
+                self._notify_clocks()
+            return removed
+
+    def _worker(self, worker_id: str) -> dict[str, Any]:
+        """Bookkeeping entry of a registered worker, touched as seen now."""
+        worker = self.workers.get(worker_id)
+        if worker is None:
+            raise KeyError(f"Worker '{worker_id}' is not registered")
+        worker["last_seen"] = time.time()
+        return worker
+
+    def _ssp_ready(self, worker_id: str) -> bool:
+        """Whether a worker is within staleness_bound clocks of the slowest worker."""
+        if self.staleness_bound is None or worker_id not in self.workers:
+            return True
+        slowest = min(worker["clock"] for worker in self.workers.values())
+        return self.workers[worker_id]["clock"] - slowest <= self.staleness_bound
+
+    def _notify_clocks(self) -> None:
+        """Wake every pull waiting for the slowest worker to advance."""
+        self._clocks_changed.notify_all()
+        waiters, self._ssp_waiters = self._ssp_waiters, []
+        for waiter in waiters:
+            waiter.get_loop().call_soon_threadsafe(lambda future=waiter: future.done() or future.set_result(None))
+
+    async def _wait_ssp(self, worker_id: str) -> None:
+        """Suspend a network pull until its worker is within the staleness bound."""
+        while True:
+            with self._lock:
+                if self._ssp_ready(worker_id):
+                    return
+                waiter = asyncio.get_running_loop().create_future()
+                self._ssp_waiters.append(waiter)
+            await waiter
 
     @beartype
     def get_parameters(self, worker_id: str) -> dict[str, Any]:
         """Get current parameters for a worker.
 
+        Under SSP this blocks while the worker is more than staleness_bound
+        clocks ahead of the slowest worker.
+
         Args:
             worker_id: Worker requesting parameters
 
         Returns:
-            Current policy parameters
+            Current policy parameters (copies)
         """
-        pass
+        with self._lock:
+            self._clocks_changed.wait_for(lambda: self._ssp_ready(worker_id))
+            worker = self._worker(worker_id)
+            worker["version"] = self.version
+            worker["pulls"] += 1
+            return {
+                name: value.copy() if isinstance(value, np.ndarray) else value
+                for name, value in self.parameters.items()
+            }
 
     @beartype
-    def push_gradients(self, worker_id: str, gradients: dict[str, np.ndarray], weight: float = 1.0) -> None:
+    def get_parameter_update(self, worker_id: str, since_version: int) -> ParameterUpdate:
+        """Get the update taking a worker's replica from since_version to the current version.
+
+        Args:
+            worker_id: Worker requesting parameters
+            since_version: Version the worker holds (0 for none)
+
+        Returns:
+            Deltas since that version, or a full snapshot
+        """
+        with self._lock:
+            worker = self._worker(worker_id)
+            worker["version"] = self.version
+            worker["pulls"] += 1
+            return self.parameter_store.update_for(since_version)
+
+    @beartype
+    def push_gradients(
+        self,
+        worker_id: str,
+        gradients: dict[str, np.ndarray],
+        weight: float = 1.0,
+        version: Optional[int] = None
+    ) -> None:
         """Receive gradients from a worker.
 
+        The push is added to the running sums (or, with 'async', applied
+        right away); once update_frequency pushes are in, the sums are
+        applied with the server's learning rate.
+
         Args:
             worker_id: Worker sending gradients
             gradients: Computed gradients
             weight: Weight for gradient aggregation
+            version: Parameter version the gradients were computed at
+                (default: the version of the worker's last pull; 0, sent
+                by clients that have not pulled yet, counts as current)
         """
-        pass
+        with self._lock:
+            for name, gradient in gradients.items():
+                parameter = self.parameters.get(name)
+                if not isinstance(parameter, np.ndarray) or parameter.shape != gradient.shape:
+                    raise ValueError(f"Gradient '{name}' {gradient.shape} does not match any parameter")
+
+            worker = self._worker(worker_id)
+            base_version = worker["version"] if version is None else version
+            staleness = max(0, self.version - base_version) if base_version else 0
+            if self.aggregation_method in ("average", "sum"):
+                weight = 1.0
+            if self.staleness_weighting:
+                weight /= 1 + staleness
+
+            worker["pushes"] += 1
+            self.gradients_received += 1
+            self._staleness_sum += staleness
+            self._max_staleness = max(self._max_staleness, staleness)
+
+            if self.aggregation_method == "async":
+                self._apply_step(gradients, self.learning_rate * weight)
+            else:
+                if not self._accumulator.pushes:
+                    self._pending_since = time.monotonic()
+                self._accumulator.add(gradients, weight)
+                if self._accumulator.pushes >= self.update_frequency:
+                    self.update_parameters(self.learning_rate)
+
+            slowest_before = min(other["clock"] for other in self.workers.values())
+            worker["clock"] += 1
+            if self.staleness_bound is not None and min(other["clock"] for other in self.workers.values()) > slowest_before:
+                self._notify_clocks()
+
+    def _apply_step(self, gradients: dict[str, np.ndarray], step_size: float) -> None:
+        """Apply one push directly: params -= step_size * gradients, then publish."""
+        for name, gradient in gradients.items():
+            scratch = self._accumulator._scratch[name]
+            np.multiply(gradient, -step_size, out=scratch)
+            np.add(self.parameters[name], scratch, out=self.parameters[name])
+        self.updates_applied += 1
+        self._after_update()
+
+    def _after_update(self) -> None:
+        """Publish the new version and checkpoint on schedule."""
+        self.broadcast_parameters()
+        if self.checkpoint_path is not None and self.updates_applied % self.save_frequency == 0:
+            self.save_checkpoint()
 
     @beartype
     def aggregate_gradients(self) -> dict[str, np.ndarray]:
         """Aggregate gradients from all workers.
 
+        Reads out the running sums (normalized for 'average'/'weighted')
+        and starts a new round.
+
         Returns:
             Aggregated gradients
         """
-        pass
+        with self._lock:
+            aggregated = self._accumulator.result(normalize=self.aggregation_method != "sum")
+            self._accumulator.reset()
+            return aggregated
 
     @beartype
     def update_parameters(self, learning_rate: float = 0.001) -> None:
         """Update global parameters using aggregated gradients.
 
+        The step is taken in place from the running sums, so an update costs
+        the same O(params) as a push and allocates nothing.
+
         Args:
             learning_rate: Learning rate for parameter updates
         """
-        pass
+        with self._lock:
+            accumulator = self._accumulator
+            if not accumulator.pushes:
+                return
+            for name, factor in accumulator.scale(normalize=self.aggregation_method != "sum").items():
+                total = accumulator.sums[name]
+                np.multiply(total, -learning_rate * factor, out=total)
+                np.add(self.parameters[name], total, out=self.parameters[name])
+            accumulator.reset()
+            self.updates_applied += 1
+            self._after_update()
 
     @beartype
     def broadcast_parameters(self) -> None:
-        """Broadcast updated parameters to all workers."""
-        pass
+        """Broadcast updated parameters to all workers.
+
+        Publishes the current parameters as a new version; workers receive
+        the deltas on their next pull.
+        """
+        with self._lock:
+            self.version = self.parameter_store.publish(self.parameters)
 
     @beartype
     def get_server_stats(self) -> dict[str, Any]:
@@ -112,60 +527,441 @@ class ParameterServer:
         Returns:
             Dictionary of server statistics
         """
-        pass
+        with self._lock:
+            return {
+                "version": self.version,
+                "num_workers": len(self.workers),
+                "workers": {worker_id: dict(worker) for worker_id, worker in self.workers.items()},
+                "updates_applied": self.updates_applied,
+                "gradients_received": self.gradients_received,
+                "pending_gradients": self._accumulator.pushes,
+                "aggregation_method": self.aggregation_method,
+                "mean_staleness": self._staleness_sum / max(self.gradients_received, 1),
+                "max_staleness": self._max_staleness,
+                "clock_spread": (
+                    max(worker["clock"] for worker in self.workers.values())
+                    - min(worker["clock"] for worker in self.workers.values())
+                ) if self.workers else 0,
+                "serving": self.address is not None,
+                "address": list(self.address) if self.address is not None else None,
+            }
+
+    def _resolve_path(self, path: Optional[str]) -> Path:
+        """Checkpoint directory from the argument or checkpoint_path."""
+        path = path if path is not None else self.checkpoint_path
+        if path is None:
+            raise ValueError("No checkpoint path given and no checkpoint_path configured")
+        return Path(path)
 
     @beartype
     def save_checkpoint(self, path: Optional[str] = None) -> None:
         """Save current parameters and server state.
 
+        The checkpoint is a directory with one .npy file per parameter array
+        and a JSON header, replaced atomically after the arrays are written.
+
         Args:
             path: Path to save checkpoint, uses default if None
         """
-        pass
+        directory = self._resolve_path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            names = [name for name, value in self.parameters.items() if isinstance(value, np.ndarray)]
+            for index, name in enumerate(names):
+                np.save(directory / f"param_{index}.npy", self.parameters[name])
+            meta = {
+                "format_version": 1,
+                "version": self.version,
+                "updates_applied": self.updates_applied,
+                "aggregation_method": self.aggregation_method,
+                "arrays": names,
+                "values": {
+                    name: _jsonable(value) for name, value in self.parameters.items()
+                    if not isinstance(value, np.ndarray)
+                },
+            }
+
+        temp_path = directory / (_METADATA_FILE + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(temp_path, directory / _METADATA_FILE)
 
     @beartype
     def load_checkpoint(self, path: str) -> None:
         """Load parameters and server state from checkpoint.
 
+        The loaded parameters are published as a new version, so connected
+        workers pick them up on their next pull.
+
         Args:
             path: Path to load checkpoint from
         """
-        pass
+        directory = Path(path)
+        meta_path = directory / _METADATA_FILE
+        if not meta_path.exists():
+            raise FileNotFoundError(f"No parameter checkpoint in {directory}")
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+        parameters = {name: np.load(directory / f"param_{index}.npy") for index, name in enumerate(meta["arrays"])}
+        parameters.update(meta["values"])
+        with self._lock:
+            self.parameters = parameters
+            self.updates_applied = meta["updates_applied"]
+            self._accumulator = GradientAccumulator(self._array_shapes())
+            self.broadcast_parameters()
 
     @beartype
     def start_server(self, host: str = "localhost", port: int = 8888) -> None:
         """Start parameter server for network communication.
 
+        The asyncio server runs on a background thread; this returns once
+        it is listening. The bound address is in self.address (pass port 0
+        for any free port).
+
         Args:
             host: Host address to bind to
             port: Port to listen on
         """
-        pass
+        if self._thread is not None:
+            raise RuntimeError(f"Parameter server is already serving on {self.address}")
+
+        ready = threading.Event()
+        self._startup_error = None
+        self._thread = threading.Thread(target=asyncio.run, args=(self._serve(host, port, ready),), daemon=True)
+        self._thread.start()
+        ready.wait()
+        if self._startup_error is not None:
+            self._thread.join()
+            self._thread = None
+            raise self._startup_error
 
     @beartype
     def stop_server(self) -> None:
         """Stop parameter server."""
-        pass
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stop_event.set)
+        self._thread.join()
+        self._thread = None
+        self._loop = None
+        self.address = None
+
+    async def _serve(self, host: str, port: int, ready: threading.Event) -> None:
+        """Accept connections until stop_server() is called."""
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        try:
+            server = await asyncio.start_server(self._handle_client_connection, host, port)
+        except OSError as error:
+            self._startup_error = error
+            ready.set()
+            return
+
+        self.address = server.sockets[0].getsockname()[:2]
+        flusher = asyncio.create_task(self._periodic_update_loop())
+        ready.set()
+
+        await self._stop_event.wait()
+        flusher.cancel()
+        server.close()
+        for writer in list(self._connections):
+            writer.close()
+        await server.wait_closed()
+
+    async def _handle_client_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one persistent worker connection.
+
+        Requests are handled in arrival order and replies are written
+        without waiting for the client, so a worker can pipeline pushes
+        and pulls over the one connection.
+        """
+        client_socket = writer.get_extra_info("socket")
+        if client_socket is not None:
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._connections.add(writer)
+        worker_id = None
+        try:
+            while True:
+                try:
+                    prefix = await reader.readexactly(_PREFIX.size)
+                except asyncio.IncompleteReadError:
+                    break
+                request_id, header_size, body_size = _PREFIX.unpack(prefix)
+                raw_header = await reader.readexactly(header_size)
+                body = await reader.readexactly(body_size) if body_size else b""
+
+                # The whole frame has been read, so any failure below is
+                # answered with an error frame and the connection stays usable
+                try:
+                    header = json.loads(raw_header)
+                    if not isinstance(header, dict):
+                        raise ValueError("Request header must be a JSON object")
+                    if header["op"] == "register":
+                        if worker_id is not None:
+                            raise ValueError(f"Connection is already registered as '{worker_id}'")
+                        registered = self.register_worker(str(header["worker_id"]))
+                        if registered:
+                            worker_id = str(header["worker_id"])
+                        reply_header, reply_arrays = {"op": "ok", "registered": registered, "version": self.version}, {}
+                    else:
+                        if header["op"] == "pull" and worker_id is not None:
+                            await self._wait_ssp(worker_id)
+                        reply_header, reply_arrays = self._handle_request(worker_id, header, body)
+                except Exception as error:
+                    reply_header, reply_arrays = {"op": "error", "message": f"{type(error).__name__}: {error}"}, {}
+
+                writer.writelines(encode_frame(request_id, reply_header, reply_arrays))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if worker_id is not None:
+                self.unregister_worker(worker_id)
+            self._connections.discard(writer)
+            writer.close()
+
+    def _handle_request(
+        self,
+        worker_id: Optional[str],
+        header: dict[str, Any],
+        body: bytes
+    ) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+        """Run one request and return the reply's header and arrays."""
+        op = header["op"]
+        # Control requests, allowed on unregistered connections
+        if op == "stats":
+            return {"op": "stats", "stats": self.get_server_stats()}, {}
+        if op == "checkpoint":
+            self.save_checkpoint(header.get("path"))
+            return {"op": "ok", "version": self.version}, {}
+        if op == "load_checkpoint":
+            self.load_checkpoint(header["path"])
+            return {"op": "ok", "version": self.version}, {}
+
+        if worker_id is None:
+            raise KeyError("Connection must register a worker first")
+        if op == "push":
+            version = header.get("version")
+            version = None if version is None else int(version)
+            self.push_gradients(worker_id, decode_arrays(header, body), float(header.get("weight", 1.0)), version)
+            return {"op": "ok", "version": self.version}, {}
+        if op == "pull":
+            update = self.get_parameter_update(worker_id, int(header.get("version", 0)))
+            if update.snapshot:
+                # The reply may sit in the transport's buffer while later pushes
+                # update the store's arrays in place
+                update = update._replace(snapshot={
+                    name: value.copy() if isinstance(value, np.ndarray) else value
+                    for name, value in update.snapshot.items()
+                })
+            update_header, arrays = encode_update(update)
+            return {"op": "params", **update_header}, arrays
+        raise ValueError(f"Unknown request '{op}'")
 
     def _aggregate_average(self, gradients_list: list[dict[str, np.ndarray]]) -> dict[str, np.ndarray]:
         """Aggregate gradients using averaging."""
-        pass
+        return self._aggregate_weighted(gradients_list, [1.0] * len(gradients_list))
 
     def _aggregate_weighted(self, gradients_list: list[dict[str, np.ndarray]], weights: list[float]) -> dict[str, np.ndarray]:
         """Aggregate gradients using weighted averaging."""
-        pass
+        accumulator = GradientAccumulator(self._array_shapes())
+        for gradients, weight in zip(gradients_list, weights):
+            accumulator.add(gradients, weight)
+        return accumulator.result(normalize=True)
+
+    async def _periodic_update_loop(self) -> None:
+        """Periodic loop for parameter updates and broadcasts.
+
+        Applies a partial round of gradients once it has waited longer than
+        _FLUSH_INTERVAL, so a few slow workers can't hold updates back.
+        """
+        while True:
+            await asyncio.sleep(_FLUSH_INTERVAL)
+            with self._lock:
+                if self._accumulator.pushes and time.monotonic() - self._pending_since >= _FLUSH_INTERVAL:
+                    self.update_parameters(self.learning_rate)
+
 
-    def _handle_client_connection(self, client_socket: socket.socket, address: tuple) -> None:
-        """Handle client connection for network communication."""
-        pass
+class ParameterClient:
+    """A worker's persistent, pipelined connection to a ParameterServer.
 
-    def _periodic_update_loop(self) -> None:
-        """Periodic loop for parameter updates and broadcasts."""
-        pass
+    Gradient pushes are sent without waiting for their acknowledgement (up
+    to max_in_flight outstanding requests); pulls wait for their reply and
+    keep a local replica of the parameters that is patched with deltas.
+    An error from a pipelined push is raised by the call that reads its
+    reply. A client without a worker_id is a control connection: it can
+    read stats and trigger checkpoints but not push or pull.
+    """
+
+    @beartype
+    def __init__(
+        self,
+        worker_id: Optional[str],
+        host: str = "localhost",
+        port: int = 8888,
+        max_in_flight: int = 32,
+        timeout: Optional[float] = None
+    ):
+        """Connect and register with the server.
+
+        Args:
+            worker_id: Unique identifier for this worker (None for a control connection)
+            host: Server host
+            port: Server port
+            max_in_flight: Pipelined requests allowed before waiting for replies
+            timeout: Socket timeout in seconds (None blocks)
+        """
+        self.worker_id = worker_id
+        self.max_in_flight = max_in_flight
+        self.replica = ParameterReplica()
+        self.server_version = 0
+
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._next_request_id = 0
+        self._in_flight: deque[int] = deque()
+
+        if worker_id is None:
+            return
+        reply, _ = self._request({"op": "register", "worker_id": worker_id})
+        if not reply["registered"]:
+            self.close()
+            raise ValueError(f"Worker '{worker_id}' is already registered")
+
+    def _send(self, header: dict[str, Any], arrays: Optional[dict[str, np.ndarray]] = None) -> None:
+        """Send one request frame without waiting for its reply."""
+        request_id = self._next_request_id
+        self._next_request_id = (request_id + 1) & 0xFFFFFFFF
+        _send_buffers(self._sock, encode_frame(request_id, header, arrays or {}))
+        self._in_flight.append(request_id)
+
+    def _receive(self) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+        """Read the reply to the oldest outstanding request."""
+        request_id, header_size, body_size = _PREFIX.unpack(_recv_exactly(self._sock, _PREFIX.size))
+        header = json.loads(_recv_exactly(self._sock, header_size))
+        body = _recv_exactly(self._sock, body_size)
+        expected = self._in_flight.popleft()
+        if request_id != expected:
+            raise ConnectionError(f"Reply to request {request_id} arrived, expected {expected}")
+        if header["op"] == "error":
+            raise RuntimeError(f"Parameter server error: {header['message']}")
+        if "version" in header:
+            self.server_version = max(self.server_version, header["version"])
+        return header, decode_arrays(header, body)
+
+    def _request(
+        self,
+        header: dict[str, Any],
+        arrays: Optional[dict[str, np.ndarray]] = None
+    ) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+        """Send a request and return its reply, draining earlier pipelined replies first."""
+        self._send(header, arrays)
+        while len(self._in_flight) > 1:
+            self._receive()
+        return self._receive()
+
+    @beartype
+    def push_gradients(self, gradients: dict[str, np.ndarray], weight: float = 1.0) -> None:
+        """Send gradients, waiting only if max_in_flight requests are outstanding.
+
+        Args:
+            gradients: Computed gradients
+            weight: Weight for gradient aggregation
+        """
+        self._send({"op": "push", "weight": weight, "version": self.replica.version}, gradients)
+        while len(self._in_flight) > self.max_in_flight:
+            self._receive()
+
+    @beartype
+    def pull(self) -> ParameterUpdate:
+        """Bring the local replica up to the server's current version.
+
+        Returns:
+            The update that was applied
+        """
+        self.request_pull()
+        return self.complete_pull()
+
+    @beartype
+    def request_pull(self) -> None:
+        """Send a pull without waiting, so pulls to several servers overlap."""
+        self._send({"op": "pull", "version": self.replica.version})
+
+    @beartype
+    def complete_pull(self) -> ParameterUpdate:
+        """Read the reply to request_pull() and apply it to the replica."""
+        while len(self._in_flight) > 1:
+            self._receive()
+        header, arrays = self._receive()
+        update = decode_update(header, arrays)
+        self.replica.apply(update)
+        return update
+
+    @beartype
+    def save_checkpoint(self, path: Optional[str] = None, wait: bool = True) -> None:
+        """Have the server save a checkpoint (to its checkpoint_path if None).
+
+        With wait=False the request is only sent; flush() waits for it, so
+        several servers can save at the same time.
+        """
+        self._send({"op": "checkpoint", "path": path})
+        if wait:
+            self.flush()
+
+    @beartype
+    def load_checkpoint(self, path: str, wait: bool = True) -> None:
+        """Have the server load a checkpoint (see save_checkpoint for wait)."""
+        self._send({"op": "load_checkpoint", "path": path})
+        if wait:
+            self.flush()
+
+    @beartype
+    def get_parameters(self) -> dict[str, Any]:
+        """Pull and return the current parameters (the replica's own arrays)."""
+        self.pull()
+        return self.replica.parameters
+
+    @beartype
+    def flush(self) -> None:
+        """Wait for the replies to every outstanding request."""
+        while self._in_flight:
+            self._receive()
+
+    @beartype
+    def get_server_stats(self) -> dict[str, Any]:
+        """Get the server's statistics."""
+        header, _ = self._request({"op": "stats"})
+        return header["stats"]
+
+    @beartype
+    def close(self) -> None:
+        """Wait for outstanding replies and close the connection."""
+        try:
+            self.flush()
+        finally:
+            self._sock.close()
+
+    def __enter__(self) -> "ParameterClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
 
 class FederatedParameterServer(ParameterServer):
-    """Federated learning parameter server with privacy considerations."""
+    """Federated learning parameter server with privacy considerations.
+
+    Workers send model updates (their local parameters minus the global
+    ones) instead of gradients. Each update is validated and folded into
+    running weighted sums as it arrives, so memory stays O(params) however
+    many workers report. Once min_workers_for_update distinct workers
+    have contributed, the weighted mean update is applied and published.
+    With differential_privacy, updates are clipped to clip_norm and the
+    summed update gets Gaussian noise of standard deviation
+    noise_scale * clip_norm * (largest weight in the round) before it is
+    averaged (the Gaussian mechanism of DP-FedAvg).
+    """
 
     @beartype
     def __init__(
@@ -174,6 +970,9 @@ class FederatedParameterServer(ParameterServer):
         min_workers_for_update: int = 2,
         differential_privacy: bool = False,
         noise_scale: float = 0.1,
+        clip_norm: float = 1.0,
+        max_update_norm: Optional[float] = None,
+        seed: Optional[int] = None,
         **kwargs
     ):
         """Initialize federated parameter server.
@@ -183,43 +982,234 @@ class FederatedParameterServer(ParameterServer):
             min_workers_for_update: Minimum workers needed before updating
             differential_privacy: Whether to use differential privacy
             noise_scale: Scale of noise for differential privacy
+                (noise multiplier relative to clip_norm)
+            clip_norm: L2 norm updates are clipped to under differential privacy
+            max_update_norm: Updates with a larger L2 norm are rejected (None disables)
+            seed: Seed for the privacy noise
             **kwargs: Additional arguments for ParameterServer
+                (learning_rate defaults to 1.0, plain FedAvg)
         """
-        pass
+        kwargs.setdefault("learning_rate", 1.0)
+        super().__init__(initial_parameters, **kwargs)
+        self.min_workers_for_update = min_workers_for_update
+        self.differential_privacy = differential_privacy
+        self.noise_scale = noise_scale
+        self.clip_norm = clip_norm
+        self.max_update_norm = max_update_norm
+        self.rng = np.random.default_rng(seed)
+
+        self._round_workers: set[str] = set()
+        self._round_max_weight = 0.0
+        self.rounds_completed = 0
+        self.rejected_updates = 0
+
+    def _update_norm(self, update: dict[str, np.ndarray]) -> Optional[float]:
+        """L2 norm of a well-formed update, None if it is malformed or not finite.
+
+        One dot product per array gives its squared norm, and is NaN or
+        infinite exactly when the array holds a NaN or infinity, so a
+        single pass over the data does both checks.
+        """
+        shapes = self._array_shapes()
+        if update.keys() != shapes.keys():
+            return None
+        squared = 0.0
+        for name, values in update.items():
+            if values.shape != shapes[name] or not np.issubdtype(values.dtype, np.floating):
+                return None
+            flat = values.reshape(-1)
+            squared += float(np.dot(flat, flat))
+        if not np.isfinite(squared):
+            return None
+        return float(np.sqrt(squared))
 
     @beartype
-    def federated_averaging(self, worker_updates: dict[str, dict[str, np.ndarray]]) -> dict[str, np.ndarray]:
-        """Perform federated averaging of worker updates.
+    def validate_worker_update(self, worker_id: str, update: dict[str, np.ndarray]) -> bool:
+        """Validate worker update for security and correctness.
+
+        The worker must be registered and not yet have contributed to the
+        current round; the update must cover every parameter array with the
+        right shape and a float dtype, be finite, and stay within
+        max_update_norm.
 
         Args:
-            worker_updates: Dictionary mapping worker IDs to their parameter updates
+            worker_id: Worker ID
+            update: Parameter update to validate
 
         Returns:
-            Federated averaged parameters
+            True if update is valid
         """
-        pass
+        return self._validated_norm(worker_id, update) is not None
+
+    def _validated_norm(self, worker_id: str, update: dict[str, np.ndarray]) -> Optional[float]:
+        """Norm of an update that passes validate_worker_update, else None."""
+        with self._lock:
+            if worker_id not in self.workers or worker_id in self._round_workers:
+                return None
+        norm = self._update_norm(update)
+        if norm is None or (self.max_update_norm is not None and norm > self.max_update_norm):
+            return None
+        return norm
 
     @beartype
-    def add_differential_privacy_noise(self, parameters: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
-        """Add differential privacy noise to parameters.
+    def submit_update(self, worker_id: str, update: dict[str, np.ndarray], weight: float = 1.0) -> bool:
+        """Validate an update and fold it into the current round.
 
         Args:
-            parameters: Parameters to add noise to
+            worker_id: Worker sending the update
+            update: Local parameters minus the global parameters
+            weight: Weight in the average, e.g. the worker's sample count
 
         Returns:
-            Parameters with added noise
+            True if the update was accepted
         """
-        pass
+        with self._lock:
+            norm = self._validated_norm(worker_id, update)
+            if norm is None:
+                self.rejected_updates += 1
+                return False
+            scale = 1.0
+            if self.differential_privacy and norm > self.clip_norm:
+                scale = self.clip_norm / norm
+
+            worker = self._worker(worker_id)
+            worker["pushes"] += 1
+            self.gradients_received += 1
+            self._accumulator.add(update, weight, scale)
+            self._round_workers.add(worker_id)
+            self._round_max_weight = max(self._round_max_weight, weight)
+            if len(self._round_workers) >= self.min_workers_for_update:
+                self.update_parameters(self.learning_rate)
+            return True
 
     @beartype
-    def validate_worker_update(self, worker_id: str, update: dict[str, np.ndarray]) -> bool:
-        """Validate worker update for security and correctness.
+    def push_gradients(
+        self,
+        worker_id: str,
+        gradients: dict[str, np.ndarray],
+        weight: float = 1.0,
+        version: Optional[int] = None
+    ) -> None:
+        """Receive a model update from a worker (network pushes arrive here).
 
         Args:
-            worker_id: Worker ID
-            update: Parameter update to validate
+            worker_id: Worker sending the update
+            gradients: Local parameters minus the global parameters
+            weight: Weight in the average
+            version: Parameter version the update started from (unused)
+        """
+        if not self.submit_update(worker_id, gradients, weight):
+            raise ValueError(f"Update from worker '{worker_id}' was rejected")
+
+    @beartype
+    def update_parameters(self, learning_rate: float = 1.0) -> None:
+        """Finish the current round if enough workers have contributed.
+
+        Args:
+            learning_rate: Server step size on the averaged update
+        """
+        with self._lock:
+            if len(self._round_workers) < self.min_workers_for_update:
+                return
+            accumulator = self._accumulator
+            if self.differential_privacy:
+                self.add_differential_privacy_noise(
+                    accumulator.sums, self.noise_scale * self.clip_norm * self._round_max_weight
+                )
+            for name, factor in accumulator.scale(normalize=True).items():
+                total = accumulator.sums[name]
+                np.multiply(total, learning_rate * factor, out=total)
+                np.add(self.parameters[name], total, out=self.parameters[name])
+
+            accumulator.reset()
+            self._round_workers.clear()
+            self._round_max_weight = 0.0
+            self.rounds_completed += 1
+            self.updates_applied += 1
+            self._after_update()
+
+    @beartype
+    def federated_averaging(
+        self,
+        worker_updates: dict[str, dict[str, np.ndarray]],
+        weights: Optional[dict[str, float]] = None
+    ) -> dict[str, np.ndarray]:
+        """Perform federated averaging of worker updates.
+
+        Updates are folded in one at a time exactly as if they had been
+        submitted, then finished as one round whatever its size; invalid
+        updates are left out. Unknown workers are registered only for the
+        round, so they neither hold back SSP pulls nor count as workers.
+
+        Args:
+            worker_updates: Dictionary mapping worker IDs to their parameter updates
+            weights: Weight of each worker (default 1.0)
 
         Returns:
-            True if update is valid
+            Federated averaged parameters (the server's own arrays)
+        """
+        with self._lock:
+            min_workers = self.min_workers_for_update
+            added = []
+            try:
+                self.min_workers_for_update = len(self._round_workers) + len(worker_updates) + 1
+                for worker_id, update in worker_updates.items():
+                    if self.register_worker(worker_id):
+                        added.append(worker_id)
+                    self.submit_update(worker_id, update, (weights or {}).get(worker_id, 1.0))
+                self.min_workers_for_update = 1
+                self.update_parameters(self.learning_rate)
+            finally:
+                self.min_workers_for_update = min_workers
+                for worker_id in added:
+                    self.unregister_worker(worker_id)
+            return {name: value for name, value in self.parameters.items() if isinstance(value, np.ndarray)}
+
+    @beartype
+    def add_differential_privacy_noise(
+        self,
+        parameters: dict[str, np.ndarray],
+        std: Optional[float] = None
+    ) -> dict[str, np.ndarray]:
+        """Add differential privacy noise to parameters.
+
+        Gaussian noise is drawn straight into preallocated scratch buffers
+        and added in place, so no temporary arrays are created.
+
+        Args:
+            parameters: Parameters to add noise to (modified in place)
+            std: Noise standard deviation (default noise_scale * clip_norm)
+
+        Returns:
+            Parameters with added noise
         """
-        pass
+        std = self.noise_scale * self.clip_norm if std is None else std
+        for name, values in parameters.items():
+            scratch = self._accumulator._scratch.get(name)
+            if scratch is None or scratch.shape != values.shape:
+                scratch = np.empty(values.shape)
+            self.rng.standard_normal(out=scratch)
+            scratch *= std
+            np.add(values, scratch, out=values)
+        return parameters
+
+    @beartype
+    def get_server_stats(self) -> dict[str, Any]:
+        """Get parameter server statistics, including federated round progress."""
+        with self._lock:
+            stats = super().get_server_stats()
+            stats.update({
+                "rounds_completed": self.rounds_completed,
+                "round_workers": len(self._round_workers),
+                "rejected_updates": self.rejected_updates,
+                "differential_privacy": self.differential_privacy,
+            })
+            return stats
+
+    @beartype
+    def load_checkpoint(self, path: str) -> None:
+        """Load parameters from checkpoint, discarding the round in progress."""
+        with self._lock:
+            super().load_checkpoint(path)
+            self._round_workers.clear()
+            self._round_max_weight = 0.0
@@ -0,0 +1,226 @@
+"""Versioned policy parameter snapshots and delta-compressed broadcasts."""
+
+from collections import deque
+from typing import Any, NamedTuple, Optional
+from beartype import beartype
+import numpy as np
+
+from gridworld.algorithms.base_algorithm import BaseAlgorithm
+
+# A delta lists changed entries by flat index while at most this fraction changed
+SPARSE_FRACTION = 0.25
+
+# Largest magnitude of an 8-bit quantized difference
+_QUANT_LEVELS = 127
+
+
+class TensorDelta(NamedTuple):
+    """Change to one parameter array between two consecutive versions."""
+    indices: Optional[np.ndarray]  # flat indices of the changed entries, None for every entry
+    values: np.ndarray  # new values, or int8 differences when scale is set
+    scale: Optional[float]  # step of the quantized differences, None for exact values
+
+
+class ParameterUpdate(NamedTuple):
+    """What a replica at base_version needs to reach version."""
+    version: int
+    base_version: int
+    snapshot: dict[str, Any]  # full parameters when the replica can't be patched
+    deltas: list[dict[str, Any]]  # per-version changes, base_version + 1 .. version
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate payload size in bytes."""
+        total = sum(np.asarray(value).nbytes for value in self.snapshot.values())
+        for delta in self.deltas:
+            for change in delta.values():
+                if isinstance(change, TensorDelta):
+                    total += change.values.nbytes + (change.indices.nbytes if change.indices is not None else 0)
+                else:
+                    total += np.asarray(change).nbytes
+        return total
+
+
+def _apply_change(parameters: dict[str, Any], name: str, change: Any) -> None:
+    """Apply one entry of a version delta in place.
+
+    ParameterStore applies its own deltas with this too, so the store's
+    reference copy and every replica stay bit-for-bit equal.
+    """
+    if not isinstance(change, TensorDelta):
+        parameters[name] = change
+    elif change.scale is None and change.indices is None:
+        current = parameters.get(name)
+        if isinstance(current, np.ndarray) and current.shape == change.values.shape and current.dtype == change.values.dtype:
+            np.copyto(current, change.values)
+        else:
+            parameters[name] = change.values.copy()
+    else:
+        flat = parameters[name].reshape(-1)
+        values = change.values
+        if change.scale is not None:
+            values = values.astype(flat.dtype) * flat.dtype.type(change.scale)
+        target = slice(None) if change.indices is None else change.indices
+        if change.scale is None:
+            flat[target] = values
+        else:
+            flat[target] += values
+
+
+class ParameterStore:
+    """Publisher side: numbered parameter versions and the deltas between them.
+
+    publish() compares new parameters with the last published ones and
+    records only the arrays (or entries) that changed. update_for() turns
+    the recorded deltas into the cheapest update for a replica at some
+    older version: nothing, a chain of deltas, or a full snapshot once the
+    replica lags behind the kept history. History is also cut back to no
+    more bytes than one snapshot, since a longer chain would never be sent.
+    """
+
+    @beartype
+    def __init__(self, history: int = 16, quantize: bool = False, tolerance: float = 0.0):
+        """Initialize parameter store.
+
+        Args:
+            history: Number of version deltas kept for patching replicas
+            quantize: Send float differences as int8 with a per-array scale
+            tolerance: Float entries that moved by at most this much count as unchanged
+        """
+        self.quantize = quantize
+        self.tolerance = tolerance
+        self.version = 0
+        # What replicas at self.version hold; differs from the published
+        # values by the quantization residual until it exceeds tolerance
+        self._reference: dict[str, Any] = {}
+        self._history: deque[tuple[int, dict[str, Any], int]] = deque(maxlen=history)
+        self._history_bytes = 0
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        """Parameters of the current version, as replicas see them."""
+        return self._reference
+
+    def _diff(self, reference: np.ndarray, value: np.ndarray) -> Optional[TensorDelta]:
+        """Delta taking reference to value, or None when nothing changed."""
+        old, new = reference.reshape(-1), value.reshape(-1)
+        floating = np.issubdtype(new.dtype, np.floating)
+        if floating and self.tolerance > 0:
+            mask = np.abs(new - old) > self.tolerance
+        else:
+            mask = old != new
+        count = np.count_nonzero(mask)
+        if not count:
+            return None
+
+        dense = count > SPARSE_FRACTION * new.size
+        indices = None if dense else np.flatnonzero(mask)
+        if not (self.quantize and floating):
+            return TensorDelta(indices, value.copy() if dense else new[indices], None)
+
+        difference = new - old if dense else new[indices] - old[indices]
+        scale = float(np.abs(difference).max()) / _QUANT_LEVELS
+        quantized = np.rint(difference / scale).astype(np.int8)
+        return TensorDelta(indices, quantized, scale)
+
+    @beartype
+    def publish(self, parameters: dict[str, Any]) -> int:
+        """Record parameters as a new version if anything changed; returns the current version."""
+        delta: dict[str, Any] = {}
+        for name, value in parameters.items():
+            reference = self._reference.get(name)
+            if not isinstance(value, np.ndarray):
+                if name not in self._reference or not np.array_equal(reference, value):
+                    delta[name] = value
+            elif not isinstance(reference, np.ndarray) or reference.shape != value.shape or reference.dtype != value.dtype:
+                delta[name] = TensorDelta(None, value.copy(), None)
+            elif (change := self._diff(reference, value)) is not None:
+                delta[name] = change
+
+        if not delta:
+            return self.version
+        for name, change in delta.items():
+            _apply_change(self._reference, name, change)
+        self.version += 1
+
+        if len(self._history) == self._history.maxlen:
+            self._history_bytes -= self._history[0][2]
+        delta_bytes = ParameterUpdate(self.version, self.version - 1, {}, [delta]).nbytes
+        self._history.append((self.version, delta, delta_bytes))
+        self._history_bytes += delta_bytes
+        snapshot_bytes = ParameterUpdate(self.version, 0, self._reference, []).nbytes
+        while len(self._history) > 1 and self._history_bytes > snapshot_bytes:
+            self._history_bytes -= self._history.popleft()[2]
+        return self.version
+
+    @beartype
+    def update_for(self, version: int) -> ParameterUpdate:
+        """Update bringing a replica at version to the current version."""
+        if version == self.version:
+            return ParameterUpdate(self.version, version, {}, [])
+        oldest_base = self._history[0][0] - 1 if self._history else self.version
+        if version <= 0 or version < oldest_base or version > self.version:
+            return ParameterUpdate(self.version, 0, self._reference, [])
+        deltas = [delta for delta_version, delta, _ in self._history if delta_version > version]
+        return ParameterUpdate(self.version, version, {}, deltas)
+
+
+class ParameterReplica:
+    """Subscriber side: the parameters of one version, patched forward by updates."""
+
+    def __init__(self):
+        self.version = 0
+        self.parameters: dict[str, Any] = {}
+
+    @beartype
+    def lag(self, latest_version: int) -> int:
+        """Versions this replica is behind latest_version."""
+        return latest_version - self.version
+
+    @beartype
+    def apply(self, update: ParameterUpdate) -> None:
+        """Move to update.version, from a snapshot or by applying its deltas in order."""
+        if update.snapshot:
+            self.parameters = {
+                name: value.copy() if isinstance(value, np.ndarray) else value
+                for name, value in update.snapshot.items()
+            }
+        elif update.base_version != self.version:
+            raise ValueError(f"Update patches version {update.base_version}, replica is at {self.version}")
+        for delta in update.deltas:
+            for name, change in delta.items():
+                _apply_change(self.parameters, name, change)
+        self.version = update.version
+
+
+@beartype
+def policy_parameters(algorithm: BaseAlgorithm) -> dict[str, Any]:
+    """Arrays a worker needs to act like algorithm's behaviour policy.
+
+    Q-table learners ship their Q-values and epsilon, REINFORCE its softmax
+    weights, anything else its greedy action table from get_policy().
+    """
+    if hasattr(algorithm, "q_values"):
+        return {"q_values": algorithm.q_values, "epsilon": float(algorithm.epsilon)}
+    if hasattr(algorithm, "policy_net"):
+        return {"W": algorithm.policy_net.W, "b": algorithm.policy_net.b}
+    policy = algorithm.get_policy()
+    if policy is None:
+        return {}
+    return {"policy": np.asarray(policy, dtype=np.int64), "epsilon": float(getattr(algorithm, "epsilon", 0.0))}
+
+
+@beartype
+def load_policy_parameters(algorithm: BaseAlgorithm, parameters: dict[str, Any]) -> None:
+    """Write parameters from policy_parameters() back into algorithm, in place where possible."""
+    if "q_values" in parameters:
+        algorithm.q_values[...] = parameters["q_values"]
+    if "W" in parameters:
+        algorithm.policy_net.W[...] = parameters["W"]
+        algorithm.policy_net.b[...] = parameters["b"]
+    if "policy" in parameters:
+        if not hasattr(algorithm, "policy"):
+            raise ValueError(f"{type(algorithm).__name__} has no policy table to load")
+        algorithm.policy[...] = parameters["policy"]
+    if "epsilon" in parameters and hasattr(algorithm, "epsilon"):
+        algorithm.epsilon = parameters["epsilon"]
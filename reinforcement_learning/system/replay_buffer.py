@@ -1,60 +1,211 @@
 """Replay buffer pool for distributed experience storage and sampling."""
 
-from typing import Any, Optional
+from typing import Any, NamedTuple, Optional
 from beartype import beartype
 import numpy as np
-from collections import deque
-import threading
-import pickle
+from multiprocessing import shared_memory
+import json
+import os
 from pathlib import Path
 
 
 class ReplayBuffer:
-    """Single replay buffer for storing experiences."""
+    """Single replay buffer for storing experiences.
+
+    Experiences are stored column-wise: one preallocated NumPy array of
+    shape (capacity, *value_shape) per experience key, written as a ring.
+    Column dtypes and shapes are taken from the first experience added,
+    unless columns are preassigned (as ReplayBufferPool does with views
+    into shared memory). Once full, new experiences overwrite the oldest
+    ones.
+    """
 
     @beartype
-    def __init__(self, capacity: int, experience_keys: list[str]):
+    def __init__(self, capacity: int, experience_keys: list[str], seed: Optional[int] = None):
         """Initialize replay buffer.
 
         Args:
             capacity: Maximum number of experiences to store
             experience_keys: Keys for experience dictionary (e.g., ['state', 'action', 'reward'])
+            seed: Seed for the sampling random stream
         """
-        pass
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.experience_keys = list(experience_keys)
+        self.columns: dict[str, np.ndarray] = {}
+        self.rng = np.random.default_rng(seed)
+
+        # Rows ever written and times cleared; one-element arrays so they can live in shared memory
+        self._written = np.zeros(1, dtype=np.int64)
+        self._clears = np.zeros(1, dtype=np.int64)
+
+    @property
+    def _position(self) -> int:
+        """Next slot to write."""
+        return int(self._written[0] % self.capacity)
+
+    @property
+    def _size(self) -> int:
+        """Number of valid rows."""
+        return int(min(self._written[0], self.capacity))
+
+    def _allocate(self, columns: dict[str, np.ndarray]) -> None:
+        """Preallocate one column per key from a batch of example rows."""
+        for key in self.experience_keys:
+            example = columns[key]
+            self.columns[key] = np.zeros((self.capacity, *example.shape[1:]), dtype=example.dtype)
+
+    def _next_slots(self, count: int) -> np.ndarray:
+        """Ring slots the next add_columns of count rows writes, oldest row first."""
+        written = min(count, self.capacity)
+        return (self._position + count - written + np.arange(written)) % self.capacity
 
     @beartype
     def add(self, experience: dict[str, Any]) -> None:
         """Add a single experience to the buffer."""
-        pass
+        if not self.columns:
+            self._allocate({key: np.asarray([experience[key]]) for key in self.experience_keys})
+
+        position = self._position
+        for key in self.experience_keys:
+            self.columns[key][position] = experience[key]
+        self._written[0] += 1
 
     @beartype
     def add_batch(self, experiences: list[dict[str, Any]]) -> None:
         """Add a batch of experiences to the buffer."""
-        pass
+        if experiences:
+            self.add_columns({key: np.asarray([e[key] for e in experiences]) for key in self.experience_keys})
+
+    @beartype
+    def add_columns(self, columns: dict[str, np.ndarray]) -> None:
+        """Add a batch given as one array per key, with equal first dimensions.
+
+        Written as at most two slice assignments per column (the second one
+        when the batch wraps around the end of the ring). The row count is
+        published after the rows, so a single writer needs no lock.
+        """
+        count = len(columns[self.experience_keys[0]])
+        if count == 0:
+            return
+        if not self.columns:
+            self._allocate(columns)
+
+        # Only the newest capacity rows of an oversized batch survive
+        skip = max(0, count - self.capacity)
+        start = (self._position + skip) % self.capacity
+        written = count - skip
+        head = min(written, self.capacity - start)
+
+        for key in self.experience_keys:
+            values = columns[key][skip:]
+            column = self.columns[key]
+            column[start:start + head] = values[:head]
+            column[:written - head] = values[head:]
+
+        self._written[0] += count
 
     @beartype
     def sample(self, batch_size: int) -> dict[str, np.ndarray]:
         """Sample a batch of experiences from the buffer."""
-        pass
+        if self._size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        return self.gather(self.rng.integers(0, self._size, size=batch_size))
+
+    @beartype
+    def gather(self, indices: np.ndarray) -> dict[str, np.ndarray]:
+        """Rows at the given buffer slots, one fancy-indexed array per key."""
+        return {key: column[indices] for key, column in self.columns.items()}
 
     @beartype
     def clear(self) -> None:
-        """Clear all experiences from the buffer."""
-        pass
+        """Clear all experiences from the buffer (columns stay allocated)."""
+        self._written[0] = 0
+        self._clears[0] += 1
 
     @beartype
     def size(self) -> int:
         """Get current number of experiences in buffer."""
-        pass
+        return self._size
 
     @beartype
     def is_full(self) -> bool:
         """Check if buffer is at capacity."""
-        pass
+        return self._size == self.capacity
+
+
+class SumTree:
+    """Sum and min segment trees over capacity leaves, stored as flat arrays.
+
+    Node i has children 2i and 2i + 1; leaves live at [tree_capacity, 2 *
+    tree_capacity), with tree_capacity the next power of two. Updates and
+    prefix-sum searches take whole index arrays and walk the tree one
+    level per vector operation.
+    """
+
+    def __init__(self, capacity: int):
+        self.tree_capacity = 1 << max(0, capacity - 1).bit_length()
+        self.depth = self.tree_capacity.bit_length() - 1
+        self.sums = np.zeros(2 * self.tree_capacity)
+        self.mins = np.full(2 * self.tree_capacity, np.inf)
+
+    def update(self, leaves: np.ndarray, values: np.ndarray) -> None:
+        """Set leaf values and recompute their ancestors.
+
+        Leaves are sorted and deduplicated once (the last value for a
+        repeated leaf wins), so each level's parents are deduplicated with
+        a neighbour comparison and the working set shrinks toward the root.
+        """
+        nodes, last = np.unique(leaves[::-1], return_index=True)
+        nodes = nodes + self.tree_capacity
+        values = values[::-1][last]
+        self.sums[nodes] = values
+        self.mins[nodes] = values
+        for _ in range(self.depth):
+            nodes = nodes >> 1
+            if len(nodes) > 1:
+                nodes = nodes[np.concatenate(([True], nodes[1:] != nodes[:-1]))]
+            left = 2 * nodes
+            self.sums[nodes] = self.sums[left] + self.sums[left + 1]
+            self.mins[nodes] = np.minimum(self.mins[left], self.mins[left + 1])
+
+    def find(self, prefix_sums: np.ndarray) -> np.ndarray:
+        """Leaf index where each cumulative sum falls, for a whole batch."""
+        nodes = np.ones(len(prefix_sums), dtype=np.int64)
+        remaining = prefix_sums.copy()
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sums = self.sums[left]
+            go_right = remaining > left_sums
+            remaining -= np.where(go_right, left_sums, 0.0)
+            nodes = left + go_right
+        return nodes - self.tree_capacity
+
+    def reset(self) -> None:
+        """Zero every leaf."""
+        self.sums.fill(0.0)
+        self.mins.fill(np.inf)
+
+    @property
+    def total(self) -> float:
+        """Sum of all leaves."""
+        return float(self.sums[1])
+
+    @property
+    def min(self) -> float:
+        """Smallest leaf value (inf when empty)."""
+        return float(self.mins[1])
 
 
 class PrioritizedReplayBuffer(ReplayBuffer):
-    """Prioritized replay buffer using importance sampling."""
+    """Prioritized replay buffer using importance sampling.
+
+    Experience i is sampled with probability p_i^alpha / sum_k p_k^alpha,
+    tracked in a SumTree, and weighted by (N * P(i))^-beta normalized by the
+    largest possible weight (from the min-tree). New experiences get the
+    largest priority seen so far, so each is likely to be replayed once.
+    """
 
     @beartype
     def __init__(
@@ -63,7 +214,9 @@ class PrioritizedReplayBuffer(ReplayBuffer):
         experience_keys: list[str],
         alpha: float = 0.6,
         beta: float = 0.4,
-        beta_increment: float = 0.001
+        beta_increment: float = 0.001,
+        epsilon: float = 1e-6,
+        seed: Optional[int] = None
     ):
         """Initialize prioritized replay buffer.
 
@@ -73,40 +226,176 @@ class PrioritizedReplayBuffer(ReplayBuffer):
             alpha: Prioritization exponent
             beta: Importance sampling exponent
             beta_increment: Beta increment per sampling step
+            epsilon: Added to priorities so no experience has zero probability
+            seed: Seed for the sampling random stream
         """
-        pass
+        super().__init__(capacity, experience_keys, seed=seed)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+
+    def _scaled(self, priorities: np.ndarray) -> np.ndarray:
+        """Tree values (|p| + epsilon)^alpha for raw priorities."""
+        return (np.abs(priorities) + self.epsilon) ** self.alpha
+
+    @beartype
+    def add(self, experience: dict[str, Any], priority: Optional[float] = None) -> None:
+        """Add experience with priority (default: the largest priority so far)."""
+        slot = self._position
+        super().add(experience)
+        self._set_priorities(np.array([slot]), None if priority is None else np.array([priority]))
+
+    @beartype
+    def add_batch(self, experiences: list[dict[str, Any]], priorities: Optional[np.ndarray] = None) -> None:
+        """Add a batch of experiences with optional per-experience priorities."""
+        if experiences:
+            columns = {key: np.asarray([e[key] for e in experiences]) for key in self.experience_keys}
+            self.add_columns(columns, priorities)
 
     @beartype
-    def add(self, experience: dict[str, Any], priority: float = 1.0) -> None:
-        """Add experience with priority."""
-        pass
+    def add_columns(self, columns: dict[str, np.ndarray], priorities: Optional[np.ndarray] = None) -> None:
+        """Add a batch given as one array per key, with optional priorities."""
+        count = len(columns[self.experience_keys[0]])
+        slots = self._next_slots(count)
+        super().add_columns(columns)
+        if priorities is not None:
+            priorities = priorities[count - len(slots):]
+        self._set_priorities(slots, priorities)
+
+    def _set_priorities(self, slots: np.ndarray, priorities: Optional[np.ndarray]) -> None:
+        """Write raw priorities (or the current maximum) for slots into the tree."""
+        if priorities is None:
+            values = np.full(len(slots), self._scaled(np.array(self.max_priority)))
+        else:
+            self.max_priority = max(self.max_priority, float(np.max(np.abs(priorities), initial=0.0)))
+            values = self._scaled(priorities)
+        self.tree.update(slots, values)
 
     @beartype
     def sample(self, batch_size: int) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray]:
         """Sample batch with importance weights.
 
+        Stratified: the total priority mass is cut into batch_size equal
+        segments and one experience is drawn from each, so a batch covers
+        the whole distribution with less variance than independent draws.
+
         Returns:
             Tuple of (experiences, importance_weights, indices)
         """
-        pass
+        if self._size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+
+        total = self.tree.total
+        segment = total / batch_size
+        prefix_sums = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+        indices = np.minimum(self.tree.find(np.minimum(prefix_sums, np.nextafter(total, 0.0))), self._size - 1)
+
+        # Importance weights relative to the rarest experience's weight, which is the largest
+        probs = self.tree.sums[indices + self.tree.tree_capacity] / total
+        weights = (self._size * probs) ** -self.beta
+        weights /= (self._size * self.tree.min / total) ** -self.beta
+        self.beta = min(1.0, self.beta + self.beta_increment)
+
+        return self.gather(indices), weights, indices
 
     @beartype
     def update_priorities(self, indices: np.ndarray, priorities: np.ndarray) -> None:
-        """Update priorities for sampled experiences."""
-        pass
+        """Update priorities for sampled experiences (e.g. with their |TD errors|)."""
+        self._set_priorities(indices, priorities)
+
+    @beartype
+    def clear(self) -> None:
+        """Clear all experiences and priorities from the buffer."""
+        super().clear()
+        self.tree.reset()
+        self.max_priority = 1.0
+
+
+# Transition keys and their (dtype, per-row shape) when no spec is given
+DEFAULT_EXPERIENCE_SPEC: dict[str, tuple[str, tuple[int, ...]]] = {
+    "state": ("int64", ()),
+    "action": ("int64", ()),
+    "reward": ("float64", ()),
+    "next_state": ("int64", ()),
+    "done": ("bool", ()),
+}
+
+# Checkpoint header and prioritized-replay leaf file inside a save directory
+_METADATA_FILE = "meta.json"
+_PRIORITIES_FILE = "_priorities.npy"
+
+# Column offsets in the shared segment are rounded up to cache lines
+_ALIGNMENT = 64
+
+
+class SharedPoolHandle(NamedTuple):
+    """Everything another process needs to attach to a shared ReplayBufferPool."""
+    name: str
+    num_buffers: int
+    buffer_capacity: int
+    experience_spec: dict[str, tuple[str, tuple[int, ...]]]
+
+
+def _shared_layout(
+    num_buffers: int,
+    buffer_capacity: int,
+    experience_spec: dict[str, tuple[str, tuple[int, ...]]]
+) -> tuple[dict[str, tuple[int, np.dtype, tuple[int, ...]]], int]:
+    """Byte offset, dtype and full shape of every array in the segment, and its total size.
+
+    The header "_written" holds one row counter per buffer and "_clears"
+    one clear counter per buffer; each column is
+    (num_buffers, buffer_capacity, *row_shape).
+    """
+    arrays = {
+        "_written": (np.dtype(np.int64), (num_buffers,)),
+        "_clears": (np.dtype(np.int64), (num_buffers,)),
+    }
+    for key, (dtype, row_shape) in experience_spec.items():
+        arrays[key] = (np.dtype(dtype), (num_buffers, buffer_capacity, *row_shape))
+
+    layout, offset = {}, 0
+    for key, (dtype, shape) in arrays.items():
+        layout[key] = (offset, dtype, shape)
+        nbytes = dtype.itemsize * int(np.prod(shape))
+        offset += -(-nbytes // _ALIGNMENT) * _ALIGNMENT
+    return layout, max(offset, 1)
 
 
 class ReplayBufferPool:
-    """Pool of replay buffers for distributed training."""
+    """Pool of replay buffers for distributed training.
+
+    Uniform buffers live in one multiprocessing.shared_memory segment: a
+    header of per-buffer row counters followed by one (num_buffers,
+    capacity, ...) array per experience key. Every ReplayBuffer in
+    self.buffers is a set of views into that segment, so a process that
+    attaches with the handle reads and writes the same memory with no
+    serialization.
+
+    Writes are lock-free under a single-writer rule: each buffer has at
+    most one writing process at a time (attach with writer_id), which
+    publishes its row counter after writing the rows. Learners may sample
+    concurrently; a row being overwritten as the ring wraps can be read
+    half-updated, which replay tolerates.
+
+    Prioritized buffers keep their sum trees in the creating process,
+    because priority updates from several processes would race on shared
+    tree nodes.
+    """
 
     @beartype
     def __init__(
         self,
         num_buffers: int = 4,
         buffer_capacity: int = 100000,
-        experience_keys: list[str] = None,
+        experience_keys: Optional[list[str]] = None,
         use_prioritized: bool = False,
-        save_path: Optional[str] = None
+        save_path: Optional[str] = None,
+        experience_spec: Optional[dict[str, tuple[str, tuple[int, ...]]]] = None,
+        seed: Optional[int] = None
     ):
         """Initialize replay buffer pool.
 
@@ -116,8 +405,95 @@ class ReplayBufferPool:
             experience_keys: Keys for experience dictionaries
             use_prioritized: Whether to use prioritized replay
             save_path: Path to save/load buffer state
+            experience_spec: (dtype, row shape) per key; defaults to
+                DEFAULT_EXPERIENCE_SPEC entries, float64 scalars for other keys
+            seed: Seed for buffer selection and sampling
         """
-        pass
+        if experience_spec is None:
+            keys = experience_keys or list(DEFAULT_EXPERIENCE_SPEC)
+            experience_spec = {key: DEFAULT_EXPERIENCE_SPEC.get(key, ("float64", ())) for key in keys}
+
+        self.num_buffers = num_buffers
+        self.buffer_capacity = buffer_capacity
+        self.experience_spec = {key: (dtype, tuple(shape)) for key, (dtype, shape) in experience_spec.items()}
+        self.experience_keys = list(self.experience_spec)
+        self.use_prioritized = use_prioritized
+        self.save_path = save_path
+        self.rng = np.random.default_rng(seed)
+
+        # Buffer this process writes to when attached as a writer
+        self.writer_id: Optional[int] = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._owner = True
+
+        if use_prioritized:
+            self.buffers: list[ReplayBuffer] = [
+                PrioritizedReplayBuffer(buffer_capacity, self.experience_keys, seed=int(child))
+                for child in self.rng.integers(2**63, size=num_buffers)
+            ]
+            for buffer in self.buffers:
+                buffer._allocate({
+                    key: np.zeros((0, *shape), dtype=dtype) for key, (dtype, shape) in self.experience_spec.items()
+                })
+        else:
+            _, nbytes = _shared_layout(num_buffers, buffer_capacity, self.experience_spec)
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self._map_shared()
+
+    @classmethod
+    @beartype
+    def attach(
+        cls,
+        handle: SharedPoolHandle,
+        writer_id: Optional[int] = None,
+        seed: Optional[int] = None
+    ) -> "ReplayBufferPool":
+        """Open a pool created in another process from its handle.
+
+        Args:
+            handle: The creating pool's handle
+            writer_id: Buffer this process will write to (the single-writer rule)
+            seed: Seed for sampling in this process
+        """
+        pool = cls.__new__(cls)
+        pool.num_buffers = handle.num_buffers
+        pool.buffer_capacity = handle.buffer_capacity
+        pool.experience_spec = handle.experience_spec
+        pool.experience_keys = list(handle.experience_spec)
+        pool.use_prioritized = False
+        pool.save_path = None
+        pool.rng = np.random.default_rng(seed)
+        pool.writer_id = writer_id
+        pool._shm = shared_memory.SharedMemory(name=handle.name)
+        pool._owner = False
+        pool._map_shared()
+        return pool
+
+    def _map_shared(self) -> None:
+        """Build the column arrays and per-buffer views over the shared segment."""
+        layout, _ = _shared_layout(self.num_buffers, self.buffer_capacity, self.experience_spec)
+        arrays = {
+            key: np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=offset)
+            for key, (offset, dtype, shape) in layout.items()
+        }
+        self._written = arrays.pop("_written")
+        self._clears = arrays.pop("_clears")
+        self._columns = arrays
+
+        self.buffers = []
+        for buffer_id in range(self.num_buffers):
+            buffer = ReplayBuffer(self.buffer_capacity, self.experience_keys, seed=int(self.rng.integers(2**63)))
+            buffer.columns = {key: column[buffer_id] for key, column in arrays.items()}
+            buffer._written = self._written[buffer_id:buffer_id + 1]
+            buffer._clears = self._clears[buffer_id:buffer_id + 1]
+            self.buffers.append(buffer)
+
+    @property
+    def handle(self) -> SharedPoolHandle:
+        """Picklable handle for ReplayBufferPool.attach in worker processes."""
+        if self._shm is None:
+            raise ValueError("Prioritized pools are process-local and cannot be attached")
+        return SharedPoolHandle(self._shm.name, self.num_buffers, self.buffer_capacity, self.experience_spec)
 
     @beartype
     def add_experiences(self, experiences: list[dict[str, Any]], buffer_id: Optional[int] = None) -> None:
@@ -127,12 +503,30 @@ class ReplayBufferPool:
             experiences: List of experience dictionaries
             buffer_id: Specific buffer to add to, or None for automatic distribution
         """
-        pass
+        if experiences:
+            columns = {key: np.asarray([e[key] for e in experiences]) for key in self.experience_keys}
+            self.add_columns(columns, buffer_id)
+
+    @beartype
+    def add_columns(self, columns: dict[str, np.ndarray], buffer_id: Optional[int] = None) -> None:
+        """Add a batch given as one array per key, written straight into the buffer's memory.
+
+        Args:
+            columns: One array per experience key, equal first dimensions
+            buffer_id: Specific buffer to add to, or None for _select_buffer
+        """
+        self.buffers[self._select_buffer() if buffer_id is None else buffer_id].add_columns(columns)
 
     @beartype
     def sample_batch(self, batch_size: int, buffer_id: Optional[int] = None) -> dict[str, np.ndarray]:
         """Sample a batch from specified buffer or randomly from all buffers.
 
+        Without buffer_id, uniform buffers are sampled together: every row
+        in the pool is equally likely, gathered with one fancy index per
+        column. A prioritized pool samples one buffer (chosen by size) and
+        adds 'weights', 'indices' and 'buffer_id' entries for
+        update_priorities.
+
         Args:
             batch_size: Size of batch to sample
             buffer_id: Specific buffer to sample from, or None for random selection
@@ -140,7 +534,41 @@ class ReplayBufferPool:
         Returns:
             Batched experiences
         """
-        pass
+        sizes = np.array([buffer.size() for buffer in self.buffers])
+        if sizes.sum() == 0:
+            raise ValueError("Cannot sample from an empty replay buffer pool")
+
+        if self.use_prioritized:
+            if buffer_id is None:
+                buffer_id = int(self.rng.choice(self.num_buffers, p=sizes / sizes.sum()))
+            batch, weights, indices = self.buffers[buffer_id].sample(batch_size)
+            return {**batch, "weights": weights, "indices": indices, "buffer_id": np.full(batch_size, buffer_id)}
+
+        if buffer_id is not None:
+            return self.buffers[buffer_id].sample(batch_size)
+
+        # A uniform row index over the whole pool, split into (buffer, slot)
+        rows = self.rng.integers(0, sizes.sum(), size=batch_size)
+        bounds = np.cumsum(sizes)
+        buffer_ids = np.searchsorted(bounds, rows, side="right")
+        slots = rows - (bounds - sizes)[buffer_ids]
+        return {key: column[buffer_ids, slots] for key, column in self._columns.items()}
+
+    @beartype
+    def update_priorities(self, buffer_id: int, indices: np.ndarray, priorities: np.ndarray) -> None:
+        """Update priorities of rows returned by sample_batch on a prioritized pool."""
+        self.buffers[buffer_id].update_priorities(indices, priorities)
+
+    @beartype
+    def get_buffer_view(self, buffer_id: int) -> dict[str, np.ndarray]:
+        """Read-only zero-copy views of a buffer's valid rows (in slot order, not age order)."""
+        buffer = self.buffers[buffer_id]
+        views = {}
+        for key, column in buffer.columns.items():
+            view = column[:buffer.size()]
+            view.flags.writeable = False
+            views[key] = view
+        return views
 
     @beartype
     def get_buffer_stats(self) -> dict[str, Any]:
@@ -149,41 +577,204 @@ class ReplayBufferPool:
         Returns:
             Dictionary with buffer sizes, utilization, and other metrics
         """
-        pass
+        sizes = [buffer.size() for buffer in self.buffers]
+        return {
+            "num_buffers": self.num_buffers,
+            "buffer_capacity": self.buffer_capacity,
+            "sizes": sizes,
+            "utilization": [size / self.buffer_capacity for size in sizes],
+            "total_experiences": sum(sizes),
+            "total_written": [int(buffer._written[0]) for buffer in self.buffers],
+            "prioritized": self.use_prioritized,
+            "shared": self._shm is not None,
+        }
 
     @beartype
     def clear_all_buffers(self) -> None:
         """Clear all replay buffers."""
-        pass
+        for buffer in self.buffers:
+            buffer.clear()
+
+    def _resolve_path(self, path: Optional[str]) -> Path:
+        """Checkpoint directory from the argument or save_path."""
+        path = path if path is not None else self.save_path
+        if path is None:
+            raise ValueError("No checkpoint path given and no save_path configured")
+        return Path(path)
+
+    def _read_metadata(self, directory: Path) -> Optional[dict[str, Any]]:
+        """Checkpoint header, or None when the directory holds no checkpoint."""
+        meta_path = directory / _METADATA_FILE
+        if not meta_path.exists():
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        meta["experience_spec"] = {key: (dtype, tuple(shape)) for key, (dtype, shape) in meta["experience_spec"].items()}
+        return meta
+
+    def _matches(self, meta: dict[str, Any]) -> bool:
+        """Whether a checkpoint header has this pool's layout."""
+        return (
+            meta["num_buffers"] == self.num_buffers
+            and meta["buffer_capacity"] == self.buffer_capacity
+            and meta["experience_spec"] == self.experience_spec
+        )
 
     @beartype
     def save_buffers(self, path: Optional[str] = None) -> None:
         """Save all buffer states to disk.
 
+        The checkpoint is a directory with one .npy file per column, shaped
+        (num_buffers, capacity, *row_shape), plus a JSON header with the
+        layout and every buffer's row and clear counters. Saving into an
+        existing checkpoint of the same layout writes only the rows added
+        since the header was last written (at most two slices per buffer and
+        column); a buffer cleared since then (including by balance_buffers)
+        is written whole. Column files are updated in place and the header
+        last, so an interrupted save can leave a checkpoint whose files no
+        longer match its header; save into a fresh directory when that
+        matters.
+
         Args:
             path: Path to save to, uses default if None
         """
-        pass
+        directory = self._resolve_path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        meta = self._read_metadata(directory)
+        incremental = meta is not None and self._matches(meta) and meta.get("clears") is not None
+        saved_written = meta["written"] if incremental else [0] * self.num_buffers
+        saved_clears = meta["clears"] if incremental else [None] * self.num_buffers
+
+        # Ring slots to write per buffer: (start, count)
+        spans = []
+        for buffer, previous, clears in zip(self.buffers, saved_written, saved_clears):
+            written = int(buffer._written[0])
+            if clears != int(buffer._clears[0]) or written < previous:
+                previous = 0
+            new_rows = written - previous
+            count = min(new_rows, self.buffer_capacity)
+            spans.append(((written - count) % self.buffer_capacity, count))
+
+        for key, (dtype, row_shape) in self.experience_spec.items():
+            file = np.lib.format.open_memmap(
+                directory / f"{key}.npy",
+                mode="r+" if incremental else "w+",
+                dtype=np.dtype(dtype),
+                shape=(self.num_buffers, self.buffer_capacity, *row_shape)
+            )
+            for buffer_id, (start, count) in enumerate(spans):
+                column = self.buffers[buffer_id].columns[key]
+                head = min(count, self.buffer_capacity - start)
+                file[buffer_id, start:start + head] = column[start:start + head]
+                file[buffer_id, :count - head] = column[:count - head]
+            file.flush()
+            del file
+
+        if self.use_prioritized:
+            # Priorities change on every update, so they are always saved whole
+            leaves = np.stack([
+                buffer.tree.sums[buffer.tree.tree_capacity:buffer.tree.tree_capacity + self.buffer_capacity]
+                for buffer in self.buffers
+            ])
+            np.save(directory / _PRIORITIES_FILE, leaves)
+
+        meta = {
+            "format_version": 1,
+            "num_buffers": self.num_buffers,
+            "buffer_capacity": self.buffer_capacity,
+            "experience_spec": {key: [dtype, list(shape)] for key, (dtype, shape) in self.experience_spec.items()},
+            "written": [int(buffer._written[0]) for buffer in self.buffers],
+            "clears": [int(buffer._clears[0]) for buffer in self.buffers],
+            "max_priorities": [buffer.max_priority for buffer in self.buffers] if self.use_prioritized else None,
+        }
+        temp_path = directory / (_METADATA_FILE + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(temp_path, directory / _METADATA_FILE)
 
     @beartype
     def load_buffers(self, path: Optional[str] = None) -> None:
         """Load buffer states from disk.
 
+        Columns are opened as memory maps, so nothing is read up front:
+        a process-local (prioritized) pool keeps copy-on-write maps as its
+        columns and pages rows in as they are sampled. A shared pool copies
+        the valid rows of each buffer into its shared segment, one
+        sequential slice per buffer and column.
+
         Args:
             path: Path to load from, uses default if None
         """
-        pass
+        directory = self._resolve_path(path)
+        meta = self._read_metadata(directory)
+        if meta is None:
+            raise FileNotFoundError(f"No replay checkpoint in {directory}")
+        if not self._matches(meta):
+            raise ValueError(
+                f"Checkpoint layout ({meta['num_buffers']} x {meta['buffer_capacity']}, "
+                f"{meta['experience_spec']}) does not match this pool"
+            )
+
+        files = {key: np.load(directory / f"{key}.npy", mmap_mode="c") for key in self.experience_keys}
+        saved_clears = meta.get("clears") or [0] * self.num_buffers
+        for buffer_id, (buffer, written, clears) in enumerate(zip(self.buffers, meta["written"], saved_clears)):
+            size = min(written, self.buffer_capacity)
+            if self._shm is None:
+                buffer.columns = {key: file[buffer_id] for key, file in files.items()}
+            else:
+                for key, file in files.items():
+                    buffer.columns[key][:size] = file[buffer_id, :size]
+            buffer._written[0] = written
+            buffer._clears[0] = clears
+
+        if self.use_prioritized:
+            leaves = np.load(directory / _PRIORITIES_FILE, mmap_mode="r")
+            for buffer, buffer_leaves, max_priority in zip(self.buffers, leaves, meta["max_priorities"]):
+                buffer.tree.reset()
+                buffer.tree.update(np.arange(buffer.size()), np.asarray(buffer_leaves[:buffer.size()]))
+                buffer.max_priority = max_priority
 
     @beartype
     def get_total_experiences(self) -> int:
         """Get total number of experiences across all buffers."""
-        pass
+        return sum(buffer.size() for buffer in self.buffers)
 
     @beartype
     def balance_buffers(self) -> None:
-        """Balance experiences across buffers for even distribution."""
-        pass
+        """Balance experiences across buffers for even distribution.
+
+        Rewrites every buffer, so call it only while no worker is writing.
+        Priorities of prioritized buffers are reset to the maximum.
+        """
+        rows = [buffer.gather(np.arange(buffer.size())) for buffer in self.buffers]
+        merged = {key: np.concatenate([part[key] for part in rows]) for key in self.experience_keys}
+        total = len(merged[self.experience_keys[0]])
+        bounds = np.linspace(0, total, self.num_buffers + 1).astype(np.int64)
+
+        self.clear_all_buffers()
+        for buffer, begin, end in zip(self.buffers, bounds[:-1], bounds[1:]):
+            buffer.add_columns({key: values[begin:end] for key, values in merged.items()})
 
     def _select_buffer(self) -> int:
-        """Select buffer for adding experiences (load balancing)."""
-        pass
+        """Select buffer for adding experiences (load balancing).
+
+        An attached writer always uses its own buffer; otherwise the buffer
+        with the fewest rows written so far gets the batch.
+        """
+        if self.writer_id is not None:
+            return self.writer_id
+        return int(np.argmin([buffer._written[0] for buffer in self.buffers]))
+
+    @beartype
+    def close(self) -> None:
+        """Detach from the shared segment; the creating pool also frees it."""
+        if self._shm is None:
+            return
+        # Views must not outlive the mapping
+        self.buffers = []
+        self._columns = {}
+        self._written = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
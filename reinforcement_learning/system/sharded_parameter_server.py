@@ -0,0 +1,372 @@
+"""Parameter server partitioned across several server processes."""
+
+from typing import Any, NamedTuple, Optional
+from beartype import beartype
+import numpy as np
+import multiprocessing as mp
+import json
+import os
+import queue
+import time
+from pathlib import Path
+
+from .parameter_server import ParameterServer, ParameterClient
+
+_PLAN_FILE = "plan.json"
+
+
+class ShardSlice(NamedTuple):
+    """Part of one parameter held by one shard."""
+    shard: int
+    key: str  # the parameter's name on that shard
+    start: int  # flat range of the full array held there
+    stop: int
+
+
+@beartype
+def plan_shards(
+    parameters: dict[str, Any],
+    num_shards: int,
+    slice_size: Optional[int] = None
+) -> dict[str, list[ShardSlice]]:
+    """Partition parameters across shards, by tensor slice or by key.
+
+    Arrays of at least slice_size entries (default: an even share of all
+    entries) are cut into one contiguous flat slice per shard. Smaller
+    arrays and non-array values go whole to the least loaded shard,
+    largest first.
+    """
+    sizes = {name: np.size(value) if isinstance(value, np.ndarray) else 1 for name, value in parameters.items()}
+    if slice_size is None:
+        slice_size = max(1, -(-sum(sizes.values()) // num_shards))
+
+    plan: dict[str, list[ShardSlice]] = {}
+    load = np.zeros(num_shards, dtype=np.int64)
+    for name in sorted(parameters, key=lambda name: -sizes[name]):
+        size = sizes[name]
+        if isinstance(parameters[name], np.ndarray) and size >= slice_size and num_shards > 1:
+            bounds = np.linspace(0, size, num_shards + 1).astype(np.int64)
+            plan[name] = [
+                ShardSlice(shard, f"{name}#{shard}", int(start), int(stop))
+                for shard, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:]))
+            ]
+            load += np.diff(bounds)
+        else:
+            shard = int(np.argmin(load))
+            plan[name] = [ShardSlice(shard, name, 0, size)]
+            load[shard] += size
+    return plan
+
+
+def _shard_parameters(parameters: dict[str, Any], plan: dict[str, list[ShardSlice]], shard: int) -> dict[str, Any]:
+    """The parameters one shard serves: whole values, or flat slices."""
+    shard_parameters = {}
+    for name, slices in plan.items():
+        for part in slices:
+            if part.shard != shard:
+                continue
+            value = parameters[name]
+            if part.key == name:
+                shard_parameters[part.key] = value
+            else:
+                shard_parameters[part.key] = np.ascontiguousarray(value).reshape(-1)[part.start:part.stop]
+    return shard_parameters
+
+
+def _serve_shard(
+    parameters: dict[str, Any],
+    server_kwargs: dict[str, Any],
+    host: str,
+    addresses: Any,
+    shard: int,
+    stop: Any
+) -> None:
+    """Shard process: serve one partition until stop is set."""
+    server = ParameterServer(parameters, **server_kwargs)
+    server.start_server(host, 0)
+    addresses.put((shard, server.address))
+    stop.wait()
+    server.stop_server()
+
+
+class ShardedParameterClient:
+    """Client-side router over one ParameterClient per shard.
+
+    Pushes are split by the shard plan (slices are views, not copies) and
+    sent to every shard before any reply is awaited; pulls are likewise
+    sent to all shards first, so shards serve them in parallel. The full
+    parameters are reassembled from the shard replicas, copying only the
+    parts that changed.
+    """
+
+    @beartype
+    def __init__(
+        self,
+        worker_id: Optional[str],
+        plan: dict[str, list[ShardSlice]],
+        addresses: list[tuple[str, int]],
+        shapes: dict[str, tuple[int, ...]],
+        max_in_flight: int = 32
+    ):
+        """Connect to every shard.
+
+        Args:
+            worker_id: Unique identifier for this worker (None for a control connection)
+            plan: Parameter partition from plan_shards
+            addresses: (host, port) of each shard, by shard index
+            shapes: Full shape of every array parameter
+            max_in_flight: Pipelined requests allowed per shard connection
+        """
+        self.worker_id = worker_id
+        self.plan = plan
+        self.shapes = shapes
+        self.shards = [
+            ParameterClient(worker_id, host=host, port=port, max_in_flight=max_in_flight)
+            for host, port in addresses
+        ]
+        self.parameters: dict[str, Any] = {}
+
+    @beartype
+    def push_gradients(self, gradients: dict[str, np.ndarray], weight: float = 1.0) -> None:
+        """Split gradients by shard and push each part.
+
+        Args:
+            gradients: Computed gradients, full shapes
+            weight: Weight for gradient aggregation
+        """
+        parts: list[dict[str, np.ndarray]] = [{} for _ in self.shards]
+        for name, gradient in gradients.items():
+            slices = self.plan[name]
+            if len(slices) == 1 and slices[0].key == name:
+                parts[slices[0].shard][name] = gradient
+                continue
+            flat = np.ascontiguousarray(gradient).reshape(-1)
+            for part in slices:
+                parts[part.shard][part.key] = flat[part.start:part.stop]
+
+        for client, shard_gradients in zip(self.shards, parts):
+            if shard_gradients:
+                client.push_gradients(shard_gradients, weight)
+
+    @beartype
+    def get_parameters(self) -> dict[str, Any]:
+        """Pull from every shard and return the reassembled parameters.
+
+        Returns:
+            Full parameters (this client's own arrays, updated in place)
+        """
+        for client in self.shards:
+            client.request_pull()
+        changed: list[set[str]] = []
+        for client in self.shards:
+            update = client.complete_pull()
+            keys = set(update.snapshot)
+            for delta in update.deltas:
+                keys.update(delta)
+            changed.append(keys)
+
+        for name, slices in self.plan.items():
+            for part in slices:
+                if part.key not in changed[part.shard]:
+                    continue
+                value = self.shards[part.shard].replica.parameters[part.key]
+                if part.key == name:
+                    self.parameters[name] = value
+                else:
+                    if name not in self.parameters:
+                        self.parameters[name] = np.empty(self.shapes[name], dtype=value.dtype)
+                    self.parameters[name].reshape(-1)[part.start:part.stop] = value
+        return self.parameters
+
+    @beartype
+    def flush(self) -> None:
+        """Wait for every shard's outstanding replies."""
+        for client in self.shards:
+            client.flush()
+
+    @beartype
+    def close(self) -> None:
+        """Close every shard connection."""
+        for client in self.shards:
+            client.close()
+
+
+class ShardedParameterServer:
+    """ParameterServer partitioned across num_shards local server processes.
+
+    Each shard process runs a ParameterServer over its part of the
+    parameters (see plan_shards), so pushes to different shards are
+    aggregated and applied concurrently. Workers talk to all shards through
+    a ShardedParameterClient. Every shard checkpoints into its own
+    subdirectory, all at the same time.
+    """
+
+    @beartype
+    def __init__(
+        self,
+        initial_parameters: dict[str, Any],
+        num_shards: int = 4,
+        host: str = "localhost",
+        slice_size: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        start_method: Optional[str] = None,
+        startup_timeout: float = 60.0,
+        **server_kwargs: Any
+    ):
+        """Start the shard processes.
+
+        Args:
+            initial_parameters: Initial policy parameters
+            num_shards: Number of server processes
+            host: Host address the shards bind to
+            slice_size: Arrays at least this large are sliced across all shards
+            checkpoint_path: Checkpoint directory; shard i uses its shard_i subdirectory
+            start_method: multiprocessing start method (default: platform default)
+            startup_timeout: Seconds to wait for every shard to start serving
+            **server_kwargs: Arguments for every shard's ParameterServer
+        """
+        self.num_shards = num_shards
+        self.checkpoint_path = checkpoint_path
+        self.plan = plan_shards(initial_parameters, num_shards, slice_size)
+        self.shapes = {
+            name: value.shape for name, value in initial_parameters.items() if isinstance(value, np.ndarray)
+        }
+
+        context = mp.get_context(start_method)
+        self._stop = context.Event()
+        address_queue = context.Queue()
+        self._processes = []
+        for shard in range(num_shards):
+            kwargs = dict(server_kwargs)
+            if checkpoint_path is not None:
+                kwargs["checkpoint_path"] = str(Path(checkpoint_path) / f"shard_{shard}")
+            process = context.Process(
+                target=_serve_shard,
+                args=(
+                    _shard_parameters(initial_parameters, self.plan, shard),
+                    kwargs, host, address_queue, shard, self._stop
+                ),
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+        self.addresses: list[tuple[str, int]] = [None] * num_shards
+        deadline = time.monotonic() + startup_timeout
+        for _ in range(num_shards):
+            shard, address = self._next_address(address_queue, deadline)
+            self.addresses[shard] = tuple(address)
+        self._control = ShardedParameterClient(None, self.plan, self.addresses, self.shapes)
+
+    def _next_address(self, address_queue: Any, deadline: float) -> tuple[int, Any]:
+        """Wait for the next shard to report its address; stop every shard if one died or time ran out."""
+        while True:
+            try:
+                return address_queue.get(timeout=min(1.0, max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+            failed = [
+                (shard, process.exitcode) for shard, process in enumerate(self._processes)
+                if process.exitcode is not None
+            ]
+            if failed or time.monotonic() >= deadline:
+                self._stop_processes()
+                if failed:
+                    shard, exitcode = failed[0]
+                    raise RuntimeError(f"Parameter server shard {shard} exited with code {exitcode} during startup")
+                raise TimeoutError("Parameter server shards did not start serving in time")
+
+    def _stop_processes(self) -> None:
+        """Signal every shard process to stop and wait for it, terminating stragglers."""
+        self._stop.set()
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+    @beartype
+    def connection_info(self) -> dict[str, Any]:
+        """Picklable arguments for ShardedParameterClient / DistributedAgent.connect_parameter_server."""
+        return {"plan": self.plan, "addresses": self.addresses, "shapes": self.shapes}
+
+    @beartype
+    def connect(self, worker_id: str, max_in_flight: int = 32) -> ShardedParameterClient:
+        """Open a worker's routed connection to every shard."""
+        return ShardedParameterClient(worker_id, self.plan, self.addresses, self.shapes, max_in_flight)
+
+    def _resolve_path(self, path: Optional[str]) -> Path:
+        """Checkpoint directory from the argument or checkpoint_path."""
+        path = path if path is not None else self.checkpoint_path
+        if path is None:
+            raise ValueError("No checkpoint path given and no checkpoint_path configured")
+        return Path(path)
+
+    @beartype
+    def save_checkpoint(self, path: Optional[str] = None) -> None:
+        """Have every shard save its part at the same time.
+
+        Shard i writes into path/shard_i; the shard plan is written next to
+        them once every shard is done.
+
+        Args:
+            path: Path to save checkpoint, uses default if None
+        """
+        directory = self._resolve_path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        for shard, client in enumerate(self._control.shards):
+            client.save_checkpoint(str(directory / f"shard_{shard}"), wait=False)
+        self._control.flush()
+
+        plan = {
+            "num_shards": self.num_shards,
+            "shapes": {name: list(shape) for name, shape in self.shapes.items()},
+            "plan": {name: [list(part) for part in slices] for name, slices in self.plan.items()},
+        }
+        temp_path = directory / (_PLAN_FILE + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(plan, f, indent=2)
+        os.replace(temp_path, directory / _PLAN_FILE)
+
+    @beartype
+    def load_checkpoint(self, path: str) -> None:
+        """Have every shard load its part at the same time.
+
+        Args:
+            path: Path to load checkpoint from
+        """
+        directory = Path(path)
+        plan_path = directory / _PLAN_FILE
+        if not plan_path.exists():
+            raise FileNotFoundError(f"No sharded parameter checkpoint in {directory}")
+        with open(plan_path) as f:
+            saved = json.load(f)
+        saved_plan = {name: [ShardSlice(*part) for part in slices] for name, slices in saved["plan"].items()}
+        if saved_plan != self.plan:
+            raise ValueError(f"Checkpoint in {directory} was saved with a different shard plan")
+
+        for shard, client in enumerate(self._control.shards):
+            client.load_checkpoint(str(directory / f"shard_{shard}"), wait=False)
+        self._control.flush()
+
+    @beartype
+    def get_server_stats(self) -> dict[str, Any]:
+        """Statistics of every shard.
+
+        Returns:
+            Dictionary with per-shard stats and totals
+        """
+        shards = [client.get_server_stats() for client in self._control.shards]
+        return {
+            "num_shards": self.num_shards,
+            "addresses": [list(address) for address in self.addresses],
+            "gradients_received": sum(stats["gradients_received"] for stats in shards),
+            "updates_applied": sum(stats["updates_applied"] for stats in shards),
+            "shards": shards,
+        }
+
+    @beartype
+    def shutdown(self) -> None:
+        """Stop every shard process."""
+        self._control.close()
+        self._stop_processes()